@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Concurrent-session load test for dashboard/app.py.
+
+Starts one real Streamlit server process with the dashboard, pointed at the
+local OpenAlex stand-in (services/openalex_stub.py) with simulated latency.
+N headless clients then drive it over the same websocket protocol the browser
+uses. Each simulated analyst opens the page and runs a random but realistic
+sequence of interactions: year-range slider moves, field switches, table tab
+switches and snapshot/citation toggles, with think time in between. Widgets
+inside a fragment rerun only that fragment, as in the browser.
+
+Each concurrency level (--sessions 1,2,4,8) gets a fresh server with empty
+caches by default, so levels are comparable. Reported per level:
+
+- throughput (interactions per second) and latency percentiles (send to
+  script finished), also per interaction type
+- server memory: resident set before, after and at peak (Linux /proc)
+- OpenAlex calls per interaction: requests the stub saw (including
+  background cache warm-up), and API requests per full script run from
+  the dashboard's trace log (services/metrics.py)
+- bytes sent to the browser per interaction
+
+Example:
+    python benchmarks/load_test.py --sessions 1,4,8,16 --steps 10 --latency-ms 40
+    python benchmarks/load_test.py --sessions 8 --think-ms 0 --output load.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.openalex_fixtures import OpenAlexFixtures
+from services.openalex_stub import OpenAlexStubServer, StubConfig
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(BENCH_DIR, "..", "dashboard", "app.py")
+RECORDED_DIR = os.path.join(BENCH_DIR, "fixtures", "recorded")
+
+# Widget labels in dashboard/app.py
+YEAR_SLIDER = "Select Year Range"
+FIELD_SELECT = "Select Field of Research"
+SNAPSHOT_CHECKBOX = "Use local snapshot for field counts when available (faster)"
+CITATIONS_CHECKBOX = "Show citations per country"
+TABLE_TABS = ("Publication Counts", "Specialization Analysis")
+YEAR_MIN, YEAR_MAX = 2010, 2020
+FIELDS = ("Artificial Intelligence", "Deep Learning")
+
+# Interaction mix of a simulated analyst
+ACTIONS = {"year_range": 0.45, "field": 0.2, "table_tab": 0.15, "citations": 0.1, "snapshot": 0.1}
+
+SERVER_START_TIMEOUT = 60
+RUN_TIMEOUT = 300
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def rss_bytes(pid):
+    """Resident set size of a process (Linux), or None."""
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+class DashboardServer:
+    """`streamlit run dashboard/app.py` in a subprocess with its own cache and metrics files."""
+
+    def __init__(self, api_url, work_dir, rate, response_cache=True):
+        self.port = free_port()
+        self.work_dir = work_dir
+        self.trace_log = os.path.join(work_dir, "traces.jsonl")
+        self.env = dict(
+            os.environ,
+            OPENALEX_API_URL=api_url,
+            OPENALEX_RATE_PER_SECOND=str(rate),
+            OPENALEX_CACHE_PATH=os.path.join(work_dir, "openalex.sqlite"),
+            DASHBOARD_METRICS_PATH=os.path.join(work_dir, "dashboard.prom"),
+            DASHBOARD_METRICS_LOG=self.trace_log,
+        )
+        if not response_cache:
+            self.env["OPENALEX_CACHE_DISABLED"] = "1"
+        self.process = None
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.port}/_stcore/stream"
+
+    def start(self):
+        self._log = open(os.path.join(self.work_dir, "server.log"), "w", encoding="utf-8")
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", os.path.abspath(APP_PATH),
+             "--server.headless", "true", "--server.address", "127.0.0.1", f"--server.port={self.port}",
+             "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+            env=self.env, stdout=self._log, stderr=subprocess.STDOUT,
+        )
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Streamlit exited with {self.process.returncode}; see {self._log.name}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1) as r:
+                    if r.status == 200:
+                        return self
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError(f"Streamlit did not start within {SERVER_START_TIMEOUT}s")
+
+    def rss(self):
+        return rss_bytes(self.process.pid)
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self._log.close()
+
+    def trace_offset(self):
+        return os.path.getsize(self.trace_log) if os.path.exists(self.trace_log) else 0
+
+    def read_traces(self, offset):
+        """Trace log lines (one per script run) written after offset."""
+        if not os.path.exists(self.trace_log):
+            return []
+        with open(self.trace_log, "r", encoding="utf-8") as f:
+            f.seek(offset)
+            return [json.loads(line) for line in f if line.strip()]
+
+
+class MemorySampler:
+    """Samples a process's resident set in a background thread and keeps the peak."""
+
+    def __init__(self, server, interval=0.2):
+        self.server = server
+        self.interval = interval
+        self.peak = server.rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            rss = self.server.rss()
+            if rss is not None and (self.peak is None or rss > self.peak):
+                self.peak = rss
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+class DashboardSession:
+    """
+    One headless browser tab: a websocket session that reruns the script with
+    widget states, like the Streamlit frontend does.
+    """
+
+    def __init__(self, url, rng):
+        self.url = url
+        self.rng = rng
+        self.ws = None
+        self.widgets = {}  # label -> (widget id, fragment id or ""), from the rendered elements
+        self.states = {}   # widget id -> WidgetState sent with every rerun
+        self.year_range = (YEAR_MIN, YEAR_MAX)
+        self.field = FIELDS[0]
+        self.table_tab = TABLE_TABS[0]
+        self.toggles = {SNAPSHOT_CHECKBOX: True, CITATIONS_CHECKBOX: False}
+
+    async def connect(self):
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        await self.ws.close()
+
+    async def rerun(self, fragment_id=""):
+        """
+        Rerun the script (or one fragment) with the current widget states;
+        returns (seconds, bytes received, errors).
+        """
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        if fragment_id:
+            msg.rerun_script.fragment_id = fragment_id
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+
+        received, errors = 0, 0
+        while True:
+            data = await self.ws.recv()
+            received += len(data)
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof("type")
+            delta_type = forward.delta.WhichOneof("type") if kind == "delta" else None
+            if delta_type == "new_element":
+                element = forward.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "exception":
+                    errors += 1
+                elif element_type in ("slider", "selectbox", "checkbox"):
+                    widget = getattr(element, element_type)
+                    self.widgets[widget.label] = (widget.id, forward.delta.fragment_id)
+            elif delta_type == "add_block":
+                block = forward.delta.add_block
+                if block.WhichOneof("type") == "tab_container" and block.tab_container.id:
+                    self.widgets[TABLE_TABS] = (block.tab_container.id, forward.delta.fragment_id)
+            elif kind == "script_finished":
+                if forward.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    errors += 1
+                if forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return time.perf_counter() - start, received, errors
+
+    def _set(self, label, **value):
+        """Set a widget's state; returns the fragment to rerun ("" for the whole script)."""
+        widget_id, fragment_id = self.widgets[label]
+        state = WidgetState(id=widget_id)
+        for name, v in value.items():
+            if name == "double_array_value":
+                state.double_array_value.data[:] = v
+            else:
+                setattr(state, name, v)
+        self.states[state.id] = state
+        return fragment_id
+
+    def next_action(self):
+        """Pick an interaction and set the widget state it changes; returns (action, fragment id)."""
+        action = self.rng.choices(list(ACTIONS), weights=list(ACTIONS.values()))[0]
+        if action == "year_range":
+            year_from = self.rng.randint(YEAR_MIN, YEAR_MAX - 1)
+            self.year_range = (year_from, self.rng.randint(year_from + 1, YEAR_MAX))
+            fragment_id = self._set(YEAR_SLIDER, double_array_value=[float(y) for y in self.year_range])
+        elif action == "field":
+            self.field = FIELDS[1 - FIELDS.index(self.field)]
+            fragment_id = self._set(FIELD_SELECT, string_value=self.field)
+        elif action == "table_tab":
+            self.table_tab = TABLE_TABS[1 - TABLE_TABS.index(self.table_tab)]
+            fragment_id = self._set(TABLE_TABS, string_value=self.table_tab)
+        else:
+            label = SNAPSHOT_CHECKBOX if action == "snapshot" else CITATIONS_CHECKBOX
+            self.toggles[label] = not self.toggles[label]
+            fragment_id = self._set(label, bool_value=self.toggles[label])
+        return action, fragment_id
+
+
+async def run_session(url, index, steps, think_s, seed, records):
+    session = DashboardSession(url, random.Random(seed * 1000 + index))
+    await session.connect()
+    try:
+        action, fragment_id = "page_load", ""
+        for step in range(steps + 1):
+            if step:
+                await asyncio.sleep(think_s * session.rng.uniform(0.5, 1.5))
+                action, fragment_id = session.next_action()
+            try:
+                seconds, received, errors = await asyncio.wait_for(session.rerun(fragment_id), RUN_TIMEOUT)
+            except asyncio.TimeoutError:
+                seconds, received, errors = RUN_TIMEOUT, 0, 1
+            records.append({"session": index, "step": step, "action": action, "fragment": bool(fragment_id),
+                            "seconds": seconds, "bytes": received, "errors": errors})
+    finally:
+        await session.close()
+
+
+async def drive(url, sessions, steps, think_s, seed):
+    records = []
+    await asyncio.gather(*(run_session(url, i, steps, think_s, seed, records) for i in range(sessions)))
+    return records
+
+
+# --- Reporting ---
+
+def _percentiles(values):
+    p50, p95, p99 = np.percentile(values, [50, 95, 99]) if len(values) else (np.nan,) * 3
+    return {"p50_ms": p50 * 1000, "p95_ms": p95 * 1000, "p99_ms": p99 * 1000,
+            "max_ms": (max(values) if len(values) else np.nan) * 1000}
+
+
+def summarize(sessions, records, wall_s, stub_stats, traces, rss_before, rss_after, rss_peak):
+    seconds = [r["seconds"] for r in records]
+    # API requests made by each full script run: the page.* spans are the top level of a trace
+    run_requests = [
+        sum(span.get("requests", 0) for span in trace["spans"] if span["depth"] == 0) for trace in traces
+    ]
+    mb = lambda b: round(b / 2 ** 20, 1) if b is not None else None
+    return {
+        "sessions": sessions,
+        "interactions": len(records),
+        "errors": sum(r["errors"] for r in records),
+        "wall_s": round(wall_s, 2),
+        "throughput_per_s": round(len(records) / wall_s, 2),
+        **{k: round(float(v), 1) for k, v in _percentiles(seconds).items()},
+        "by_action": {
+            action: {"count": len(values), **{k: round(float(v), 1) for k, v in _percentiles(values).items()}}
+            for action in ["page_load", *ACTIONS]
+            if (values := [r["seconds"] for r in records if r["action"] == action])
+        },
+        "fragment_reruns": sum(r["fragment"] for r in records),
+        "kb_per_interaction": round(float(np.mean([r["bytes"] for r in records])) / 1024, 1),
+        "stub_requests": stub_stats["requests"],
+        "stub_statuses": stub_stats["statuses"],
+        "api_per_interaction": round(stub_stats["requests"] / len(records), 2),
+        "api_per_run_mean": round(float(np.mean(run_requests)), 2) if run_requests else None,
+        "api_per_run_p95": round(float(np.percentile(run_requests, 95)), 1) if run_requests else None,
+        "runs_without_api": round(float(np.mean([n == 0 for n in run_requests])), 3) if run_requests else None,
+        "rss_before_mb": mb(rss_before),
+        "rss_after_mb": mb(rss_after),
+        "rss_peak_mb": mb(rss_peak),
+        "rss_growth_mb": mb(rss_after - rss_before) if rss_after is not None and rss_before is not None else None,
+    }
+
+
+def print_summary(levels):
+    base_p95 = levels[0]["p95_ms"]
+    print(f"{'sessions':>8} {'runs':>6} {'frag':>5} {'err':>4} {'runs/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'p95×':>5} {'api/run':>8} {'KB/run':>7} {'RSS MB':>7} {'peak':>7} {'growth':>7}")
+    for s in levels:
+        print(f"{s['sessions']:>8} {s['interactions']:>6} {s['fragment_reruns']:>5} {s['errors']:>4} {s['throughput_per_s']:>7.2f} "
+              f"{s['p50_ms']:>8.0f} {s['p95_ms']:>8.0f} {s['p99_ms']:>8.0f} {s['p95_ms'] / base_p95:>5.1f} "
+              f"{s['api_per_interaction']:>8.2f} {s['kb_per_interaction']:>7.0f} "
+              f"{s['rss_after_mb'] or float('nan'):>7.1f} {s['rss_peak_mb'] or float('nan'):>7.1f} "
+              f"{s['rss_growth_mb'] if s['rss_growth_mb'] is not None else float('nan'):>+7.1f}")
+    print()
+    print(f"{'sessions':>8} {'action':<12} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for s in levels:
+        for action, a in s["by_action"].items():
+            print(f"{s['sessions']:>8} {action:<12} {a['count']:>6} {a['p50_ms']:>8.0f} {a['p95_ms']:>8.0f} "
+                  f"{a['max_ms']:>8.0f}")
+
+
+# --- Main ---
+
+def run_level(server, stub, sessions, args):
+    stub.reset_stats()
+    offset = server.trace_offset()
+    rss_before = server.rss()
+    with MemorySampler(server) as sampler:
+        start = time.perf_counter()
+        records = asyncio.run(drive(server.url, sessions, args.steps, args.think_ms / 1000, args.seed))
+        wall_s = time.perf_counter() - start
+    return summarize(sessions, records, wall_s, stub.stats(), server.read_traces(offset),
+                     rss_before, server.rss(), sampler.peak)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the dashboard")
+    parser.add_argument("--sessions", default="1,2,4,8", help="comma-separated concurrency levels")
+    parser.add_argument("--steps", type=int, default=8, help="interactions per session after the page load")
+    parser.add_argument("--think-ms", type=float, default=500.0, help="mean pause between interactions")
+    parser.add_argument("--fixtures", default="recorded",
+                        help="'recorded', 'synthetic' or a directory saved by OpenAlexFixtures.save")
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="stub latency per OpenAlex request")
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of stub requests that fail with 503")
+    parser.add_argument("--rate", type=float, default=200.0, help="client requests per second to the stub")
+    parser.add_argument("--no-response-cache", action="store_true", help="run the server without the response cache")
+    parser.add_argument("--reuse-server", action="store_true",
+                        help="one server for all levels (later levels start with warm caches)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+    levels = [int(n) for n in args.sessions.split(",")]
+
+    if args.fixtures == "synthetic":
+        fixtures = OpenAlexFixtures.synthetic(seed=args.seed)
+    else:
+        fixtures = OpenAlexFixtures.load(RECORDED_DIR if args.fixtures == "recorded" else args.fixtures)
+    config = StubConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                        error_rate=args.error_rate, seed=args.seed)
+
+    work_dir = tempfile.mkdtemp(prefix="dashboard_load_")
+    results = []
+    try:
+        with OpenAlexStubServer(fixtures, config=config) as stub:
+            server = None
+            for sessions in levels:
+                if server is None or not args.reuse_server:
+                    if server is not None:
+                        server.stop()
+                    level_dir = os.path.join(work_dir, f"level_{sessions}")
+                    os.makedirs(level_dir, exist_ok=True)
+                    server = DashboardServer(stub.url, level_dir, args.rate, not args.no_response_cache).start()
+                print(f"{sessions} session(s) × {args.steps + 1} runs ...", flush=True)
+                results.append(run_level(server, stub, sessions, args))
+            server.stop()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print()
+    print_summary(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "levels": results}, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
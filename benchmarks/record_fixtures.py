@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Record OpenAlex fixtures for the benchmarks from the local count store.
+
+The store holds counts fetched from OpenAlex. They are saved as a count cube
+(plus derived all-field totals and citation rates) in benchmarks/fixtures/recorded/,
+so benchmark runs are reproducible and never touch the network.
+
+Example:
+    python benchmarks/record_fixtures.py
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.openalex_fixtures import OpenAlexFixtures
+from services.store import AI_CONCEPT_ID, DL_CONCEPT_ID
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "recorded")
+
+# OpenAlex display names of the recorded concepts
+CONCEPT_NAMES = {
+    AI_CONCEPT_ID: "Artificial intelligence",
+    DL_CONCEPT_ID: "Deep learning",
+}
+
+
+def main():
+    fixtures = OpenAlexFixtures.from_store(names=CONCEPT_NAMES)
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    fixtures.save(FIXTURE_DIR)
+    cube = fixtures.cube
+    print(f"Saved {len(cube.concepts) - 1} concepts × {len(cube.countries)} countries × "
+          f"{len(cube.years)} years to {FIXTURE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
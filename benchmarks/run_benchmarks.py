@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the fetch, transform and render hot paths.
+
+Every OpenAlex request is answered by fixtures (services/openalex_fixtures.py)
+through the real client, with a fixed simulated network latency. Nothing goes
+to api.openalex.org, and the project's response cache is never touched.
+
+Suites:
+    recorded   counts recorded from OpenAlex (benchmarks/fixtures/recorded)
+    synthetic  generated counts, 200 countries × 500 concepts × 30 years by default
+
+Each benchmark runs --repeat times. Min, median and max seconds are printed
+and appended to benchmarks/results/history.jsonl together with the git commit,
+so regressions between versions show up (--compare prints the change against
+the previous run of the same benchmark, by best time).
+
+Example:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --suite synthetic --filter transform --compare
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services import cache as response_cache
+from services.cube import CountCube
+from services.growth import GrowthEngine
+from services.openalex_api import (
+    fetch_citations_by_country,
+    fetch_openalex_data,
+    fetch_total_publications_by_country,
+)
+from services.openalex_client import API_BASE_URL, OpenAlexClient, set_client
+from services.openalex_fixtures import ALL_WORKS, FixtureAdapter, OpenAlexFixtures
+from dashboard import compute
+from visualizations.map_publications_by_year_range import build_viewer_data
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RECORDED_DIR = os.path.join(BENCH_DIR, "fixtures", "recorded")
+HISTORY_PATH = os.path.join(BENCH_DIR, "results", "history.jsonl")
+
+# A rerun counts as a regression when its best time is this much slower (and by at least REGRESSION_MIN_S)
+REGRESSION_THRESHOLD = 0.2
+REGRESSION_MIN_S = 0.001
+
+
+# --- Environment ---
+
+def install_fixtures(fixtures, latency):
+    """Route the shared client to the fixtures; no rate limit, so the latency is the only wait."""
+    client = OpenAlexClient(rate=1e9, burst=1e9, max_retries=0)
+    client.session.mount(API_BASE_URL, FixtureAdapter(fixtures, latency))
+    set_client(client)
+
+
+class TempCache:
+    """Fresh on-disk response cache per use; replaces the process-wide cache."""
+
+    def __init__(self):
+        self.directory = tempfile.mkdtemp(prefix="openalex-bench-")
+        self.generation = 0
+
+    def fresh(self):
+        self.generation += 1
+        cache = response_cache.ResponseCache(os.path.join(self.directory, f"cache-{self.generation}.sqlite"))
+        response_cache.set_default_cache(cache)
+        return cache
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=BENCH_DIR, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    capture_output=True, text=True, cwd=BENCH_DIR).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+# --- Benchmarks ---
+
+def build_benchmarks(fixtures, temp_cache):
+    """[(name, params, setup, run)]: setup() runs untimed before every timed run()."""
+    cube = fixtures.cube
+    concepts = [c for c in cube.concepts if c != ALL_WORKS]
+    concept_id = concepts[0]
+    year_range = (int(cube.years[0]), int(cube.years[-1]))
+    n_years = len(cube.years)
+    no_setup = lambda: None
+
+    def disable_cache():
+        response_cache.set_default_cache(None)
+
+    def warm_country_frame():
+        temp_cache.fresh()
+        fetch_openalex_data(concept_id, year_range)
+        fetch_total_publications_by_country(year_range)
+
+    # Inputs for the transform and render benchmarks
+    tidy = pd.DataFrame({
+        "concept_id": np.repeat(concepts, len(cube.countries) * n_years),
+        "year": np.tile(cube.years, len(concepts) * len(cube.countries)),
+        "country_code": np.tile(np.repeat(cube.countries, n_years), len(concepts)),
+        "count": cube.counts[:len(concepts)].ravel(),
+    })
+    tidy = tidy[tidy["count"] > 0]
+    growth_engine = GrowthEngine(cube)
+    viewer_concepts = {c: c for c in concepts[:2]}
+    response_cache.set_default_cache(None)
+    df_live = compute._build_country_frame(concept_id, year_range, use_snapshot=False)
+
+    def all_range_frames():
+        for start in cube.years:
+            for end in cube.years[cube.years >= start]:
+                cube.range_frame(concept_id, (start, end))
+
+    scale = {"concepts": len(concepts), "countries": len(cube.countries), "years": n_years}
+    return [
+        ("fetch.range_query", {**scale, "queries": 1}, disable_cache,
+         lambda: fetch_openalex_data(concept_id, year_range)),
+        ("fetch.year_fragments_cold", {**scale, "queries": n_years}, temp_cache.fresh,
+         lambda: fetch_openalex_data(concept_id, year_range)),
+        ("fetch.year_fragments_warm", {**scale, "queries": n_years}, warm_country_frame,
+         lambda: fetch_openalex_data(concept_id, year_range)),
+        ("fetch.citations", {**scale, "queries": len(df_live)}, disable_cache,
+         lambda: fetch_citations_by_country(concept_id, df_live["country_code"], year_range)),
+        ("transform.country_frame", scale, warm_country_frame,
+         lambda: compute._build_country_frame(concept_id, year_range, use_snapshot=False)),
+        ("transform.cube_from_frame", {**scale, "rows": len(tidy)}, no_setup,
+         lambda: CountCube.from_frame(tidy)),
+        ("transform.range_frames_all_pairs", {**scale, "ranges": n_years * (n_years + 1) // 2}, no_setup,
+         all_range_frames),
+        ("transform.range_viewer_data", {**scale, "viewer_concepts": len(viewer_concepts)}, no_setup,
+         lambda: build_viewer_data(cube, viewer_concepts)),
+        ("transform.growth_frames", scale, no_setup,
+         lambda: [growth_engine.growth_frame(c, *year_range) for c in concepts]),
+        ("render.plotly_figures", {"countries": len(df_live)}, no_setup,
+         lambda: compute._build_figures(df_live, "Benchmark", year_range)),
+        ("render.folium_map_html", {"countries": len(df_live)}, no_setup,
+         lambda: compute._build_map_html(df_live, "Benchmark", year_range, "YlGnBu")),
+    ]
+
+
+def time_benchmark(setup, run, repeat):
+    samples = []
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+# --- History ---
+
+def load_history(path=HISTORY_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(records, path=HISTORY_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, sort_keys=True) + "\n")
+
+
+def previous_best(history, record):
+    """Best time of the last earlier run of the same benchmark with the same parameters."""
+    for old in reversed(history):
+        if (old["suite"], old["benchmark"], old["params"], old["latency_ms"]) == \
+                (record["suite"], record["benchmark"], record["params"], record["latency_ms"]):
+            return old["min_s"]
+    return None
+
+
+def print_results(records, history, compare):
+    print(f"{'suite':<10} {'benchmark':<34} {'min':>9} {'median':>9} {'max':>9}" + ("  change" if compare else ""))
+    regressions = []
+    for r in records:
+        line = f"{r['suite']:<10} {r['benchmark']:<34} {r['min_s']:>9.4f} {r['median_s']:>9.4f} {r['max_s']:>9.4f}"
+        if compare:
+            before = previous_best(history, r)
+            if before:
+                change = r["min_s"] / before - 1
+                line += f"  {change:+.0%}"
+                if change > REGRESSION_THRESHOLD and r["min_s"] - before > REGRESSION_MIN_S:
+                    line += "  REGRESSION"
+                    regressions.append(r["benchmark"])
+            else:
+                line += "  (new)"
+        print(line)
+    return regressions
+
+
+# --- Main ---
+
+def load_suite(suite, args):
+    if suite == "recorded":
+        if not os.path.exists(RECORDED_DIR):
+            sys.exit(f"No recorded fixtures in {RECORDED_DIR}; run benchmarks/record_fixtures.py first")
+        return OpenAlexFixtures.load(RECORDED_DIR)
+    return OpenAlexFixtures.synthetic(args.countries, args.concepts, args.years, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument("--suite", choices=["recorded", "synthetic", "all"], default="all")
+    parser.add_argument("--filter", default="", help="only benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="simulated OpenAlex latency per request")
+    parser.add_argument("--countries", type=int, default=200)
+    parser.add_argument("--concepts", type=int, default=500)
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compare", action="store_true", help="show change against the previous run")
+    parser.add_argument("--no-history", action="store_true", help="do not append results to the history")
+    args = parser.parse_args()
+
+    commit, dirty = git_revision()
+    history = load_history()
+    temp_cache = TempCache()
+    records = []
+    for suite in (["recorded", "synthetic"] if args.suite == "all" else [args.suite]):
+        fixtures = load_suite(suite, args)
+        install_fixtures(fixtures, args.latency_ms / 1000)
+        for name, params, setup, run in build_benchmarks(fixtures, temp_cache):
+            if args.filter not in name:
+                continue
+            samples = time_benchmark(setup, run, args.repeat)
+            records.append({
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "commit": commit,
+                "dirty": dirty,
+                "python": platform.python_version(),
+                "suite": suite,
+                "benchmark": name,
+                "params": params,
+                "latency_ms": args.latency_ms,
+                "repeat": args.repeat,
+                "min_s": round(min(samples), 6),
+                "median_s": round(statistics.median(samples), 6),
+                "max_s": round(max(samples), 6),
+            })
+
+    regressions = print_results(records, history, args.compare)
+    if not args.no_history:
+        append_history(records)
+        print(f"\nAppended {len(records)} results to {os.path.relpath(HISTORY_PATH)}")
+    if regressions:
+        print(f"Regressions (> {REGRESSION_THRESHOLD:.0%} slower): {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,24 @@
 import sys
 import os
+import time
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import pycountry
-import folium
-import json
 import streamlit.components.v1 as components
 import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import plotly.io as pio
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from services.openalex_api import fetch_openalex_data, fetch_openalex_concepts, fetch_total_publications_by_country
+from services import metrics
+from services.concepts import ConceptCatalog
+from services.openalex_client import get_client
+from services.warmup import CacheWarmer
+from dashboard.compute import (
+    compute_cache, get_citation_frame, get_country_frame, get_figures, get_growth_frame, get_map_html,
+)
 
 st.set_page_config(layout="wide")
+# Timing spans of this run (shown in the debug panel, logged and exported at the end)
+metrics.start_trace()
 st.title("📊 Global Research Dashboard: AI & Deep Learning (2010–2020)")
 
 # --- Simplified Field Selector ---
@@ -24,346 +28,328 @@ PREDEFINED_CONCEPTS = {
     "Deep Learning": "C108583219"
 }
 
-# Comment out the dynamic field selector 
-# with st.spinner("Fetching available research fields from OpenAlex..."):
-#     concepts = fetch_openalex_concepts(per_page=50, max_pages=5)
-#     concept_options = {c["display_name"]: c["id"] for c in concepts}
-# field_display = st.selectbox("Select Field of Research", list(concept_options.keys()))
-# selected_concept_id = concept_options[field_display]
+MAP_COLOR_SCALE = "YlGnBu"
 
-# New simplified field selector
-field_display = st.selectbox("Select Field of Research", list(PREDEFINED_CONCEPTS.keys()))
-selected_concept_id = PREDEFINED_CONCEPTS[field_display]
+@st.cache_resource
+def load_concept_catalog():
+    """Local concept catalog and its search index, loaded once per server process (no network)."""
+    return ConceptCatalog.load()
 
-# --- Year Range Slider ---
-year_range = st.slider("Select Year Range", min_value=2010, max_value=2020, value=(2010, 2020))
-year_from, year_to = year_range
+@st.cache_resource
+def start_cache_warmup():
+    """Prefetch per-year fragments for the predefined concepts once per server process."""
+    warmer = CacheWarmer(PREDEFINED_CONCEPTS.values(), range(2010, 2021))
+    warmer.start()
+    return warmer
+
+cache_warmer = start_cache_warmup()
+with st.sidebar.expander("Cache warm-up"):
+    if not cache_warmer.enabled:
+        st.caption("Response cache disabled: warm-up skipped")
+    else:
+        warmup_progress = cache_warmer.progress()
+        warmup_done = warmup_progress["completed"] + warmup_progress["skipped"] + warmup_progress["failed"]
+        st.progress(warmup_done / warmup_progress["total"])
+        st.caption(
+            f"{warmup_done}/{warmup_progress['total']} fragments "
+            f"({warmup_progress['failed']} failed) · "
+            f"{'running' if warmup_progress['running'] else 'idle'}"
+        )
+        st.caption(f"Cache coverage: {cache_warmer.coverage():.0%}")
+
+def with_citations(df_live, concept_id, year_range, use_snapshot):
+    """Country frame plus cited_by_count and citations_per_publication (one batched, cached pass)."""
+    df_citations = get_citation_frame(concept_id, year_range, use_snapshot)
+    df = df_live.drop(columns="cited_by_count", errors="ignore").merge(df_citations, on="country_code", how="left")
+    df["citations_per_publication"] = round(df["cited_by_count"] / df["count"], 2)
+    df.attrs["query_timings"] = df_citations.attrs.get("query_timings", {})
+    df.attrs["failed_countries"] = df_citations.attrs.get("failed_countries", [])
+    return df
+
+@st.fragment
+def render_charts(field_display, concept_id, year_range, use_snapshot):
+    year_from, year_to = year_range
+    with metrics.span("page.figures"):
+        figures = get_figures(field_display, concept_id, year_range, use_snapshot)
+        fig_pie = pio.from_json(figures["pie"])
+        fig_bar = pio.from_json(figures["bar"])
 
-# --- Load OpenAlex Data ---
-data_load_state = st.text("Loading data from OpenAlex...")
-df_live = fetch_openalex_data(selected_concept_id, (year_from, year_to))
-
-# --- Load Total Publications Data for Normalization ---
-with st.spinner("Loading total publications data for specialization analysis..."):
-    df_total = fetch_total_publications_by_country((year_from, year_to))
-data_load_state.text("✓ Live data loaded successfully")
-
-# --- Clean and Format Data ---
-if "country_code" in df_live.columns:
-    df_live["country_code"] = df_live["country_code"].apply(lambda x: x.split("/")[-1] if isinstance(x, str) else x)
-
-# Also clean country codes in df_total
-if "country_code" in df_total.columns:
-    df_total["country_code"] = df_total["country_code"].apply(lambda x: x.split("/")[-1] if isinstance(x, str) else x)
-
-def get_country_name(alpha2_code):
-    try:
-        return pycountry.countries.get(alpha_2=alpha2_code).name
-    except:
-        return alpha2_code
-
-def alpha2_to_alpha3(alpha2):
-    try:
-        return pycountry.countries.get(alpha_2=alpha2).alpha_3
-    except:
-        return None
-
-def get_country_name_from_short(short_code):
-    """Convert short country codes to full country names"""
-    try:
-        return pycountry.countries.get(alpha_2=short_code).name
-    except:
-        return short_code
-
-# --- Calculate Specialization Ratio FIRST ---
-# Merge with total publications data before any other processing
-df_live = df_live.merge(df_total, on="country_code", how="left")
-df_live["specialization_ratio"] = round((df_live["count"] / df_live["total_publications"]) * 100, 2)
-df_live["specialization_ratio"] = df_live["specialization_ratio"].fillna(0)
-
-# --- Now add country names and ISO codes ---
-df_live["country_name"] = df_live["country_code"].apply(get_country_name)
-df_live["iso_a3"] = df_live["country_code"].apply(alpha2_to_alpha3)
-df_live = df_live.dropna(subset=["iso_a3"])
-
-# --- Calculate Share ---
-total_count = df_live["count"].sum()
-df_live["share (%)"] = round((df_live["count"] / total_count) * 100, 2)
-
-# Remove citation data fetching to simplify the dashboard
-
-# --- Display Warning if Empty ---
-if df_live.empty:
-    st.warning("No data available for the selected year range.")
-else:
     # --- Interactive Pie Chart ---
     st.subheader(f"Country Distribution - {field_display} Publications ({year_from}–{year_to})")
-    
-    # Prepare data for pie chart (top 10 countries + "Others")
-    df_pie = df_live.sort_values(by="count", ascending=False).head(10).copy()
-    others_count = df_live.sort_values(by="count", ascending=False).iloc[10:]["count"].sum()
-    
-    if others_count > 0:
-        others_row = pd.DataFrame({
-            "country_name": ["Others"],
-            "count": [others_count],
-            "share (%)": [round((others_count / total_count) * 100, 2)]
-        })
-        df_pie = pd.concat([df_pie, others_row], ignore_index=True)
-    
-    # Create interactive pie chart with Plotly
-    fig_pie = px.pie(
-        df_pie, 
-        values="count", 
-        names="country_name",
-        title=f"Distribution of {field_display} Publications by Country ({year_from}–{year_to})",
-        hover_data=["share (%)"],
-        hole=0.3  # Create a donut chart
-    )
-    
-    # Customize the pie chart
-    fig_pie.update_traces(
-        textposition='inside',
-        textinfo='percent+label',
-        hovertemplate="<b>%{label}</b><br>" +
-                     "Publications: %{value}<br>" +
-                     "Share: %{customdata[0]:.2f}%<br>" +
-                     "<extra></extra>"
-    )
-    
-    fig_pie.update_layout(
-        height=500,
-        showlegend=True,
-        legend=dict(
-            orientation="v",
-            yanchor="top",
-            y=1,
-            xanchor="left",
-            x=1.02
-        )
-    )
-    
     st.plotly_chart(fig_pie, use_container_width=True)
-    
+
     # --- Interactive Bar Chart for Top Countries ---
     st.subheader(f"📊 Top Countries by Publication Count - {field_display}")
-    
-    # Prepare data for bar chart (top 10 countries)
-    df_bar = df_live.sort_values(by="count", ascending=False).head(10)
-    
-    fig_bar = px.bar(
-        df_bar,
-        x="country_name",
-        y="count",
-        title=f"Top 10 Countries by {field_display} Publications ({year_from}–{year_to})",
-        hover_data=["share (%)", "specialization_ratio"],
-        color="count",
-        color_continuous_scale="viridis"
-    )
-    
-    fig_bar.update_traces(
-        hovertemplate="<b>%{x}</b><br>" +
-                     "Publications: %{y}<br>" +
-                     "Share: %{customdata[0]:.2f}%<br>" +
-                     "Specialization: %{customdata[1]:.2f}%<br>" +
-                     "<extra></extra>",
-        text=df_bar["count"].apply(lambda x: f"{x:,}"),
-        textposition='auto'
-    )
-    
-    fig_bar.update_layout(
-        xaxis_title="Country",
-        yaxis_title="Number of Publications",
-        height=500,
-        xaxis={'categoryorder':'total descending'}
-    )
-    
     st.plotly_chart(fig_bar, use_container_width=True)
-    
+
+@st.fragment
+def render_map(field_display, concept_id, year_range, use_snapshot):
+    year_from, year_to = year_range
     # --- Choropleth Map with folium ---
     st.subheader(f"🗺️ Choropleth Map of {field_display} Publications ({year_from}–{year_to})")
 
-    with open("assets/world-countries.json", "r", encoding="utf-8") as f:
-        geojson_data = json.load(f)
-
-    m = folium.Map(location=[20, 0], zoom_start=2)
-    folium.Choropleth(
-        geo_data=geojson_data,
-        name="choropleth",
-        data=df_live,
-        columns=["iso_a3", "count"],
-        key_on="feature.id",
-        fill_color="YlGnBu",
-        fill_opacity=0.7,
-        line_opacity=0.2,
-        legend_name=f"{field_display} Publications ({year_from}–{year_to})",
-        nan_fill_color="#ffffff",     # <<< No-data countries = WHITE
-        nan_fill_opacity=1.0          
-    ).add_to(m)
-
-    folium.TileLayer(
-        tiles="https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}{r}.png",
-        attr="&copy; OpenStreetMap contributors &copy; CARTO",
-        name="CartoDB Positron",
-        control=False
-    ).add_to(m)
-
-    map_path = "visualizations/outputs/live_map.html"
-    m.save(map_path)
-    components.html(open(map_path, 'r', encoding='utf-8').read(), height=600, scrolling=True)
+    # Map HTML is rendered in memory and memoized per (concept, range, color scale)
+    with metrics.span("page.map"):
+        map_html = get_map_html(field_display, concept_id, year_range, use_snapshot, MAP_COLOR_SCALE)
+        components.html(map_html, height=600, scrolling=True)
 
+@st.fragment
+def render_country_tables(df_live, field_display, concept_id, year_range, use_snapshot):
+    year_from, year_to = year_range
     # --- Table Display ---
     st.subheader(f"Publications by Country ({year_from}–{year_to}) - {field_display}")
-    
-    # Create tabs for different views
-    tab1, tab2 = st.tabs(["Publication Counts", "Specialization Analysis"])
-    
-    with tab1:
-        table_cols = ["country_name", "count", "share (%)"]
-        st.dataframe(
-            df_live[table_cols]
-            .sort_values(by="count", ascending=False)
-            .reset_index(drop=True)
-        )
-    
-    with tab2:
-        # Specialization analysis table
-        specialization_cols = ["country_name", "count", "total_publications", "specialization_ratio"]
-        df_specialization = df_live[specialization_cols].copy()
-        df_specialization = df_specialization.sort_values(by="specialization_ratio", ascending=False).reset_index(drop=True)
-        
-        st.markdown("### Research Specialization Analysis")
-        st.markdown("**Specialization Ratio** = (Field Publications / Total Publications) × 100")
-        st.markdown("This shows which countries are truly specializing in this research field, regardless of their total research volume.")
-        
-        # Debug info
-        st.write(f"Total countries in dataset: {len(df_specialization)}")
-        st.write(f"Countries with count > 0: {len(df_specialization[df_specialization['count'] > 0])}")
-        # st.write(f"Countries with specialization > 0: {len(df_specialization[df_specialization['specialization_ratio'] > 0])}")
-        
-        st.dataframe(df_specialization)
-        
-        # Show top 10 specialized countries
-        st.markdown("### Top 10 Countries by Specialization")
-        top_specialized = df_specialization.head(10)
-        st.dataframe(top_specialized)
-        
-        # Create an interactive bar chart for top specialized countries
-        fig_specialization = px.bar(
-            top_specialized,
-            x="specialization_ratio",
-            y="country_name",
-            orientation='h',
-            title=f"Top 10 Countries by {field_display} Specialization ({year_from}–{year_to})",
-            hover_data=["count", "total_publications"]
-        )
-        
-        fig_specialization.update_traces(
-            hovertemplate="<b>%{y}</b><br>" +
-                         "Specialization: %{x:.2f}%<br>" +
-                         "Field Publications: %{customdata[0]}<br>" +
-                         "Total Publications: %{customdata[1]}<br>" +
-                         "<extra></extra>",
-            text=top_specialized["specialization_ratio"].apply(lambda x: f"{x:.2f}%"),
-            textposition='auto'
-        )
-        
-        fig_specialization.update_layout(
-            xaxis_title="Specialization Ratio (%)",
-            yaxis_title="Country",
-            height=500
-        )
-        
-        st.plotly_chart(fig_specialization, use_container_width=True)
+    show_citations = st.checkbox(
+        "Show citations per country", value=False,
+        help="One OpenAlex request per country for a new year range; extending a loaded range only fetches the added years.",
+    )
 
-    # --- Divider ---
-    st.markdown("---")
+    # Only the open tab is rendered; switching tabs reruns just this section
+    tab1, tab2 = st.tabs(["Publication Counts", "Specialization Analysis"], key="country_table_tab", on_change="rerun")
 
+    if tab1.open:
+        with tab1, metrics.span("page.counts_table"):
+            table_cols = ["country_name", "count", "share (%)"]
+            table = df_live
+            if show_citations:
+                # Citations for every country in the table, from cached per-(country, year) fragments
+                with st.spinner("Loading citations from OpenAlex..."), metrics.span("page.citations"):
+                    table = with_citations(df_live, concept_id, year_range, use_snapshot)
+                table_cols += ["cited_by_count", "citations_per_publication"]
+                for label, seconds in table.attrs["query_timings"].items():
+                    st.caption(f"{label}: {seconds:.2f}s when first computed")
+                if table.attrs["failed_countries"]:
+                    st.warning(
+                        f"Citations could not be loaded for {len(table.attrs['failed_countries'])} "
+                        "countries (shown as empty); they are retried on the next run."
+                    )
+            st.dataframe(
+                table[table_cols]
+                .sort_values(by="count", ascending=False)
+                .reset_index(drop=True)
+            )
+
+    if tab2.open:
+        with tab2, metrics.span("page.specialization_tab"):
+            # Specialization analysis table
+            specialization_cols = ["country_name", "count", "total_publications", "specialization_ratio"]
+            df_specialization = df_live[specialization_cols].copy()
+            df_specialization = df_specialization.sort_values(by="specialization_ratio", ascending=False).reset_index(drop=True)
+
+            st.markdown("### Research Specialization Analysis")
+            st.markdown("**Specialization Ratio** = (Field Publications / Total Publications) × 100")
+            st.markdown("This shows which countries are truly specializing in this research field, regardless of their total research volume.")
+
+            # Debug info
+            st.write(f"Total countries in dataset: {len(df_specialization)}")
+            st.write(f"Countries with count > 0: {len(df_specialization[df_specialization['count'] > 0])}")
+            # st.write(f"Countries with specialization > 0: {len(df_specialization[df_specialization['specialization_ratio'] > 0])}")
+
+            st.dataframe(df_specialization)
+
+            # Show top 10 specialized countries
+            st.markdown("### Top 10 Countries by Specialization")
+            top_specialized = df_specialization.head(10)
+            st.dataframe(top_specialized)
+
+            # Interactive bar chart for top specialized countries
+            figures = get_figures(field_display, concept_id, year_range, use_snapshot)
+            st.plotly_chart(pio.from_json(figures["specialization"]), use_container_width=True)
+
+@st.fragment
+def render_growth(df_growth, field_display, year_range):
+    year_from, year_to = year_range
     # --- Growth Chart ---
-    st.subheader(f"📈 Top 5 Countries by Growth in {field_display} (2010–2020)")
-    
-    # Load growth data based on selected field
-    if field_display == "Artificial Intelligence":
-        growth_file = "data/raw/ai_growth_2010_2020.csv"
-    else:  # Deep Learning
-        growth_file = "data/raw/deep_learning_growth_2010_2020.csv"
-    
-    try:
-        df_growth = pd.read_csv(growth_file)
-        
-        # Get top 5 countries by growth percentage
-        top5_growth = df_growth.sort_values(by="growth_percent", ascending=False).head(5).copy()
-        
-        # Add full country names for better readability
-        top5_growth["country_name"] = top5_growth["country_short"].apply(get_country_name_from_short)
-        
-        # Create interactive bar chart for growth
+    st.subheader(f"📈 Top 5 Countries by Growth in {field_display} ({year_from}–{year_to})")
+
+    if df_growth is None:
+        st.info("Select a range of at least two years to compare growth.")
+        return
+
+    # Growth from zero publications is undefined
+    top5_growth = df_growth.dropna(subset=["growth_percent"]).head(5)
+
+    if top5_growth.empty:
+        st.warning(f"No publications in {year_from} to compare growth against.")
+        return
+
+    with metrics.span("page.growth_chart"):
         fig_growth = px.bar(
             top5_growth,
             x="country_name",
             y="growth_percent",
-            title=f"Top 5 Countries by Growth in {field_display} (2010–2020)",
-            hover_data=["2010", "2020"],
+            title=f"Top 5 Countries by Growth in {field_display} ({year_from}–{year_to})",
+            hover_data=["base_count", "end_count", "cagr_percent"],
             color="growth_percent",
             color_continuous_scale="viridis"
         )
-        
+
         fig_growth.update_traces(
             hovertemplate="<b>%{x}</b><br>" +
                          "Growth: %{y:.0f}%<br>" +
-                         "2010: %{customdata[0]} publications<br>" +
-                         "2020: %{customdata[1]} publications<br>" +
+                         f"{year_from}: " + "%{customdata[0]} publications<br>" +
+                         f"{year_to}: " + "%{customdata[1]} publications<br>" +
+                         "CAGR: %{customdata[2]:.1f}%<br>" +
                          "<extra></extra>",
             text=top5_growth["growth_percent"].apply(lambda x: f"{x:.0f}%"),
             textposition='auto'
         )
-        
+
         fig_growth.update_layout(
             xaxis_title="Country",
             yaxis_title="Growth Percentage (%)",
             height=500
         )
-        
-        st.plotly_chart(fig_growth, use_container_width=True)
-        
-        # Display growth data table
-        st.markdown("### 📊 Growth Data Table")
-        growth_table_cols = ["country_name", "country_short", "2010", "2020", "growth_percent"]
-        st.dataframe(
-            top5_growth[growth_table_cols]
-            .sort_values(by="growth_percent", ascending=False)
-            .reset_index(drop=True)
-        )
-        
-    except FileNotFoundError:
-        st.warning(f"Growth data file not found: {growth_file}")
-    except Exception as e:
-        st.error(f"Error loading growth data: {str(e)}")
 
-    # --- Divider ---
-    st.markdown("---")
+    st.plotly_chart(fig_growth, use_container_width=True)
 
+    # Display growth data table
+    st.markdown("### 📊 Growth Data Table")
+    st.dataframe(
+        top5_growth[["country_name", "country_code", "base_count", "end_count", "growth_percent", "cagr_percent"]]
+        .rename(columns={"base_count": str(year_from), "end_count": str(year_to), "cagr_percent": "CAGR (%)"})
+        .reset_index(drop=True)
+    )
+
+@st.fragment
+def render_downloads(df_live, field_display, concept_id, year_range, use_snapshot):
+    year_from, year_to = year_range
     # --- CSV Download ---
     st.subheader("Download Fetched Data (CSV)")
-    
+    include_citations = st.checkbox("Include citations in the publication counts export", value=False)
+    file_prefix = field_display.lower().replace(' ', '_')
+
+    # CSVs are built only when a button is clicked, and clicking does not rerun the page
+    def publication_counts_csv():
+        table_cols = ["country_name", "count", "share (%)"]
+        table = df_live
+        if include_citations:
+            table = with_citations(df_live, concept_id, year_range, use_snapshot)
+            table_cols += ["cited_by_count", "citations_per_publication"]
+        return table[table_cols].to_csv(index=False).encode('utf-8')
+
+    def specialization_csv():
+        specialization_export_cols = ["country_name", "count", "total_publications", "specialization_ratio", "share (%)"]
+        return df_live[specialization_export_cols].to_csv(index=False).encode('utf-8')
+
     col1, col2 = st.columns(2)
-    
+
     with col1:
         st.download_button(
             label=f"Download Publication Counts ({year_from}–{year_to})",
-            data=df_live[table_cols].to_csv(index=False).encode('utf-8'),
-            file_name=f"{field_display.lower().replace(' ', '_')}_publications_{year_from}_{year_to}.csv",
-            mime="text/csv"
+            data=publication_counts_csv,
+            file_name=f"{file_prefix}_publications_{year_from}_{year_to}.csv",
+            mime="text/csv",
+            on_click="ignore",
         )
-    
+
     with col2:
-        specialization_export_cols = ["country_name", "count", "total_publications", "specialization_ratio", "share (%)"]
         st.download_button(
             label=f"Download Specialization Analysis ({year_from}–{year_to})",
-            data=df_live[specialization_export_cols].to_csv(index=False).encode('utf-8'),
-            file_name=f"{field_display.lower().replace(' ', '_')}_specialization_{year_from}_{year_to}.csv",
-            mime="text/csv"
+            data=specialization_csv,
+            file_name=f"{file_prefix}_specialization_{year_from}_{year_to}.csv",
+            mime="text/csv",
+            on_click="ignore",
         )
 
+@st.fragment
+def render_timing_panel(page_trace):
+    # Toggling the panel reruns only this fragment; it shows the last full run
+    if st.checkbox("Debug: show timing spans", value=False):
+        with st.expander("Timing spans", expanded=True):
+            spans = pd.DataFrame(page_trace.records())
+            st.caption(f"Last full run: {page_trace.seconds:.3f}s, {len(spans)} spans")
+            if not spans.empty:
+                spans["span"] = ["· " * depth + name for depth, name in zip(spans["depth"], spans["span"])]
+                st.dataframe(spans.drop(columns=["depth", "thread"]), hide_index=True)
+
+# --- Field Selector ---
+# Searches the local concept catalog (scripts/refresh_concepts.py); the
+# predefined concepts are always offered and are the only ones without a catalog
+concept_catalog = load_concept_catalog()
+concept_options = {name: (concept_id, name) for name, concept_id in PREDEFINED_CONCEPTS.items()}
+if len(concept_catalog):
+    field_query = st.text_input(
+        "Search research fields", placeholder=f"Search {len(concept_catalog):,} OpenAlex concepts"
+    )
+    if field_query:
+        matches = concept_catalog.search(field_query, limit=50)
+        concept_options = {
+            f"{row.display_name} (level {row.level}, {row.works_count:,} works)": (row.id, row.display_name)
+            for row in matches.itertuples()
+        } or concept_options
+field_label = st.selectbox("Select Field of Research", list(concept_options.keys()))
+selected_concept_id, field_display = concept_options[field_label]
+
+# --- Year Range Slider ---
+year_range = st.slider("Select Year Range", min_value=2010, max_value=2020, value=(2010, 2020))
+year_from, year_to = year_range
+
+use_snapshot = st.checkbox("Use local snapshot for field counts when available (faster)", value=True)
+
+# --- Load OpenAlex Data ---
+# Merged frame and derived columns are memoized per (concept, year range, source)
+# Field counts and totals are fetched concurrently; the page waits for the slowest
+data_load_state = st.text("Loading data from OpenAlex...")
+load_start = time.perf_counter()
+with metrics.span("page.country_frame"):
+    df_live = get_country_frame(selected_concept_id, (year_from, year_to), use_snapshot)
+query_timings = dict(df_live.attrs.get("query_timings", {}))
+
+# Growth from the first to the last selected year, indexed out of the growth engine
+df_growth = None
+if year_from != year_to and not df_live.empty:
+    with metrics.span("page.growth"):
+        df_growth = get_growth_frame(selected_concept_id, (year_from, year_to), use_snapshot)
+    query_timings.update(df_growth.attrs.get("query_timings", {}))
+load_seconds = time.perf_counter() - load_start
+data_load_state.text(f"✓ Live data loaded successfully ({load_seconds:.2f}s)")
+
+with st.expander("Query timings"):
+    st.caption(
+        "Timings from when this selection was first computed; "
+        f"this page load took {load_seconds:.2f}s"
+    )
+    st.table(pd.DataFrame(
+        {"seconds": [round(v, 3) for v in query_timings.values()]},
+        index=list(query_timings.keys()),
+    ))
+
+# --- Page Sections ---
+# Field, year range and data source are page-level inputs: changing them reruns
+# the whole script. Every section below is a fragment that receives its inputs
+# as arguments, so a widget inside a section (table tab, citations toggle,
+# export options, debug panel) reruns only that section.
+if df_live.empty:
+    st.warning("No data available for the selected year range.")
+else:
+    render_charts(field_display, selected_concept_id, (year_from, year_to), use_snapshot)
+    render_map(field_display, selected_concept_id, (year_from, year_to), use_snapshot)
+    render_country_tables(df_live, field_display, selected_concept_id, (year_from, year_to), use_snapshot)
+
+    # --- Divider ---
+    st.markdown("---")
+    render_growth(df_growth, field_display, (year_from, year_to))
+
+    # --- Divider ---
+    st.markdown("---")
+    render_downloads(df_live, field_display, selected_concept_id, (year_from, year_to), use_snapshot)
+
     st.markdown("---")
     st.caption("Dashboard for thesis: Development of dashboard for analyzing global scientific productivity (2010–2020)")
+
+# --- Timing Spans ---
+# One JSON log line per run, and process-wide histograms/counters as a
+# Prometheus text file (DASHBOARD_METRICS_PATH) for a node-exporter style scrape
+page_trace = metrics.end_trace()
+metrics.log_trace(
+    page_trace, concept_id=selected_concept_id, year_range=[year_from, year_to], use_snapshot=use_snapshot
+)
+client_stats, memo_stats = get_client().snapshot_stats(), compute_cache.stats()
+metrics.write_prometheus(gauges={
+    **{f"openalex_client_{name}": (value, f"OpenAlex client {name} since process start")
+       for name, value in client_stats.items()},
+    **{f"memo_{name}": (value, f"Compute cache {name.replace('_', ' ')}") for name, value in memo_stats.items()},
+})
+
+with st.sidebar:
+    render_timing_panel(page_trace)
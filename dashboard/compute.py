@@ -0,0 +1,412 @@
+# dashboard/compute.py
+
+"""
+Memoized compute layer for the dashboard.
+
+Streamlit reruns app.py top to bottom on every widget change. Everything that
+depends only on (concept, year range, data source) is computed here once and
+kept in a process-wide LRU cache with a memory budget, so all sessions share it:
+the merged country frame with share/specialization columns and the serialized
+Plotly figures and the Folium map HTML (rendered in memory, never written to
+disk). Entries expire after the response-cache TTL, so a long-running server
+picks up refreshed OpenAlex data; artifacts read from the local store are also
+keyed on its version, so they are rebuilt as soon as the store is rewritten. Global resources (GeoJSON, count cube, growth engine) are loaded once per
+process.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import pandas as pd
+import plotly.express as px
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services import metrics, store
+from services.cache import DEFAULT_TTL
+from services.openalex_api import (
+    fetch_citations_by_country,
+    fetch_counts_by_year,
+    fetch_openalex_data,
+    fetch_total_publications_by_country,
+)
+from services.cube import CountCube
+from services.growth import GROWTH_COLUMNS, GrowthEngine
+from services.countries import normalize_codes, to_alpha3, to_name
+from services.memo import BudgetedLRUCache
+from services.geometry import load_world_geometry
+
+# Memory cap for computed artifacts, shared by all sessions of this process
+CACHE_MAX_MB = int(os.environ.get("DASHBOARD_CACHE_MB", "256"))
+# Artifacts are rebuilt as often as the OpenAlex responses behind them expire
+CACHE_MAX_AGE = int(os.environ.get("DASHBOARD_CACHE_MAX_AGE", str(DEFAULT_TTL)))
+compute_cache = BudgetedLRUCache(CACHE_MAX_MB * 1024 * 1024, max_age=CACHE_MAX_AGE)
+
+# Independent OpenAlex queries for one selection run side by side
+QUERY_WORKERS = 4
+
+
+def load_geojson():
+    """World country polygons, simplified for an overview map and parsed once per process."""
+    return load_world_geometry("overview")
+
+
+@lru_cache(maxsize=1)
+def _count_cube(store_dir, version):
+    return CountCube.from_store(store_dir=store_dir)
+
+
+def load_count_cube():
+    """
+    Concept × country × year cube from the local store, built once per process
+    and rebuilt after the store is rewritten (keyed on store.store_version).
+    """
+    return _count_cube(store.STORE_DIR, store.store_version(store.STORE_DIR))
+
+
+def load_growth_engine():
+    """Growth metrics for any concept and year pair of the current count cube."""
+    return GrowthEngine(load_count_cube())
+
+
+def _snapshot_version(use_snapshot):
+    """Store version for memo keys of artifacts that may read the snapshot."""
+    return store.store_version(store.STORE_DIR) if use_snapshot else None
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run_queries(queries):
+    """
+    Run independent queries ({label: callable}) concurrently.
+    Returns ({label: result}, {label: seconds}); the call takes as long as the slowest query.
+    """
+    with ThreadPoolExecutor(max_workers=min(QUERY_WORKERS, len(queries))) as pool:
+        futures = {label: pool.submit(metrics.propagate(_timed), fn) for label, fn in queries.items()}
+        outcomes = {label: future.result() for label, future in futures.items()}
+    return (
+        {label: result for label, (result, _) in outcomes.items()},
+        {label: seconds for label, (_, seconds) in outcomes.items()},
+    )
+
+
+def _memoized(span_name, key, build, cacheable=None):
+    """compute_cache.get_or_compute(key, build) in a span recording the memo hit or miss."""
+    with metrics.span(span_name) as span:
+        built = []
+
+        def compute():
+            built.append(True)
+            return build()
+
+        value = compute_cache.get_or_compute(key, compute, cacheable)
+        span.set(cache="miss" if built else "hit")
+        return value
+
+
+def _build_country_frame(concept_id, year_range, use_snapshot):
+    start = time.perf_counter()
+    cube = load_count_cube()
+    if use_snapshot and cube.has(concept_id, year_range):
+        # Any year range is one prefix-sum subtraction on the cube
+        field_label, field_query = "Field counts (snapshot)", lambda: cube.range_frame(concept_id, year_range)
+    else:
+        field_label, field_query = "Field counts (OpenAlex)", lambda: fetch_openalex_data(concept_id, year_range)
+
+    # --- Load Total Publications Data for Normalization ---
+    total_label = "Total publications (OpenAlex)"
+    results, timings = run_queries({
+        field_label: field_query,
+        total_label: lambda: fetch_total_publications_by_country(year_range),
+    })
+    df_live, df_total = results[field_label], results[total_label]
+    timings["All queries (wall)"] = time.perf_counter() - start
+
+    # --- Clean and Format Data ---
+    if "country_code" in df_live.columns:
+        df_live["country_code"] = normalize_codes(df_live["country_code"]).astype(object)
+
+    # Also clean country codes in df_total
+    if "country_code" in df_total.columns:
+        df_total["country_code"] = normalize_codes(df_total["country_code"]).astype(object)
+
+    if df_live.empty:
+        df_live.attrs["query_timings"] = timings
+        return df_live
+
+    # --- Calculate Specialization Ratio FIRST ---
+    # Merge with total publications data before any other processing
+    with metrics.span("transform.merge_totals"):
+        df_live = df_live.merge(df_total, on="country_code", how="left")
+        df_live["specialization_ratio"] = round((df_live["count"] / df_live["total_publications"]) * 100, 2)
+        df_live["specialization_ratio"] = df_live["specialization_ratio"].fillna(0)
+
+    # --- Now add country names and ISO codes ---
+    with metrics.span("transform.country_names"):
+        df_live["country_name"] = to_name(df_live["country_code"])
+        df_live["iso_a3"] = to_alpha3(df_live["country_code"])
+        df_live = df_live.dropna(subset=["iso_a3"])
+
+    # --- Calculate Share ---
+    total_count = df_live["count"].sum()
+    df_live["share (%)"] = round((df_live["count"] / total_count) * 100, 2)
+    df_live = df_live.reset_index(drop=True)
+    df_live.attrs["query_timings"] = timings
+    return df_live
+
+
+def get_country_frame(concept_id, year_range, use_snapshot=True):
+    """
+    Merged per-country frame (counts, totals, specialization, names, ISO codes, share).
+    Timings of the queries that built it are in frame.attrs["query_timings"].
+    Shared between sessions: treat the returned frame as read-only.
+    """
+    key = ("country_frame", concept_id, tuple(year_range), bool(use_snapshot), _snapshot_version(use_snapshot))
+    return _memoized(
+        "compute.country_frame", key,
+        lambda: _build_country_frame(concept_id, tuple(year_range), use_snapshot),
+    )
+
+
+
+def _build_citation_frame(concept_id, year_range, use_snapshot):
+    country_codes = get_country_frame(concept_id, year_range, use_snapshot)["country_code"]
+    citations, seconds = _timed(lambda: fetch_citations_by_country(concept_id, country_codes, year_range))
+    citations.attrs["query_timings"] = {f"Citations (OpenAlex, {len(citations)} countries)": seconds}
+    return citations
+
+
+def get_citation_frame(concept_id, year_range, use_snapshot=True):
+    """
+    Citations per country (country_code, cited_by_count) for the countries in the
+    selection's country frame. Shared between sessions: treat as read-only.
+    A frame with failed lookups (frame.attrs["failed_countries"]) is not memoized,
+    so the next run retries them; the lookups that succeeded are in the response cache.
+    """
+    key = ("citations", concept_id, tuple(year_range), bool(use_snapshot), _snapshot_version(use_snapshot))
+    return _memoized(
+        "compute.citations", key,
+        lambda: _build_citation_frame(concept_id, tuple(year_range), use_snapshot),
+        cacheable=lambda frame: not frame.attrs.get("failed_countries"),
+    )
+
+
+def _build_growth_frame(concept_id, year_range, use_snapshot):
+    year_from, year_to = year_range
+    engine = load_growth_engine()
+    if use_snapshot and engine.has(concept_id, year_from, year_to):
+        label = "Growth (snapshot)"
+        df, seconds = _timed(lambda: engine.growth_frame(concept_id, year_from, year_to))
+    else:
+        # Growth only needs the two endpoint years
+        label = "Growth (OpenAlex)"
+
+        def query():
+            counts = fetch_counts_by_year(concept_id, [year_from, year_to])
+            counts["country_code"] = normalize_codes(counts["country_code"]).astype(object)
+            counts = counts.dropna(subset=["country_code"])
+            live = GrowthEngine.from_frame(counts)
+            if not live.has(concept_id, year_from, year_to):
+                return pd.DataFrame(columns=GROWTH_COLUMNS)
+            return live.growth_frame(concept_id, year_from, year_to)
+
+        df, seconds = _timed(query)
+
+    df["country_name"] = to_name(df["country_code"])
+    df.attrs["query_timings"] = {label: seconds}
+    return df
+
+
+def get_growth_frame(concept_id, year_range, use_snapshot=True):
+    """
+    Per-country growth from the first to the last year of the selection
+    (country_code, base_count, end_count, growth_percent, cagr_percent, country_name),
+    best first. Shared between sessions: treat as read-only.
+    """
+    key = ("growth", concept_id, tuple(year_range), bool(use_snapshot), _snapshot_version(use_snapshot))
+    return _memoized(
+        "compute.growth", key,
+        lambda: _build_growth_frame(concept_id, tuple(year_range), use_snapshot),
+    )
+
+
+def _build_figures(df_live, field_display, year_range):
+    year_from, year_to = year_range
+    total_count = df_live["count"].sum()
+
+    # --- Interactive Pie Chart ---
+    # Prepare data for pie chart (top 10 countries + "Others")
+    df_pie = df_live.sort_values(by="count", ascending=False).head(10).copy()
+    others_count = df_live.sort_values(by="count", ascending=False).iloc[10:]["count"].sum()
+
+    if others_count > 0:
+        others_row = pd.DataFrame({
+            "country_name": ["Others"],
+            "count": [others_count],
+            "share (%)": [round((others_count / total_count) * 100, 2)]
+        })
+        df_pie = pd.concat([df_pie, others_row], ignore_index=True)
+
+    # Create interactive pie chart with Plotly
+    fig_pie = px.pie(
+        df_pie,
+        values="count",
+        names="country_name",
+        title=f"Distribution of {field_display} Publications by Country ({year_from}–{year_to})",
+        hover_data=["share (%)"],
+        hole=0.3  # Create a donut chart
+    )
+
+    # Customize the pie chart
+    fig_pie.update_traces(
+        textposition='inside',
+        textinfo='percent+label',
+        hovertemplate="<b>%{label}</b><br>" +
+                     "Publications: %{value}<br>" +
+                     "Share: %{customdata[0]:.2f}%<br>" +
+                     "<extra></extra>"
+    )
+
+    fig_pie.update_layout(
+        height=500,
+        showlegend=True,
+        legend=dict(
+            orientation="v",
+            yanchor="top",
+            y=1,
+            xanchor="left",
+            x=1.02
+        )
+    )
+
+    # --- Interactive Bar Chart for Top Countries ---
+    # Prepare data for bar chart (top 10 countries)
+    df_bar = df_live.sort_values(by="count", ascending=False).head(10)
+
+    fig_bar = px.bar(
+        df_bar,
+        x="country_name",
+        y="count",
+        title=f"Top 10 Countries by {field_display} Publications ({year_from}–{year_to})",
+        hover_data=["share (%)", "specialization_ratio"],
+        color="count",
+        color_continuous_scale="viridis"
+    )
+
+    fig_bar.update_traces(
+        hovertemplate="<b>%{x}</b><br>" +
+                     "Publications: %{y}<br>" +
+                     "Share: %{customdata[0]:.2f}%<br>" +
+                     "Specialization: %{customdata[1]:.2f}%<br>" +
+                     "<extra></extra>",
+        text=df_bar["count"].apply(lambda x: f"{x:,}"),
+        textposition='auto'
+    )
+
+    fig_bar.update_layout(
+        xaxis_title="Country",
+        yaxis_title="Number of Publications",
+        height=500,
+        xaxis={'categoryorder':'total descending'}
+    )
+
+    # --- Top 10 Specialized Countries ---
+    specialization_cols = ["country_name", "count", "total_publications", "specialization_ratio"]
+    top_specialized = (
+        df_live[specialization_cols]
+        .sort_values(by="specialization_ratio", ascending=False)
+        .head(10)
+    )
+
+    fig_specialization = px.bar(
+        top_specialized,
+        x="specialization_ratio",
+        y="country_name",
+        orientation='h',
+        title=f"Top 10 Countries by {field_display} Specialization ({year_from}–{year_to})",
+        hover_data=["count", "total_publications"]
+    )
+
+    fig_specialization.update_traces(
+        hovertemplate="<b>%{y}</b><br>" +
+                     "Specialization: %{x:.2f}%<br>" +
+                     "Field Publications: %{customdata[0]}<br>" +
+                     "Total Publications: %{customdata[1]}<br>" +
+                     "<extra></extra>",
+        text=top_specialized["specialization_ratio"].apply(lambda x: f"{x:.2f}%"),
+        textposition='auto'
+    )
+
+    fig_specialization.update_layout(
+        xaxis_title="Specialization Ratio (%)",
+        yaxis_title="Country",
+        height=500
+    )
+
+    # Serialized so cached entries are immutable and cheap to size
+    return {
+        "pie": fig_pie.to_json(),
+        "bar": fig_bar.to_json(),
+        "specialization": fig_specialization.to_json(),
+    }
+
+
+def get_figures(field_display, concept_id, year_range, use_snapshot=True):
+    """Serialized (JSON) pie, bar and specialization figures for one selection."""
+    key = ("figures", field_display, concept_id, tuple(year_range), bool(use_snapshot),
+           _snapshot_version(use_snapshot))
+    return _memoized(
+        "compute.figures", key,
+        lambda: _build_figures(
+            get_country_frame(concept_id, year_range, use_snapshot), field_display, tuple(year_range)
+        ),
+    )
+
+
+def _build_map_html(df_live, field_display, year_range, color_scale):
+    import folium  # only needed when a map is not memoized yet
+
+    year_from, year_to = year_range
+    m = folium.Map(location=[20, 0], zoom_start=2)
+    folium.Choropleth(
+        geo_data=load_geojson(),
+        name="choropleth",
+        data=df_live,
+        columns=["iso_a3", "count"],
+        key_on="feature.id",
+        fill_color=color_scale,
+        fill_opacity=0.7,
+        line_opacity=0.2,
+        legend_name=f"{field_display} Publications ({year_from}–{year_to})",
+        nan_fill_color="#ffffff",     # <<< No-data countries = WHITE
+        nan_fill_opacity=1.0
+    ).add_to(m)
+
+    folium.TileLayer(
+        tiles="https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}{r}.png",
+        attr="&copy; OpenStreetMap contributors &copy; CARTO",
+        name="CartoDB Positron",
+        control=False
+    ).add_to(m)
+
+    # Rendered straight to a string: no shared file between sessions
+    return m.get_root().render()
+
+
+def get_map_html(field_display, concept_id, year_range, use_snapshot=True, color_scale="YlGnBu"):
+    """Standalone choropleth HTML for one selection and color scale."""
+    key = ("map_html", field_display, concept_id, tuple(year_range), bool(use_snapshot), color_scale,
+           _snapshot_version(use_snapshot))
+    return _memoized(
+        "compute.map_html", key,
+        lambda: _build_map_html(
+            get_country_frame(concept_id, year_range, use_snapshot), field_display,
+            tuple(year_range), color_scale,
+        ),
+    )
@@ -1,30 +1,75 @@
-import pandas as pd
+#!/usr/bin/env python3
+"""
+Per-country publication growth between two years, from the local store.
+
+All concepts share one growth engine (services/growth.py), so any base/end pair
+is an index into precomputed arrays. Countries with no publications in the base
+year have undefined growth and are listed last with an empty growth_percent.
+
+Example:
+    python scripts/analyze_growth.py                    # AI and DL, 2010–2020
+    python scripts/analyze_growth.py --concept dl --base 2015 --end 2020
+"""
+
+import argparse
 import os
+import sys
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.store import AI_CONCEPT_ID, DL_CONCEPT_ID
+from services.growth import GrowthEngine
+
+CONCEPTS = {
+    "ai": AI_CONCEPT_ID,
+    "dl": DL_CONCEPT_ID,
+}
+
+# Output name prefixes; the default 2010–2020 files feed the top_growth charts
+OUTPUT_PREFIXES = {
+    "ai": "ai_growth",
+    "dl": "deep_learning_growth",
+}
+
+OUTPUT_DIR = "data/raw"
+
+
+def output_path(concept, base_year, end_year):
+    return os.path.join(OUTPUT_DIR, f"{OUTPUT_PREFIXES.get(concept, concept)}_{base_year}_{end_year}.csv")
+
 
-INPUT_CSV = "data/raw/deep_learning_publication_counts.csv"
-OUTPUT_CSV = "data/raw/deep_learning_growth_2010_2020.csv"
+def growth_table(engine, concept_id, base_year, end_year):
+    """Growth table in the CSV layout: country_short index, base/end year columns, growth and CAGR."""
+    df = engine.growth_frame(concept_id, base_year, end_year)
+    df = df.rename(columns={
+        "country_code": "country_short",
+        "base_count": str(base_year),
+        "end_count": str(end_year),
+    })
+    return df.set_index("country_short")
 
-def compute_growth():
-    df = pd.read_csv(INPUT_CSV)
 
-    # Filter for years 2010 and 2020
-    df_filtered = df[df["year"].isin([2010, 2020])].copy()
+def compute_growth(concepts, base_year, end_year):
+    engine = GrowthEngine.from_store([CONCEPTS.get(c, c) for c in concepts])
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    for concept in concepts:
+        path = output_path(concept, base_year, end_year)
+        growth_table(engine, CONCEPTS.get(concept, concept), base_year, end_year).to_csv(path)
+        print(f"Saved growth data to: {path}")
 
-    # Extract short ISO country code
-    df_filtered["country_short"] = df_filtered["country_code"].apply(lambda x: x.split("/")[-1])
 
-    # Pivot by country code (short), columns = years
-    df_pivot = df_filtered.pivot(index="country_short", columns="year", values="count").fillna(0)
+def main():
+    parser = argparse.ArgumentParser(description="Compute per-country publication growth between two years")
+    parser.add_argument("--concept", action="append",
+                        help="ai, dl or an OpenAlex concept id in the store (repeatable; default: ai and dl)")
+    parser.add_argument("--base", type=int, default=2010, help="base year (default 2010)")
+    parser.add_argument("--end", type=int, default=2020, help="end year (default 2020)")
+    args = parser.parse_args()
 
-    # Calculate growth percent
-    df_pivot["growth_percent"] = ((df_pivot[2020] - df_pivot[2010]) / df_pivot[2010].replace(0, 1)) * 100
-    df_pivot["growth_percent"] = df_pivot["growth_percent"].round(2)
+    if args.end <= args.base:
+        parser.error("--end must be after --base")
+    compute_growth(args.concept or list(CONCEPTS), args.base, args.end)
 
-    # Sort and save
-    df_pivot = df_pivot.sort_values("growth_percent", ascending=False)
-    df_pivot.to_csv(OUTPUT_CSV)
-    print(f"Saved growth data to: {OUTPUT_CSV}")
 
 if __name__ == "__main__":
-    os.makedirs("data/raw", exist_ok=True)
-    compute_growth()
+    main()
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Build the simplified world geometry assets (assets/geometry) from
+assets/world-countries.json, one file per resolution in services/geometry.py.
+
+Example:
+    python scripts/build_geometry.py --topojson
+"""
+
+import argparse
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services import geometry
+
+def main():
+    parser = argparse.ArgumentParser(description="Build multi-resolution world geometry")
+    parser.add_argument("--topojson", action="store_true", help="also write quantized TopoJSON")
+    args = parser.parse_args()
+
+    source_size = os.path.getsize(geometry.WORLD_GEOJSON_PATH)
+    print(f"Source: {geometry.WORLD_GEOJSON_PATH} ({source_size / 1024:.0f} KB)")
+    for path, size in geometry.build_resolutions(topojson=args.topojson).items():
+        print(f"  {os.path.relpath(path)}: {size / 1024:.0f} KB ({source_size / size:.1f}x smaller)")
+
+if __name__ == "__main__":
+    main()
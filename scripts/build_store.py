@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Build the columnar count store (data/store/counts) from the legacy CSVs in data/raw.
+Fetch scripts write to the store directly; this is only needed to migrate old data.
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services import store
+
+def main():
+    for concept_id, path in store.RAW_CSVS.items():
+        rows = store.import_raw_csv(concept_id, path)
+        print(f"Imported {rows} rows for {concept_id} from {path}")
+    print(f"Store now has {len(store.list_partitions())} partitions in {store.STORE_DIR}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Fetch per-country publication counts for many concepts at once.
+Every (concept, year) query runs concurrently through the shared fetch engine.
+Completed units are checkpointed, so an interrupted run resumes where it stopped
+and later runs only fetch missing or stale years.
+
+Example:
+    python scripts/fetch_concept_counts.py C154945302 C108583219 --from 2010 --to 2020
+"""
+
+import argparse
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.fetch_engine import MAX_WORKERS
+from services.fetch_journal import FetchIncomplete, fetch_counts_journaled
+
+OUTPUT_PATH = "data/raw/concept_publication_counts.csv"
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch per-country counts for several concepts")
+    parser.add_argument("concepts", nargs="+", help="OpenAlex concept IDs, e.g. C154945302")
+    parser.add_argument("--from", dest="year_from", type=int, default=2010)
+    parser.add_argument("--to", dest="year_to", type=int, default=2020)
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--full-refresh", action="store_true", help="Ignore checkpoints and refetch every unit")
+    args = parser.parse_args()
+
+    years = list(range(args.year_from, args.year_to + 1))
+    try:
+        df = fetch_counts_journaled(args.concepts, years, max_workers=args.workers,
+                                    full_refresh=args.full_refresh)
+    except FetchIncomplete as e:
+        # Leave the CSV as it was; a rerun only fetches the failed units
+        sys.exit(f"Not saving {args.output}: {e}")
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    df.to_csv(args.output, index=False)
+    print(f"Saved {len(df)} rows for {len(args.concepts)} concepts to {args.output}")
+
+if __name__ == "__main__":
+    main()
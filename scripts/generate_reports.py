@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Generate every report (specialization analysis CSVs and thesis LaTeX tables)
+from one shared AnalysisSession.
+
+All queries both generators need are planned up front and fetched once:
+field counts per concept plus a single totals query.
+
+Example:
+    python scripts/generate_reports.py
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.analysis import AnalysisSession
+from scripts import generate_specialization_analysis, generate_thesis_tables
+
+
+def main():
+    session = AnalysisSession()
+    session.require(generate_specialization_analysis.CONCEPTS)
+    session.require(generate_thesis_tables.CONCEPTS)
+    session.fetch()
+
+    generate_specialization_analysis.main(session)
+    generate_thesis_tables.main(session)
+
+    print()
+    print(session.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -10,40 +10,24 @@ import os
 
 # Add parent directory to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from services.openalex_api import fetch_openalex_data, fetch_total_publications_by_country
+from services.analysis import AnalysisSession
 
-def generate_specialization_table(concept_id, concept_name, year_range=(2010, 2020)):
+CONCEPTS = {
+    "C154945302": "Artificial Intelligence",
+    "C108583219": "Deep Learning"
+}
+
+def generate_specialization_table(concept_id, concept_name, year_range=(2010, 2020), session=None):
     """
     Generate a comprehensive table with publication counts and specialization ratios.
+    Pass a shared AnalysisSession to reuse data fetched for other tables.
     """
+    if session is None:
+        session = AnalysisSession(year_range)
     print(f"Generating specialization analysis for {concept_name}...")
     
-    # Fetch field-specific publications
-    df_field = fetch_openalex_data(concept_id, year_range)
-    
-    # Fetch total publications for normalization
-    df_total = fetch_total_publications_by_country(year_range)
-    
-    # Merge data
-    df_merged = df_field.merge(df_total, on="country_code", how="left")
-    
-    # Calculate metrics
-    total_field_pubs = df_merged["count"].sum()
-    df_merged["share (%)"] = round((df_merged["count"] / total_field_pubs) * 100, 2)
-    df_merged["specialization_ratio (%)"] = round((df_merged["count"] / df_merged["total_publications"]) * 100, 2)
-    
-    # Clean country codes
-    df_merged["country_code"] = df_merged["country_code"].apply(lambda x: x.split("/")[-1] if isinstance(x, str) else x)
-    
-    # Get country names
-    import pycountry
-    def get_country_name(alpha2_code):
-        try:
-            return pycountry.countries.get(alpha_2=alpha2_code).name
-        except:
-            return alpha2_code
-    
-    df_merged["country_name"] = df_merged["country_code"].apply(get_country_name)
+    # Field counts merged with totals; fetched once per session
+    df_merged = session.specialization_frame(concept_id, year_range)
     
     # Sort by specialization ratio
     df_merged = df_merged.sort_values("specialization_ratio (%)", ascending=False)
@@ -68,14 +52,14 @@ def generate_specialization_table(concept_id, concept_name, year_range=(2010, 20
     
     return df_result
 
-def main():
+def main(session=None):
     """Generate specialization analysis for both AI and Deep Learning."""
     
-    # Define concepts
-    concepts = {
-        "C154945302": "Artificial Intelligence",
-        "C108583219": "Deep Learning"
-    }
+    # Plan every query up front: both concepts share one totals fetch
+    concepts = CONCEPTS
+    if session is None:
+        session = AnalysisSession()
+    session.require(concepts).fetch()
     
     # Create output directory
     os.makedirs("data/analysis", exist_ok=True)
@@ -86,7 +70,7 @@ def main():
         print(f"ANALYZING: {concept_name}")
         print(f"{'='*60}")
         
-        df_analysis = generate_specialization_table(concept_id, concept_name)
+        df_analysis = generate_specialization_table(concept_id, concept_name, session=session)
         
         # Save to CSV
         output_file = f"data/analysis/{concept_name.lower().replace(' ', '_')}_specialization_analysis.csv"
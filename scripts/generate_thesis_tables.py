@@ -10,40 +10,24 @@ import os
 
 # Add parent directory to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from services.openalex_api import fetch_openalex_data, fetch_total_publications_by_country
+from services.analysis import AnalysisSession
 
-def generate_latex_table(concept_id, concept_name, year_range=(2010, 2020), top_n=10):
+CONCEPTS = {
+    "C154945302": "Artificial Intelligence",
+    "C108583219": "Deep Learning"
+}
+
+def generate_latex_table(concept_id, concept_name, year_range=(2010, 2020), top_n=10, session=None):
     """
     Generate a LaTeX table with publication counts and specialization ratios.
+    Pass a shared AnalysisSession to reuse data fetched for other tables.
     """
+    if session is None:
+        session = AnalysisSession(year_range)
     print(f"Generating LaTeX table for {concept_name}...")
     
-    # Fetch field-specific publications
-    df_field = fetch_openalex_data(concept_id, year_range)
-    
-    # Fetch total publications for normalization
-    df_total = fetch_total_publications_by_country(year_range)
-    
-    # Merge data
-    df_merged = df_field.merge(df_total, on="country_code", how="left")
-    
-    # Calculate metrics
-    total_field_pubs = df_merged["count"].sum()
-    df_merged["share (%)"] = round((df_merged["count"] / total_field_pubs) * 100, 2)
-    df_merged["specialization_ratio (%)"] = round((df_merged["count"] / df_merged["total_publications"]) * 100, 2)
-    
-    # Clean country codes
-    df_merged["country_code"] = df_merged["country_code"].apply(lambda x: x.split("/")[-1] if isinstance(x, str) else x)
-    
-    # Get country names
-    import pycountry
-    def get_country_name(alpha2_code):
-        try:
-            return pycountry.countries.get(alpha_2=alpha2_code).name
-        except:
-            return alpha2_code
-    
-    df_merged["country_name"] = df_merged["country_code"].apply(get_country_name)
+    # Field counts merged with totals; fetched once per session
+    df_merged = session.specialization_frame(concept_id, year_range)
     
     # Sort by publication count for the main table
     df_merged = df_merged.sort_values("count", ascending=False)
@@ -88,14 +72,15 @@ def create_latex_table(df, concept_name, year_range):
     
     return latex
 
-def main():
+def main(session=None):
     """Generate LaTeX tables for both AI and Deep Learning."""
     
-    # Define concepts
-    concepts = {
-        "C154945302": "Artificial Intelligence",
-        "C108583219": "Deep Learning"
-    }
+    # Plan every query up front: both concepts share one totals fetch
+    concepts = CONCEPTS
+    if session is None:
+        session = AnalysisSession()
+    session.require(concepts).fetch()
+    tables = {}
     
     # Create output directory
     os.makedirs("thesis_tables", exist_ok=True)
@@ -106,7 +91,8 @@ def main():
         print(f"GENERATING LATEX TABLE: {concept_name}")
         print(f"{'='*60}")
         
-        df_table = generate_latex_table(concept_id, concept_name)
+        df_table = generate_latex_table(concept_id, concept_name, session=session)
+        tables[concept_id] = df_table
         
         # Create LaTeX table
         latex_table = create_latex_table(df_table, concept_name, (2010, 2020))
@@ -127,9 +113,9 @@ def main():
     print("COMBINED ANALYSIS SUMMARY")
     print(f"{'='*60}")
     
-    # Generate both tables and compare
-    ai_df = generate_latex_table("C154945302", "Artificial Intelligence")
-    dl_df = generate_latex_table("C108583219", "Deep Learning")
+    # Compare the tables built above (no second download)
+    ai_df = tables["C154945302"]
+    dl_df = tables["C108583219"]
     
     # Find countries that appear in both top 10 lists
     ai_countries = set(ai_df["country_name"])
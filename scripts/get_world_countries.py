@@ -9,3 +9,4 @@ with open("assets/world-countries.json", "w", encoding="utf-8") as f:
     f.write(r.text)
 
 print("✅ GeoJSON file saved to assets/world-countries.json")
+print("Run scripts/build_geometry.py to rebuild the simplified versions in assets/geometry")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Run a local OpenAlex stand-in for load tests and offline development.
+
+Serves recorded fixtures (benchmarks/fixtures/recorded) or synthetic ones with
+configurable latency, slow tail, error injection and rate limiting. Point the
+dashboard or the batch fetchers at it:
+
+    python scripts/openalex_stub_server.py --port 8765 --latency-ms 40 --jitter-ms 20 --error-rate 0.02
+    OPENALEX_API_URL=http://127.0.0.1:8765 OPENALEX_CACHE_DISABLED=1 streamlit run dashboard/app.py
+
+Server-side counts and latency percentiles: curl http://127.0.0.1:8765/_stats
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.openalex_fixtures import OpenAlexFixtures
+from services.openalex_stub import OpenAlexStubServer, StubConfig
+
+RECORDED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks", "fixtures", "recorded")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAlex stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default="recorded",
+                        help="'recorded', 'synthetic' or a directory saved by OpenAlexFixtures.save")
+    parser.add_argument("--countries", type=int, default=200, help="synthetic fixtures only")
+    parser.add_argument("--concepts", type=int, default=500, help="synthetic fixtures only")
+    parser.add_argument("--years", type=int, default=30, help="synthetic fixtures only")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="share of requests that take --slow-ms")
+    parser.add_argument("--slow-ms", type=float, default=1000.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="requests per second before 429 (0 = off)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.fixtures == "synthetic":
+        fixtures = OpenAlexFixtures.synthetic(args.countries, args.concepts, args.years)
+    else:
+        fixtures = OpenAlexFixtures.load(RECORDED_DIR if args.fixtures == "recorded" else args.fixtures)
+
+    config = StubConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, slow_rate=args.slow_rate,
+        slow_ms=args.slow_ms, error_rate=args.error_rate, error_status=args.error_status,
+        rate_limit=args.rate_limit, seed=args.seed,
+    )
+    server = OpenAlexStubServer(fixtures, args.host, args.port, config)
+    cube = fixtures.cube
+    print(f"Serving {len(cube.concepts) - 1} concepts × {len(cube.countries)} countries × "
+          f"{len(cube.years)} years ({cube.years[0]}–{cube.years[-1]}) at {server.url}")
+    print(f"export OPENALEX_API_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+        print(json.dumps(server.stats(), indent=2))
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Fetch or refresh the local OpenAlex concept catalog (data/catalog/concepts.parquet)
+used by the dashboard's field search. The first run pages through every concept;
+later runs only fetch concepts updated since the last refresh.
+
+Example:
+    python scripts/refresh_concepts.py
+    python scripts/refresh_concepts.py --full
+"""
+
+import argparse
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.concepts import ConceptCatalog, CATALOG_PATH
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the local concept catalog")
+    parser.add_argument("--full", action="store_true", help="Refetch every concept instead of only updated ones")
+    args = parser.parse_args()
+
+    catalog = ConceptCatalog.load()
+    since = None if args.full else catalog.last_updated()
+    print(f"Catalog has {len(catalog)} concepts; fetching "
+          f"{'all concepts' if since is None else f'concepts updated since {since}'}")
+
+    fetched = catalog.refresh(full=args.full, progress=lambda n: print(f"\r{n} concepts fetched", end=""))
+    print()
+    print(f"Catalog now has {len(catalog)} concepts ({fetched} fetched) in {CATALOG_PATH}")
+
+if __name__ == "__main__":
+    main()
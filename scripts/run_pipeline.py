@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Run the batch workflow as an incremental DAG:
+
+    fetch_ai ─ growth_ai ─┐
+                          ├─ render
+    fetch_dl ─ growth_dl ─┘
+    reports (specialization CSVs + LaTeX tables)
+
+Stages whose inputs, parameters and outputs are unchanged since their last
+successful run are skipped, so a change to one concept redoes only that
+concept's branch (plus the renders that read it). Independent stages run in
+parallel, except the stages that query OpenAlex: each process has its own rate
+limiter sized for the whole polite pool, and the fetch stages append to one
+journal, so they hold the "openalex" resource and run one at a time.
+Stage logs go to data/checkpoints/pipeline_logs/.
+
+Fetch stages only rerun when their scripts change or they are forced, since
+their real input is OpenAlex.
+
+Example:
+    python scripts/run_pipeline.py                      # everything that is out of date
+    python scripts/run_pipeline.py --force fetch_dl     # refetch DL, redo its branch
+    python scripts/run_pipeline.py growth_ai --dry-run  # what would run for one target
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.pipeline import Pipeline, Stage, print_report
+from services.store import AI_CONCEPT_ID, DL_CONCEPT_ID
+
+
+def store_partitions(concept_id):
+    return f"data/store/counts/concept_id={concept_id}"
+
+
+FETCH_SOURCES = ["services/fetch_engine.py", "services/fetch_journal.py", "services/store.py"]
+GROWTH_SOURCES = ["scripts/analyze_growth.py", "services/growth.py", "services/cube.py"]
+# One process at a time may use the OpenAlex rate budget (and the fetch journal)
+OPENALEX = "openalex"
+
+STAGES = [
+    Stage(
+        "fetch_ai", ["scripts/fetch_publication_counts_ai.py"],
+        inputs=["scripts/fetch_publication_counts_ai.py", *FETCH_SOURCES],
+        outputs=["data/raw/ai_publication_counts.csv", store_partitions(AI_CONCEPT_ID)],
+        resources=[OPENALEX],
+    ),
+    Stage(
+        "fetch_dl", ["scripts/fetch_publication_counts.py"],
+        inputs=["scripts/fetch_publication_counts.py", *FETCH_SOURCES],
+        outputs=["data/raw/deep_learning_publication_counts.csv", store_partitions(DL_CONCEPT_ID)],
+        resources=[OPENALEX],
+    ),
+    Stage(
+        "growth_ai", ["scripts/analyze_growth.py", "--concept", "ai"], deps=["fetch_ai"],
+        inputs=[*GROWTH_SOURCES, store_partitions(AI_CONCEPT_ID)],
+        outputs=["data/raw/ai_growth_2010_2020.csv"],
+    ),
+    Stage(
+        "growth_dl", ["scripts/analyze_growth.py", "--concept", "dl"], deps=["fetch_dl"],
+        inputs=[*GROWTH_SOURCES, store_partitions(DL_CONCEPT_ID)],
+        outputs=["data/raw/deep_learning_growth_2010_2020.csv"],
+    ),
+    Stage(
+        # render_all keeps its own per-job manifest, so only affected maps are redrawn
+        "render", ["visualizations/render_all.py"], deps=["growth_ai", "growth_dl"],
+        inputs=[
+            "visualizations/*.py", "data/store/counts", "data/raw/*_growth_*.csv",
+            "assets/geometry", "services/geometry.py", "services/cube.py", "services/countries.py",
+        ],
+        outputs=["visualizations/outputs"],
+    ),
+    Stage(
+        "reports", ["scripts/generate_reports.py"],
+        inputs=[
+            "scripts/generate_reports.py", "scripts/generate_specialization_analysis.py",
+            "scripts/generate_thesis_tables.py", "services/analysis.py", "services/openalex_api.py",
+        ],
+        outputs=["data/analysis/*_specialization_analysis.csv", "thesis_tables/*_table.tex"],
+        resources=[OPENALEX],
+    ),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run out-of-date workflow stages")
+    parser.add_argument("targets", nargs="*", help="stages to bring up to date, with their dependencies (default: all)")
+    parser.add_argument("--force", action="append", default=[], metavar="STAGE",
+                        help="rerun a stage even if it is up to date (repeatable)")
+    parser.add_argument("--force-all", action="store_true", help="rerun every selected stage")
+    parser.add_argument("--workers", type=int, default=None, help="parallel stages (default: all ready)")
+    parser.add_argument("--dry-run", action="store_true", help="only report which stages are stale")
+    parser.add_argument("--list", action="store_true", help="list stages and dependencies")
+    args = parser.parse_args()
+
+    if args.list:
+        for stage in STAGES:
+            resources = f"  [{', '.join(stage.resources)}]" if stage.resources else ""
+            print(f"{stage.name:<12} <- {', '.join(stage.deps) or '-'}{resources}")
+        return
+
+    pipeline = Pipeline(STAGES)
+    force = [stage.name for stage in STAGES] if args.force_all else args.force
+    start = time.perf_counter()
+    try:
+        results = pipeline.run(args.targets or None, force, args.workers, args.dry_run)
+    except ValueError as e:
+        parser.error(str(e))
+    print_report(results, time.perf_counter() - start)
+    if any(r["status"] in ("failed", "blocked") for r in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
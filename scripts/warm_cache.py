@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Prefetch per-year OpenAlex fragments for the dashboard's predefined concepts,
+so the first dashboard user after a deploy is served from the response cache.
+
+Example:
+    python scripts/warm_cache.py --from 2010 --to 2020
+"""
+
+import argparse
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.warmup import CacheWarmer, WARMUP_WORKERS
+from services.store import AI_CONCEPT_ID, DL_CONCEPT_ID
+
+PREDEFINED_CONCEPTS = [AI_CONCEPT_ID, DL_CONCEPT_ID]
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm the OpenAlex response cache")
+    parser.add_argument("concepts", nargs="*", default=PREDEFINED_CONCEPTS)
+    parser.add_argument("--from", dest="year_from", type=int, default=2010)
+    parser.add_argument("--to", dest="year_to", type=int, default=2020)
+    parser.add_argument("--workers", type=int, default=WARMUP_WORKERS)
+    args = parser.parse_args()
+
+    warmer = CacheWarmer(args.concepts, range(args.year_from, args.year_to + 1), args.workers)
+    if not warmer.enabled:
+        print("Response cache is disabled (OPENALEX_CACHE_DISABLED=1); nothing to warm")
+        return
+    print(f"Cache coverage before warm-up: {warmer.coverage():.0%}")
+
+    def report(p):
+        done = p["completed"] + p["skipped"] + p["failed"]
+        print(f"\r{done}/{p['total']} fragments "
+              f"({p['completed']} fetched, {p['skipped']} cached, {p['failed']} failed)", end="")
+
+    warmer.run(on_progress=report)
+    print()
+    print(f"Cache coverage after warm-up: {warmer.coverage():.0%} "
+          f"in {warmer.progress()['elapsed']:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# services/analysis.py
+
+"""
+Shared fetch plan for the offline report scripts.
+
+The specialization analysis and the thesis tables need the same inputs: field
+counts per concept and the concept-independent total publications per
+country. An AnalysisSession collects what every generator needs, dedupes it
+into one set of queries, runs those concurrently once, and hands the same
+frames to every table generator. A full report run therefore makes one
+request per distinct (query, year range).
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.openalex_api import fetch_openalex_data, fetch_total_publications_by_country
+from services.countries import normalize_codes, to_name
+
+FETCH_WORKERS = 4
+
+
+class AnalysisSession:
+    """Planned, deduplicated OpenAlex queries for a set of concepts and year ranges."""
+
+    def __init__(self, year_range=(2010, 2020)):
+        self.year_range = tuple(year_range)
+        self._planned = {}
+        self._results = {}
+        self._merged = {}
+        self.timings = {}
+
+    # --- Planning ---
+
+    def _plan(self, key, fn):
+        if key not in self._results:
+            self._planned.setdefault(key, fn)
+
+    def require(self, concept_ids, year_range=None):
+        """Plan field counts for each concept plus the totals they are normalized by."""
+        year_range = tuple(year_range or self.year_range)
+        for concept_id in concept_ids:
+            self._plan(("field", concept_id, year_range),
+                       lambda c=concept_id: fetch_openalex_data(c, year_range))
+        self._plan(("totals", None, year_range), lambda: fetch_total_publications_by_country(year_range))
+        return self
+
+    def fetch(self):
+        """Run every planned query that has not been fetched yet, concurrently."""
+        pending, self._planned = self._planned, {}
+        if not pending:
+            return self
+
+        def timed(fn):
+            start = time.perf_counter()
+            return fn(), time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(pending))) as pool:
+            futures = {key: pool.submit(timed, fn) for key, fn in pending.items()}
+            for key, future in futures.items():
+                self._results[key], self.timings[key] = future.result()
+        return self
+
+    @property
+    def query_count(self):
+        """Distinct queries fetched so far."""
+        return len(self._results)
+
+    # --- Results ---
+
+    def _result(self, key):
+        if key not in self._results:
+            # Not planned up front: fetch it now (still only once)
+            kind, concept_id, year_range = key
+            if kind == "field":
+                self.require([concept_id], year_range)
+            else:
+                self.require([], year_range)
+            self.fetch()
+        return self._results[key]
+
+    def field_counts(self, concept_id, year_range=None):
+        return self._result(("field", concept_id, tuple(year_range or self.year_range)))
+
+    def totals(self, year_range=None):
+        return self._result(("totals", None, tuple(year_range or self.year_range)))
+
+    def specialization_frame(self, concept_id, year_range=None):
+        """
+        Field counts merged with totals, with share (%), specialization_ratio (%),
+        normalized country_code and country_name. Built once per concept and
+        range; treat as read-only.
+        """
+        year_range = tuple(year_range or self.year_range)
+        key = (concept_id, year_range)
+        if key not in self._merged:
+            df_merged = self.field_counts(concept_id, year_range).merge(
+                self.totals(year_range), on="country_code", how="left"
+            )
+
+            total_field_pubs = df_merged["count"].sum()
+            df_merged["share (%)"] = round((df_merged["count"] / total_field_pubs) * 100, 2)
+            df_merged["specialization_ratio (%)"] = round(
+                (df_merged["count"] / df_merged["total_publications"]) * 100, 2
+            )
+
+            df_merged["country_code"] = normalize_codes(df_merged["country_code"]).astype(object)
+            df_merged["country_name"] = to_name(df_merged["country_code"])
+            self._merged[key] = df_merged
+        return self._merged[key]
+
+    def report(self):
+        """One line per fetched query with its duration."""
+        lines = [f"{self.query_count} OpenAlex queries"]
+        for (kind, concept_id, year_range), seconds in sorted(self.timings.items(), key=lambda kv: -kv[1]):
+            label = f"{kind} {concept_id}" if concept_id else kind
+            lines.append(f"  {label:<20} {year_range[0]}–{year_range[1]}  {seconds:.2f}s")
+        return "\n".join(lines)
@@ -0,0 +1,228 @@
+# services/cache.py
+
+"""
+Persistent on-disk cache for OpenAlex API responses.
+
+Entries live in a single SQLite file so that several Streamlit worker
+processes and batch scripts can share them safely. Each entry has a TTL;
+once it expires it is still served as "stale" for a grace period while a
+background refresh runs (stale-while-revalidate). The total payload size is
+bounded and the least recently used entries are evicted first.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlencode
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+CACHE_PATH = os.environ.get(
+    "OPENALEX_CACHE_PATH", os.path.join(PROJECT_ROOT, "data", "cache", "openalex.sqlite")
+)
+CACHE_DISABLED = os.environ.get("OPENALEX_CACHE_DISABLED", "") == "1"
+DEFAULT_TTL = 7 * 24 * 3600          # one week: historical counts change slowly
+DEFAULT_STALE_TTL = 30 * 24 * 3600   # serve expired entries for a month while refreshing
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Params that identify the caller rather than the query
+IGNORED_PARAMS = {"mailto", "api_key"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key          TEXT PRIMARY KEY,
+    payload      BLOB NOT NULL,
+    size         INTEGER NOT NULL,
+    created_at   REAL NOT NULL,
+    expires_at   REAL NOT NULL,
+    stale_until  REAL NOT NULL,
+    accessed_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at);
+"""
+
+
+def make_cache_key(url, params=None):
+    """
+    Build a normalized cache key from an endpoint URL and its query params.
+    Param order and caller-identifying params (mailto) do not affect the key.
+    """
+    params = params or {}
+    items = sorted(
+        (str(k), str(v)) for k, v in params.items()
+        if k not in IGNORED_PARAMS and v is not None
+    )
+    return f"{url.rstrip('/')}?{urlencode(items)}"
+
+
+class ResponseCache:
+    """
+    SQLite-backed JSON response cache with TTL, stale-while-revalidate and
+    size-bounded LRU eviction. Safe to use from several threads and processes.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES,
+                 ttl=DEFAULT_TTL, stale_ttl=DEFAULT_STALE_TTL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._local = threading.local()
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        # One connection per thread and per process (connections must not
+        # cross a fork or be shared between threads).
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        """
+        Look up a key. Returns (value, state) where state is "fresh", "stale"
+        or None when the key is missing or past its stale window.
+        """
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT payload, expires_at, stale_until FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None, None
+        payload, expires_at, stale_until = row
+        if now > stale_until:
+            return None, None
+        conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        value = json.loads(zlib.decompress(payload).decode("utf-8"))
+        return value, ("fresh" if now <= expires_at else "stale")
+
+    def peek(self, key):
+        """Return "fresh", "stale" or None for a key without reading or touching the payload."""
+        now = time.time()
+        row = self._connect().execute(
+            "SELECT expires_at, stale_until FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or now > row[1]:
+            return None
+        return "fresh" if now <= row[0] else "stale"
+
+    def set(self, key, value, ttl=None):
+        """Store a JSON-serializable value and evict old entries if over budget."""
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        payload = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses "
+            "(key, payload, size, created_at, expires_at, stale_until, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, payload, len(payload), now, now + ttl, now + ttl + self.stale_ttl, now),
+        )
+        self._evict(conn)
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM responses WHERE stale_until < ?", (time.time(),))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            rows = conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+            ).fetchall()
+            doomed = []
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                doomed.append((key,))
+                total -= size
+            conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get_or_fetch(self, key, fetch_fn, ttl=None, revalidate=False):
+        """
+        Return the cached value for key, calling fetch_fn() on a miss.
+        Stale entries are returned immediately and refreshed in a background
+        thread; fetch_fn errors during a refresh leave the stale entry in place.
+        With revalidate, a stale entry is refetched in the calling thread instead
+        (e.g. by the warm-up, so the refresh keeps the caller's priority).
+        """
+        value, state = self.get(key)
+        if state == "fresh":
+            return value
+        if state == "stale" and not revalidate:
+            self._refresh_in_background(key, fetch_fn, ttl)
+            return value
+        value = fetch_fn()
+        self.set(key, value, ttl)
+        return value
+
+    def _refresh_in_background(self, key, fetch_fn, ttl):
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self.set(key, fetch_fn(), ttl)
+            except Exception:
+                pass
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def clear(self):
+        self._connect().execute("DELETE FROM responses")
+
+    def stats(self):
+        """Return entry count, total payload bytes and fresh/stale counts."""
+        now = time.time()
+        count, size, fresh = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), "
+            "COALESCE(SUM(CASE WHEN expires_at >= ? THEN 1 ELSE 0 END), 0) FROM responses",
+            (now,),
+        ).fetchone()
+        return {"entries": count, "bytes": size, "fresh": fresh, "stale": count - fresh}
+
+
+_default_cache = None
+_default_cache_disabled = CACHE_DISABLED
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    """Return the process-wide cache, or None when caching is disabled."""
+    global _default_cache
+    if _default_cache_disabled:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
+
+
+def set_default_cache(cache):
+    """Replace the process-wide cache (e.g. with a temporary one); None disables caching."""
+    global _default_cache, _default_cache_disabled
+    with _default_cache_lock:
+        _default_cache = cache
+        _default_cache_disabled = cache is None
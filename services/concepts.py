@@ -0,0 +1,201 @@
+# services/concepts.py
+
+"""
+Local catalog of OpenAlex concepts with an in-memory prefix index.
+
+The catalog is stored in data/catalog/concepts.parquet and is fetched from
+/concepts with cursor paging. Refreshes are incremental: later runs only
+request concepts updated since the newest updated_date already stored.
+
+Searching never touches the network. Display names, alternative names and
+ancestor names are tokenized into one sorted token list with a posting array
+per token. A query token matches every indexed token it is a prefix of, which
+takes two binary searches. A concept matches when all query tokens match.
+Name and alias matches rank above ancestry-only matches, and ties are broken
+by works_count.
+"""
+
+import os
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from services.openalex_client import OpenAlexAPIError, get_client
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+CATALOG_PATH = os.path.join(PROJECT_ROOT, "data", "catalog", "concepts.parquet")
+
+PER_PAGE = 200
+SELECT_FIELDS = "id,display_name,display_name_alternatives,level,works_count,ancestors,updated_date"
+COLUMNS = ["id", "display_name", "aliases", "ancestors", "level", "works_count", "updated_date"]
+
+# Ranks: exact name, name/alias prefix, ancestry only
+RANK_EXACT, RANK_NAME, RANK_ANCESTRY = 0, 1, 2
+
+
+def tokenize(text):
+    """Lowercased word tokens with accents stripped ("Réseaux" -> ["reseaux"])."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return re.findall(r"\w+", "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold())
+
+
+def _short_id(openalex_id):
+    return openalex_id.rsplit("/", 1)[-1]
+
+
+def _record(concept):
+    return {
+        "id": _short_id(concept["id"]),
+        "display_name": concept["display_name"],
+        "aliases": list(concept.get("display_name_alternatives") or []),
+        "ancestors": [a["display_name"] for a in concept.get("ancestors") or []],
+        "level": concept.get("level"),
+        "works_count": concept.get("works_count") or 0,
+        "updated_date": concept.get("updated_date") or "",
+    }
+
+
+def iter_concept_pages(updated_since=None, per_page=PER_PAGE):
+    """Yield lists of catalog records from /concepts, following next_cursor."""
+    client = get_client()
+    params = {"per-page": per_page, "select": SELECT_FIELDS, "cursor": "*"}
+    if updated_since:
+        params["filter"] = f"from_updated_date:{updated_since}"
+    while params["cursor"]:
+        # Cursor pages are one-off reads: go straight to the client, not the response cache
+        body = client.get_json("/concepts", params)
+        results = body.get("results", [])
+        if not results:
+            break
+        yield [_record(concept) for concept in results]
+        params["cursor"] = body.get("meta", {}).get("next_cursor")
+
+
+class ConceptCatalog:
+    """Concept table plus a sorted token index for offline prefix search."""
+
+    def __init__(self, frame=None):
+        if frame is None:
+            frame = pd.DataFrame({column: [] for column in COLUMNS})
+        self.frame = frame.reset_index(drop=True)
+        self._build_index()
+
+    def __len__(self):
+        return len(self.frame)
+
+    @classmethod
+    def load(cls, path=CATALOG_PATH):
+        """Catalog from disk; empty if it has not been fetched yet."""
+        if not os.path.exists(path):
+            return cls()
+        return cls(pd.read_parquet(path))
+
+    def save(self, path=CATALOG_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        self.frame.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def last_updated(self):
+        """Date part of the newest updated_date in the catalog, or None."""
+        if self.frame.empty:
+            return None
+        return str(self.frame["updated_date"].max())[:10] or None
+
+    def refresh(self, full=False, progress=None, path=CATALOG_PATH):
+        """
+        Fetch new and updated concepts, merge them by id and save the catalog.
+        Falls back to a full fetch if the incremental filter is rejected.
+        Returns the number of records fetched.
+        """
+        since = None if full else self.last_updated()
+        try:
+            records = self._fetch(since, progress)
+        except OpenAlexAPIError as e:
+            if since is None or e.status_code not in (400, 403):
+                raise
+            records = self._fetch(None, progress)
+
+        if records:
+            fetched = pd.DataFrame(records, columns=COLUMNS)
+            kept = self.frame[~self.frame["id"].isin(fetched["id"])]
+            frame = pd.concat([kept, fetched], ignore_index=True) if len(kept) else fetched
+            self.frame = frame.sort_values("works_count", ascending=False).reset_index(drop=True)
+            self._build_index()
+            self.save(path)
+        return len(records)
+
+    def _fetch(self, since, progress):
+        records = []
+        for page in iter_concept_pages(since):
+            records.extend(page)
+            if progress:
+                progress(len(records))
+        return records
+
+    # --- Index and search ---
+
+    def _build_index(self):
+        name_postings, ancestry_postings = defaultdict(set), defaultdict(set)
+        for row, (name, aliases, ancestors) in enumerate(zip(
+            self.frame["display_name"], self.frame["aliases"], self.frame["ancestors"]
+        )):
+            for text in [name, *list(aliases)]:
+                for token in tokenize(text):
+                    name_postings[token].add(row)
+            for text in ancestors:
+                for token in tokenize(text):
+                    ancestry_postings[token].add(row)
+
+        self._tokens = sorted(set(name_postings) | set(ancestry_postings))
+        empty = np.array([], dtype=np.int64)
+        self._name_postings = [
+            np.array(sorted(name_postings[t]), dtype=np.int64) if t in name_postings else empty
+            for t in self._tokens
+        ]
+        self._ancestry_postings = [
+            np.array(sorted(ancestry_postings[t]), dtype=np.int64) if t in ancestry_postings else empty
+            for t in self._tokens
+        ]
+        self._names = self.frame["display_name"].map(lambda n: " ".join(tokenize(n))).to_numpy()
+        self._works = self.frame["works_count"].to_numpy(dtype=np.int64)
+
+    def _prefix_range(self, prefix):
+        lo = bisect_left(self._tokens, prefix)
+        hi = bisect_left(self._tokens, prefix + "\U0010ffff", lo)
+        return lo, hi
+
+    @staticmethod
+    def _union(postings):
+        return np.unique(np.concatenate(postings)) if postings else np.array([], dtype=np.int64)
+
+    def search(self, query, limit=20):
+        """
+        Concepts whose names, aliases or ancestors match every query token as a
+        prefix, best first. An empty query returns the largest concepts.
+        Returns a DataFrame with the catalog columns.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return self.frame.nlargest(limit, "works_count").reset_index(drop=True)
+
+        name_rows = any_rows = None
+        for token in tokens:
+            lo, hi = self._prefix_range(token)
+            by_name = self._union(self._name_postings[lo:hi])
+            by_any = np.union1d(by_name, self._union(self._ancestry_postings[lo:hi]))
+            name_rows = by_name if name_rows is None else np.intersect1d(name_rows, by_name, assume_unique=True)
+            any_rows = by_any if any_rows is None else np.intersect1d(any_rows, by_any, assume_unique=True)
+        if not len(any_rows):
+            return self.frame.iloc[0:0]
+
+        rank = np.full(len(any_rows), RANK_ANCESTRY)
+        rank[np.isin(any_rows, name_rows)] = RANK_NAME
+        rank[self._names[any_rows] == " ".join(tokens)] = RANK_EXACT
+        # Best rank first, then most works
+        order = np.lexsort((-self._works[any_rows], rank))[:limit]
+        return self.frame.iloc[any_rows[order]].reset_index(drop=True)
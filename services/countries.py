@@ -0,0 +1,66 @@
+# services/countries.py
+
+"""
+Shared country dimension: normalization and ISO lookups without network calls.
+
+The lookup table is bundled in assets/iso_countries.csv (alpha-2, alpha-3,
+name, region, subregion; names follow pycountry so outputs match earlier
+results). All mapping functions are vectorized over whole Series/arrays: values
+are converted to a categorical, each distinct code is looked up once, and the
+result is gathered with the categorical codes.
+"""
+
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+ISO_TABLE_PATH = os.path.join(PROJECT_ROOT, "assets", "iso_countries.csv")
+
+
+@lru_cache(maxsize=1)
+def load_country_table():
+    """Bundled ISO table indexed by alpha_2 (loaded once per process)."""
+    # keep_default_na=False: "NA" is Namibia, not a missing value
+    df = pd.read_csv(ISO_TABLE_PATH, keep_default_na=False, na_values=[""])
+    return df.set_index("alpha_2")
+
+
+def normalize_codes(codes):
+    """
+    Vectorized: turn OpenAlex country URLs ("https://openalex.org/countries/XX")
+    or plain codes into alpha-2 strings. Non-string values become <NA>.
+    """
+    codes = pd.Series(codes)
+    categorical = codes.astype("category")
+    categories = pd.Series(categorical.cat.categories, dtype="string")
+    normalized = categories.str.rsplit("/", n=1).str[-1].to_numpy(dtype=object)
+    return _take(normalized, categorical.cat.codes.to_numpy(), index=codes.index, dtype="string")
+
+
+def _take(values, codes, index, dtype=object):
+    """Gather per-category values by categorical codes; code -1 (missing) gives NA."""
+    values = np.append(np.asarray(values, dtype=object), None)
+    return pd.Series(values[codes], index=index, dtype=dtype)
+
+
+def _lookup(codes, column):
+    codes = normalize_codes(codes)
+    categorical = codes.astype("category")
+    table = load_country_table()[column]
+    mapped = table.reindex(categorical.cat.categories).to_numpy(dtype=object)
+    mapped = np.where(pd.isna(mapped), None, mapped)
+    return codes, _take(mapped, categorical.cat.codes.to_numpy(), index=codes.index)
+
+
+def to_alpha3(codes):
+    """Alpha-2 (or OpenAlex URL) → alpha-3; unknown codes map to None."""
+    return _lookup(codes, "alpha_3")[1]
+
+
+def to_name(codes):
+    """Alpha-2 (or OpenAlex URL) → country name; unknown codes fall back to the code itself."""
+    normalized, names = _lookup(codes, "name")
+    return names.where(names.notna(), normalized.astype(object))
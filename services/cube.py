@@ -0,0 +1,106 @@
+# services/cube.py
+
+"""
+Concept × country × year count cube with prefix sums along the year axis.
+
+The cube holds per-year publication counts as a dense int64 NumPy array plus a
+cumulative sum with a leading zero column, so the total for any inclusive year
+range is a single vectorized subtraction across all countries:
+
+    totals = prefix[c, :, end + 1] - prefix[c, :, start]
+
+It is built from the columnar store and can be saved/loaded as .npy files
+(optionally memory-mapped) so several processes share one copy.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from services.store import read_counts, STORE_DIR
+
+
+class CountCube:
+    """Dense counts[concept, country, year] with prefix sums over years."""
+
+    def __init__(self, concepts, countries, years, counts, prefix=None):
+        self.concepts = list(concepts)
+        self.countries = np.asarray(countries, dtype=object)
+        self.years = np.asarray(years, dtype=np.int64)
+        self.counts = counts
+        if prefix is None:
+            prefix = np.zeros(counts.shape[:2] + (counts.shape[2] + 1,), dtype=np.int64)
+            np.cumsum(counts, axis=2, out=prefix[:, :, 1:])
+        self.prefix = prefix
+        self._concept_index = {c: i for i, c in enumerate(self.concepts)}
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build from a tidy concept_id/year/country_code/count frame."""
+        concept_codes, concepts = pd.factorize(df["concept_id"].astype(str), sort=True)
+        country_codes, countries = pd.factorize(df["country_code"].astype(str), sort=True)
+        if len(df):
+            years = np.arange(df["year"].min(), df["year"].max() + 1)
+        else:
+            years = np.array([], dtype=np.int64)
+        year_codes = df["year"].to_numpy(dtype=np.int64) - (years[0] if len(years) else 0)
+
+        counts = np.zeros((len(concepts), len(countries), len(years)), dtype=np.int64)
+        np.add.at(counts, (concept_codes, country_codes, year_codes), df["count"].to_numpy(dtype=np.int64))
+        return cls(concepts, countries, years, counts)
+
+    @classmethod
+    def from_store(cls, concept_ids=None, year_range=None, store_dir=STORE_DIR):
+        return cls.from_frame(read_counts(concept_ids, year_range, store_dir=store_dir))
+
+    def has(self, concept_id, year_range=None):
+        """True if the concept is in the cube and the year range is fully covered."""
+        if concept_id not in self._concept_index:
+            return False
+        if year_range is None:
+            return True
+        return len(self.years) > 0 and self.years[0] <= year_range[0] and year_range[1] <= self.years[-1]
+
+    def _year_slice(self, year_from, year_to):
+        start = int(np.clip(year_from - self.years[0], 0, len(self.years)))
+        end = int(np.clip(year_to - self.years[0] + 1, 0, len(self.years)))
+        return start, max(start, end)
+
+    def range_totals(self, concept_id, year_range):
+        """Per-country totals (int64 array aligned with self.countries) for an inclusive year range."""
+        c = self._concept_index[concept_id]
+        start, end = self._year_slice(*year_range)
+        return self.prefix[c, :, end] - self.prefix[c, :, start]
+
+    def range_frame(self, concept_id, year_range):
+        """
+        Range totals as a DataFrame with country_code and count columns,
+        without zero-count countries, sorted by count (like the live API result).
+        """
+        totals = self.range_totals(concept_id, year_range)
+        mask = totals > 0
+        df = pd.DataFrame({"country_code": self.countries[mask], "count": totals[mask]})
+        return df.sort_values("count", ascending=False).reset_index(drop=True)
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "counts.npy"), self.counts)
+        np.save(os.path.join(directory, "prefix.npy"), self.prefix)
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "concepts": self.concepts,
+                "countries": self.countries.tolist(),
+                "years": self.years.tolist(),
+            }, f)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Load a saved cube; with mmap=True the arrays are memory-mapped read-only."""
+        mode = "r" if mmap else None
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        counts = np.load(os.path.join(directory, "counts.npy"), mmap_mode=mode)
+        prefix = np.load(os.path.join(directory, "prefix.npy"), mmap_mode=mode)
+        return cls(meta["concepts"], meta["countries"], meta["years"], counts, prefix)
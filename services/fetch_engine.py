@@ -0,0 +1,82 @@
+# services/fetch_engine.py
+
+"""
+Concurrent (concept, year) fetch engine for per-country publication counts.
+
+Every (concept, year) group_by query is independent, so they are scheduled on a
+bounded thread pool and share the pooled, rate-limited OpenAlex client. Results
+are streamed into one tidy table with the `year,country_code,count` schema used
+by data/raw/*.csv, plus a `concept_id` column when several concepts are fetched.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+from tqdm import tqdm
+
+from services.openalex_client import get_client
+
+MAX_WORKERS = 8
+COLUMNS = ["concept_id", "year", "country_code", "count"]
+
+
+def fetch_counts_by_country(concept_id, year):
+    """Fetch per-country publication counts for one concept and one publication year."""
+    params = {
+        "filter": f"concepts.id:{concept_id},publication_year:{year}",
+        "group_by": "authorships.institutions.country_code"
+    }
+    return get_client().get_json("/works", params)["group_by"]
+
+
+def iter_counts(concept_ids, years, max_workers=MAX_WORKERS, progress=True):
+    """
+    Run every (concept, year) query concurrently and yield
+    (concept_id, year, rows, error) as each unit completes.
+    `rows` is a list of {"year", "country_code", "count"} dicts; `error` is the
+    exception for a failed unit (rows is then empty).
+    """
+    units = [(concept_id, year) for concept_id in concept_ids for year in years]
+    return iter_unit_counts(units, max_workers, progress)
+
+
+def iter_unit_counts(units, max_workers=MAX_WORKERS, progress=True):
+    """Like iter_counts, for an explicit list of (concept_id, year) units in one bounded pool."""
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(fetch_counts_by_country, concept_id, year): (concept_id, year)
+            for concept_id, year in units
+        }
+        completed = as_completed(futures)
+        if progress:
+            completed = tqdm(completed, total=len(futures), desc="Fetching concept×year data")
+        for future in completed:
+            concept_id, year = futures[future]
+            try:
+                entries = future.result()
+            except Exception as e:
+                yield concept_id, year, [], e
+                continue
+            rows = [
+                {"year": year, "country_code": entry["key"], "count": entry["count"]}
+                for entry in entries
+            ]
+            yield concept_id, year, rows, None
+
+
+def fetch_counts(concept_ids, years, max_workers=MAX_WORKERS, progress=True):
+    """
+    Fetch per-country counts for all concepts and years into one tidy DataFrame
+    with columns concept_id, year, country_code, count (sorted by concept, year, count).
+    Failed units are reported and skipped.
+    """
+    records = []
+    for concept_id, year, rows, error in iter_counts(concept_ids, years, max_workers, progress):
+        if error is not None:
+            print(f"Failed to fetch data for {concept_id} {year}: {error}")
+            continue
+        for row in rows:
+            records.append({"concept_id": concept_id, **row})
+
+    df = pd.DataFrame(records, columns=COLUMNS)
+    return df.sort_values(["concept_id", "year", "count"], ascending=[True, True, False]).reset_index(drop=True)
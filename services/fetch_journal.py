@@ -0,0 +1,144 @@
+# services/fetch_journal.py
+
+"""
+Resumable, checkpointed batch fetch on top of the concurrent fetch engine.
+
+Each completed (concept, year) unit is written to its own partition in the
+columnar store (services/store.py) and recorded in an append-only journal, so
+a crash loses at most the units still in flight. Later runs read the journal and fetch only units that are missing,
+failed or stale; failed units are re-queued for a few rounds before giving up.
+"""
+
+import json
+import os
+import time
+
+import pandas as pd
+
+from services.fetch_engine import iter_unit_counts, MAX_WORKERS
+from services import store
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+JOURNAL_DIR = os.path.join(PROJECT_ROOT, "data", "checkpoints", "counts")
+
+MAX_ROUNDS = 3
+# Recent years keep receiving new works in OpenAlex; older years are treated as final
+RECENT_YEARS = 2
+RECENT_MAX_AGE = 7 * 24 * 3600
+
+
+class FetchIncomplete(Exception):
+    """Raised when some units still fail after every retry round."""
+
+    def __init__(self, failed, counts):
+        self.failed = failed  # [(concept_id, year), ...]
+        self.counts = counts  # what the store holds for the request, as the normal return value
+        super().__init__(f"{len(failed)} (concept, year) units failed after all retry rounds: "
+                         + ", ".join(f"{c} {y}" for c, y in failed))
+
+
+class FetchJournal:
+    """Append-only JSONL journal plus one store partition per (concept, year) unit."""
+
+    def __init__(self, directory=JOURNAL_DIR, store_dir=store.STORE_DIR):
+        self.directory = directory
+        self.store_dir = store_dir
+        self.journal_path = os.path.join(directory, "journal.jsonl")
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self):
+        """Return the latest journal entry per unit: {(concept_id, year): entry}."""
+        state = {}
+        if not os.path.exists(self.journal_path):
+            return state
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line after a crash
+                state[(entry["concept_id"], entry["year"])] = entry
+        return state
+
+    def _append(self, entry):
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record_done(self, concept_id, year, rows):
+        # Write the partition atomically before journaling it as done
+        df = pd.DataFrame(rows, columns=["year", "country_code", "count"])
+        store.write_partition(concept_id, year, df, self.store_dir)
+        self._append({
+            "concept_id": concept_id, "year": year, "status": "done",
+            "rows": len(rows), "fetched_at": time.time()
+        })
+
+    def record_failed(self, concept_id, year, error):
+        self._append({
+            "concept_id": concept_id, "year": year, "status": "failed",
+            "error": str(error), "fetched_at": time.time()
+        })
+
+
+def is_stale(entry, year, now=None, recent_years=RECENT_YEARS, max_age=RECENT_MAX_AGE):
+    """A done unit is stale only if its year is recent and it was fetched too long ago."""
+    now = now or time.time()
+    current_year = time.gmtime(now).tm_year
+    if year < current_year - recent_years + 1:
+        return False
+    return now - entry["fetched_at"] > max_age
+
+
+def pending_units(journal_state, concept_ids, years, full_refresh=False):
+    """List the (concept, year) units that are missing, failed or stale."""
+    pending = []
+    for concept_id in concept_ids:
+        for year in years:
+            entry = journal_state.get((concept_id, year))
+            if (full_refresh or entry is None or entry["status"] != "done"
+                    or is_stale(entry, year)):
+                pending.append((concept_id, year))
+    return pending
+
+
+def fetch_counts_journaled(concept_ids, years, journal_dir=JOURNAL_DIR,
+                           store_dir=store.STORE_DIR, max_workers=MAX_WORKERS,
+                           max_rounds=MAX_ROUNDS, full_refresh=False, progress=True):
+    """
+    Fetch per-country counts with checkpointing and delta updates.
+    Returns the same tidy DataFrame as fetch_engine.fetch_counts, read back from
+    the store (country codes normalized to alpha-2). If units still fail after
+    max_rounds, FetchIncomplete is raised with them (and the frame as .counts).
+    """
+    journal = FetchJournal(journal_dir, store_dir)
+    years = list(years)
+    todo = pending_units(journal.load(), concept_ids, years, full_refresh)
+    print(f"{len(todo)} of {len(concept_ids) * len(years)} units need fetching")
+
+    for round_no in range(1, max_rounds + 1):
+        if not todo:
+            break
+        failed = []
+        # All pending units of all concepts share one pool: a delta run with only
+        # a year or two per concept still keeps max_workers requests in flight
+        for c, year, rows, error in iter_unit_counts(todo, max_workers, progress):
+            if error is None:
+                journal.record_done(c, year, rows)
+            else:
+                journal.record_failed(c, year, error)
+                failed.append((c, year))
+        if failed and round_no < max_rounds:
+            print(f"Re-queueing {len(failed)} failed units (round {round_no + 1}/{max_rounds})")
+        todo = failed
+
+    for concept_id, year in todo:
+        print(f"Failed to fetch data for {concept_id} {year} after {max_rounds} rounds")
+
+    # A previous successful partition stays usable even if its latest refresh failed
+    df = store.read_counts(concept_ids, (min(years), max(years)), store_dir=store_dir)
+    df = df[df["year"].isin(years)].reset_index(drop=True)
+    if todo:
+        raise FetchIncomplete(sorted(todo), df)
+    return df
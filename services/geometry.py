@@ -0,0 +1,327 @@
+# services/geometry.py
+
+"""
+Multi-resolution world geometry for choropleths.
+
+The full-resolution country polygons (assets/world-countries.json) are
+simplified without breaking shared borders. Every ring is cut into arcs at its
+junctions, i.e. the points where the neighbouring country changes. Each arc is
+simplified once with Douglas–Peucker, keeping its endpoints, and then reused
+(possibly reversed) by every ring that contains it. Neighbours therefore keep
+identical borders and no gaps or slivers appear.
+
+Each resolution is stored as GeoJSON with rounded coordinates and, optionally,
+as quantized, delta-encoded TopoJSON. Map builders pick a resolution by use case
+through load_world_geometry().
+"""
+
+import json
+import os
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+WORLD_GEOJSON_PATH = os.path.join(PROJECT_ROOT, "assets", "world-countries.json")
+GEOMETRY_DIR = os.path.join(PROJECT_ROOT, "assets", "geometry")
+
+# name -> (simplification tolerance in degrees, coordinate decimals)
+RESOLUTIONS = {
+    "high": (0.1, 2),
+    "medium": (0.5, 2),
+    "low": (1.0, 1),
+}
+
+# What each kind of map should load
+USE_CASES = {
+    "zoomed": "high",
+    "overview": "medium",
+    "thumbnail": "low",
+}
+
+TOPOJSON_QUANTIZATION = 10_000
+TOPOJSON_OBJECT = "countries"
+
+
+def _polygons(geometry):
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+    raise ValueError(f"Unsupported geometry type: {geometry['type']}")
+
+
+def _open_ring(ring):
+    points = [tuple(p) for p in ring]
+    return points[:-1] if len(points) > 1 and points[0] == points[-1] else points
+
+
+def _canonical_closed(points):
+    """Rotation/orientation-independent form of a ring without junctions."""
+    start = points.index(min(points))
+    forward = points[start:] + points[:start]
+    backward = [forward[0]] + forward[:0:-1]
+    return min(tuple(forward), tuple(backward))
+
+
+def extract_arcs(geojson):
+    """
+    Split every ring into shared arcs.
+
+    Returns (arcs, closed, layout): arcs is a list of point lists, closed the set
+    of arc indices that are whole rings without junctions, and layout mirrors the
+    features as features -> polygons -> rings -> [(arc_index, reversed), ...].
+    """
+    rings = [
+        [_open_ring(ring) for ring in polygon]
+        for feature in geojson["features"]
+        for polygon in _polygons(feature["geometry"])
+    ]
+
+    # A point is a junction when it has different neighbours in different rings
+    neighbours = defaultdict(set)
+    for polygon in rings:
+        for ring in polygon:
+            n = len(ring)
+            for i, point in enumerate(ring):
+                neighbours[point].add(frozenset((ring[i - 1], ring[(i + 1) % n])))
+
+    arcs, closed, arc_index = [], set(), {}
+
+    def add_arc(points, is_closed=False):
+        if is_closed:
+            key = _canonical_closed(points)
+            forward = tuple(_rotate_to(points, key[0]))
+        else:
+            key = min(tuple(points), tuple(reversed(points)))
+            forward = tuple(points)
+        if key not in arc_index:
+            arc_index[key] = len(arcs)
+            arcs.append(list(key))
+            if is_closed:
+                closed.add(arc_index[key])
+        return arc_index[key], forward != key
+
+    layout, ring_iter = [], iter(rings)
+    for feature in geojson["features"]:
+        feature_layout = []
+        for _ in _polygons(feature["geometry"]):
+            polygon_layout = []
+            for ring in next(ring_iter):
+                junctions = [i for i, p in enumerate(ring) if len(neighbours[p]) > 1]
+                if not junctions:
+                    polygon_layout.append([add_arc(ring, is_closed=True)])
+                    continue
+                # Rotate to the first junction and cut at every junction
+                rotated = ring[junctions[0]:] + ring[:junctions[0]] + [ring[junctions[0]]]
+                cuts = [i - junctions[0] for i in junctions] + [len(ring)]
+                polygon_layout.append([
+                    add_arc(rotated[start:end + 1]) for start, end in zip(cuts, cuts[1:])
+                ])
+            feature_layout.append(polygon_layout)
+        layout.append(feature_layout)
+    return arcs, closed, layout
+
+
+def _rotate_to(points, first):
+    start = points.index(first)
+    return points[start:] + points[:start]
+
+
+def douglas_peucker(points, tolerance):
+    """Boolean mask of the points kept by Douglas–Peucker; endpoints are always kept."""
+    pts = np.asarray(points, dtype=float)
+    n = len(pts)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        a, b = pts[start], pts[end]
+        inner = pts[start + 1:end]
+        dx, dy = b - a
+        length = np.hypot(dx, dy)
+        if length == 0:
+            dist = np.hypot(inner[:, 0] - a[0], inner[:, 1] - a[1])
+        else:
+            dist = np.abs(dx * (inner[:, 1] - a[1]) - dy * (inner[:, 0] - a[0])) / length
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            split = start + 1 + i
+            keep[split] = True
+            stack += [(start, split), (split, end)]
+    return keep
+
+
+def _simplify_arc(points, closed, tolerance):
+    if closed:
+        ring = points + [points[0]]
+        if not tolerance:
+            return ring
+        # Anchor closed rings at the start and the point farthest from it
+        pts = np.asarray(ring, dtype=float)
+        far = int(np.argmax(np.hypot(pts[:, 0] - pts[0, 0], pts[:, 1] - pts[0, 1])))
+        if far == 0:
+            return ring
+        keep = np.concatenate([
+            douglas_peucker(ring[:far + 1], tolerance)[:-1],
+            douglas_peucker(ring[far:], tolerance),
+        ])
+        return [p for p, k in zip(ring, keep) if k]
+    if not tolerance:
+        return points
+    return [p for p, k in zip(points, douglas_peucker(points, tolerance)) if k]
+
+
+def _dedupe(points):
+    out = [points[0]]
+    for p in points[1:]:
+        if p != out[-1]:
+            out.append(p)
+    return out
+
+
+def simplify_arcs(arcs, closed, tolerance, decimals=None):
+    """Simplify each arc once (and optionally round it); closed arcs come back closed."""
+    simplified = []
+    for index, points in enumerate(arcs):
+        result = _simplify_arc(points, index in closed, tolerance)
+        if decimals is not None:
+            result = [(round(x, decimals), round(y, decimals)) for x, y in result]
+        simplified.append(_dedupe(result))
+    return simplified
+
+
+def _ring_from_arcs(arcs, ring_layout):
+    ring = []
+    for index, reverse in ring_layout:
+        points = arcs[index][::-1] if reverse else arcs[index]
+        ring.extend(points if not ring else points[1:])
+    return _dedupe(ring)
+
+
+def _ring_area(ring):
+    pts = np.asarray(ring, dtype=float)
+    return 0.5 * abs(np.dot(pts[:-1, 0], pts[1:, 1]) - np.dot(pts[1:, 0], pts[:-1, 1]))
+
+
+def _is_valid_ring(ring):
+    return len(ring) >= 4 and _ring_area(ring) > 0
+
+
+def _assemble(geojson, arcs, layout):
+    """Rebuild features from arcs, dropping rings that collapsed below a triangle."""
+    features = []
+    for feature, feature_layout in zip(geojson["features"], layout):
+        polygons = []
+        for polygon_layout in feature_layout:
+            exterior, *holes = [_ring_from_arcs(arcs, ring_layout) for ring_layout in polygon_layout]
+            # A polygon whose exterior collapsed is dropped with its holes
+            if _is_valid_ring(exterior):
+                rings = [exterior] + [hole for hole in holes if _is_valid_ring(hole)]
+                polygons.append([[list(p) for p in ring] for ring in rings])
+        if not polygons:
+            # Never drop a whole country: keep its largest original part
+            original = max(_polygons(feature["geometry"]), key=lambda poly: _ring_area(poly[0]))
+            polygons = [[original[0]]]
+        geometry = (
+            {"type": "Polygon", "coordinates": polygons[0]} if len(polygons) == 1
+            else {"type": "MultiPolygon", "coordinates": polygons}
+        )
+        features.append({**feature, "geometry": geometry})
+    return {"type": "FeatureCollection", "features": features}
+
+
+def simplify_geojson(geojson, tolerance, decimals=None):
+    """Topology-preserving simplification of a country FeatureCollection."""
+    arcs, closed, layout = extract_arcs(geojson)
+    return _assemble(geojson, simplify_arcs(arcs, closed, tolerance, decimals), layout)
+
+
+def to_topojson(geojson, tolerance=0, quantization=TOPOJSON_QUANTIZATION):
+    """Quantized, delta-encoded TopoJSON topology with one 'countries' object."""
+    arcs, closed, layout = extract_arcs(geojson)
+    arcs = simplify_arcs(arcs, closed, tolerance)
+
+    all_points = np.asarray([p for arc in arcs for p in arc], dtype=float)
+    x0, y0 = all_points.min(axis=0)
+    x1, y1 = all_points.max(axis=0)
+    kx = (x1 - x0) / (quantization - 1) or 1
+    ky = (y1 - y0) / (quantization - 1) or 1
+
+    encoded = []
+    for arc in arcs:
+        q = np.rint((np.asarray(arc, dtype=float) - [x0, y0]) / [kx, ky]).astype(int)
+        # Drop repeated quantized points but keep both endpoints
+        keep = np.ones(len(q), dtype=bool)
+        keep[1:] = np.any(q[1:] != q[:-1], axis=1)
+        keep[-1] = True
+        q = q[keep]
+        encoded.append(np.vstack([q[:1], np.diff(q, axis=0)]).tolist())
+
+    def ref(index, reverse):
+        return ~index if reverse else index
+
+    geometries = []
+    for feature, feature_layout in zip(geojson["features"], layout):
+        polygons = [
+            [[ref(i, r) for i, r in ring_layout] for ring_layout in polygon_layout]
+            for polygon_layout in feature_layout
+        ]
+        geometry = {"type": "Polygon", "arcs": polygons[0]} if len(polygons) == 1 else \
+            {"type": "MultiPolygon", "arcs": polygons}
+        if "id" in feature:
+            geometry["id"] = feature["id"]
+        geometry["properties"] = feature.get("properties", {})
+        geometries.append(geometry)
+
+    return {
+        "type": "Topology",
+        "transform": {"scale": [kx, ky], "translate": [x0, y0]},
+        "objects": {TOPOJSON_OBJECT: {"type": "GeometryCollection", "geometries": geometries}},
+        "arcs": encoded,
+    }
+
+
+def geometry_path(resolution, fmt="geojson", directory=GEOMETRY_DIR):
+    suffix = "topo.json" if fmt == "topojson" else "geo.json"
+    return os.path.join(directory, f"world-countries.{resolution}.{suffix}")
+
+
+def build_resolutions(source_path=WORLD_GEOJSON_PATH, directory=GEOMETRY_DIR, topojson=False):
+    """Write every resolution in RESOLUTIONS; returns {path: size in bytes}."""
+    with open(source_path, "r", encoding="utf-8") as f:
+        geojson = json.load(f)
+    os.makedirs(directory, exist_ok=True)
+
+    outputs = {}
+    for resolution, (tolerance, decimals) in RESOLUTIONS.items():
+        documents = [("geojson", simplify_geojson(geojson, tolerance, decimals))]
+        if topojson:
+            documents.append(("topojson", to_topojson(geojson, tolerance)))
+        for fmt, document in documents:
+            path = geometry_path(resolution, fmt, directory)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(document, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            outputs[path] = os.path.getsize(path)
+    return outputs
+
+
+@lru_cache(maxsize=None)
+def load_world_geometry(use_case="overview"):
+    """
+    Country GeoJSON for a use case ("overview", "thumbnail", "zoomed") or an
+    explicit resolution name. Falls back to the full-resolution file when the
+    simplified asset has not been built. Shared per process: treat as read-only.
+    """
+    resolution = USE_CASES.get(use_case, use_case)
+    path = geometry_path(resolution)
+    if resolution == "full" or not os.path.exists(path):
+        path = WORLD_GEOJSON_PATH
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
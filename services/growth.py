@@ -0,0 +1,72 @@
+# services/growth.py
+
+"""
+Publication growth metrics over the count cube.
+
+Metrics for one (base, end) year pair are computed on demand for every country
+of a concept in one vectorized step over the cube's yearly counts:
+
+    growth[k] = (counts[k, end] / counts[k, base] - 1) * 100
+    cagr[k]   = ((counts[k, end] / counts[k, base]) ** (1 / (end - base)) - 1) * 100
+
+Nothing is precomputed per year pair, so memory stays at the size of the cube
+itself. Growth from a zero base count is undefined and is NaN; it is not
+computed against a base of 1. Pairs with end <= base are NaN too.
+"""
+
+import numpy as np
+import pandas as pd
+
+from services.cube import CountCube
+
+GROWTH_COLUMNS = ["country_code", "base_count", "end_count", "growth_percent", "cagr_percent"]
+
+
+class GrowthEngine:
+    """Total growth and CAGR for any concept and (base, end) year pair of a cube."""
+
+    def __init__(self, cube):
+        self.cube = cube
+
+    @classmethod
+    def from_store(cls, concept_ids=None):
+        return cls(CountCube.from_store(concept_ids))
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build from a tidy concept_id/year/country_code/count frame."""
+        return cls(CountCube.from_frame(df))
+
+    def has(self, concept_id, base_year, end_year):
+        return self.cube.has(concept_id, (base_year, end_year))
+
+    def _indices(self, concept_id, base_year, end_year):
+        if not self.has(concept_id, base_year, end_year):
+            raise KeyError(f"{concept_id} {base_year}–{end_year} is not covered by the cube")
+        first = self.cube.years[0]
+        return self.cube.concepts.index(concept_id), int(base_year - first), int(end_year - first)
+
+    def growth_frame(self, concept_id, base_year, end_year):
+        """
+        Per-country growth between two years: country_code, base and end counts,
+        growth_percent and cagr_percent. Countries without publications in either
+        year are left out; sorted by growth (undefined growth last).
+        """
+        c, i, j = self._indices(concept_id, base_year, end_year)
+        counts = self.cube.counts[c]
+        mask = (counts[:, i] > 0) | (counts[:, j] > 0)
+        base = counts[mask, i].astype(float)
+        end = counts[mask, j].astype(float)
+        span = end_year - base_year
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where((base > 0) & (span > 0), end / base, np.nan)
+            growth = (ratio - 1) * 100
+            cagr = (ratio ** (1 / span) - 1) * 100 if span > 0 else ratio
+        df = pd.DataFrame({
+            "country_code": self.cube.countries[mask],
+            "base_count": counts[mask, i],
+            "end_count": counts[mask, j],
+            "growth_percent": np.round(growth, 2),
+            "cagr_percent": np.round(cagr, 2),
+        })
+        return df.sort_values("growth_percent", ascending=False, na_position="last").reset_index(drop=True)
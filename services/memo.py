@@ -0,0 +1,129 @@
+# services/memo.py
+
+"""
+In-process memoization with a memory budget and LRU eviction.
+
+Used for computed dashboard artifacts (merged frames, serialized figures) that
+are shared by every session of one server process. Entry sizes are estimated
+(deep DataFrame memory, string/bytes length) and the least recently used
+entries are evicted once the total exceeds the budget. An optional max age
+expires entries so they are rebuilt from refreshed source data.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def estimate_size(value):
+    """Rough deep size in bytes of a cached value."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, (str, bytes, bytearray)):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class BudgetedLRUCache:
+    """
+    Thread-safe LRU cache bounded by the estimated total size of its values.
+    With max_age (seconds), entries older than that are dropped on lookup and
+    recomputed, so values built from refreshable data do not outlive it.
+    """
+
+    def __init__(self, max_bytes, max_age=None):
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._entries = OrderedDict()  # key -> (value, size, stored_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _lookup(self, key):
+        """Return the live entry for key or None; drops it if expired. Call with the lock held."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self.max_age is not None and time.monotonic() - entry[2] > self.max_age:
+            del self._entries[key]
+            self._bytes -= entry[1]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._lookup(key)
+            return default if entry is None else entry[0]
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return value  # larger than the whole budget: don't cache
+            self._entries[key] = (value, size, time.monotonic())
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute, cacheable=None):
+        """
+        Return the cached value for key, computing it at most once across threads.
+        A computed value for which cacheable(value) is false is returned but not stored.
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[0]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                entry = self._lookup(key)
+                if entry is not None:
+                    self.hits += 1
+                    return entry[0]
+                self.misses += 1
+            try:
+                value = compute()
+                if cacheable is not None and not cacheable(value):
+                    return value
+                return self.put(key, value)
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
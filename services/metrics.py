@@ -0,0 +1,258 @@
+# services/metrics.py
+
+"""
+Lightweight timing spans and a process-wide metrics registry.
+
+    with span("compute.country_frame") as s:
+        ...
+        s.set(cache="hit")
+
+A span measures wall time. It can carry a cache result ("hit", "miss",
+"off") and counters such as OpenAlex requests and bytes. record() adds
+counters to every open span of the current thread, so a page stage span
+includes the requests of the API calls it made. Spans opened in worker
+threads reach the caller's trace and parent spans when the worker function is
+wrapped with propagate().
+
+Every finished span goes into:
+- the active Trace of its thread, if any (one dashboard run; shown in the
+  debug panel and logged as one JSON line), and
+- the process-wide registry (a duration histogram plus cache, request and
+  byte counters per span name), rendered as Prometheus text exposition
+  format by write_prometheus().
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+METRICS_PATH = os.environ.get(
+    "DASHBOARD_METRICS_PATH", os.path.join(PROJECT_ROOT, "data", "metrics", "dashboard.prom")
+)
+METRICS_LOG = os.environ.get("DASHBOARD_METRICS_LOG", "")
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PREFIX = "openalex_dashboard"
+
+logger = logging.getLogger("openalex_dashboard.metrics")
+
+
+class Span:
+    def __init__(self, name, depth=0, **attrs):
+        self.name = name
+        self.depth = depth
+        self.attrs = dict(attrs)
+        self.counters = {}
+        self.started = time.perf_counter()
+        self.seconds = None
+        self.thread = threading.current_thread().name
+        self._lock = threading.Lock()
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def add(self, **counters):
+        with self._lock:
+            for name, value in counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def as_dict(self, origin=None):
+        record = {"span": self.name, "seconds": round(self.seconds or 0.0, 6), "depth": self.depth}
+        if origin is not None:
+            record["start_s"] = round(self.started - origin, 6)
+        return {**record, "thread": self.thread, **self.attrs, **self.counters}
+
+
+class Trace:
+    """Finished spans of one unit of work (e.g. one dashboard run), from any thread."""
+
+    def __init__(self):
+        self.spans = []
+        self.started = time.perf_counter()
+        self.seconds = None
+        self._lock = threading.Lock()
+
+    def _append(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.started
+        return self
+
+    def records(self):
+        """Span dicts in start order, with start_s relative to the start of the trace."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.started)
+        return [span.as_dict(self.started) for span in spans]
+
+
+class MetricsRegistry:
+    """Duration histograms and counters per span name, shared by all threads of the process."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}  # name -> [bucket counts..., count, sum]
+            self.cache = {}       # (name, result) -> count
+            self.counters = {}    # (name, counter) -> total
+
+    def observe(self, span):
+        with self._lock:
+            h = self.histograms.setdefault(span.name, [0] * (len(self.buckets) + 2) + [0.0])
+            h[bisect_left(self.buckets, span.seconds)] += 1
+            h[-2] += 1
+            h[-1] += span.seconds
+            if "cache" in span.attrs:
+                key = (span.name, span.attrs["cache"])
+                self.cache[key] = self.cache.get(key, 0) + 1
+            for counter, value in span.counters.items():
+                self.counters[(span.name, counter)] = self.counters.get((span.name, counter), 0) + value
+
+    def render(self, gauges=None):
+        """
+        Prometheus text exposition format. gauges ({name: (value, help)}) adds
+        process-level values (e.g. client or memo statistics) as extra gauges.
+        """
+        with self._lock:
+            histograms = {name: list(h) for name, h in self.histograms.items()}
+            cache, counters = dict(self.cache), dict(self.counters)
+
+        lines = [
+            f"# HELP {PREFIX}_span_seconds Duration of instrumented stages and API calls",
+            f"# TYPE {PREFIX}_span_seconds histogram",
+        ]
+        for name, h in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip([*self.buckets, "+Inf"], h[:len(self.buckets) + 1]):
+                cumulative += count
+                lines.append(f'{PREFIX}_span_seconds_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{PREFIX}_span_seconds_sum{{span="{name}"}} {h[-1]:.6f}')
+            lines.append(f'{PREFIX}_span_seconds_count{{span="{name}"}} {h[-2]}')
+
+        lines += [
+            f"# HELP {PREFIX}_cache_lookups_total Cache results of spans that consult a cache",
+            f"# TYPE {PREFIX}_cache_lookups_total counter",
+        ]
+        for (name, result), count in sorted(cache.items()):
+            lines.append(f'{PREFIX}_cache_lookups_total{{span="{name}",result="{result}"}} {count}')
+
+        for counter in sorted({counter for _, counter in counters}):
+            lines += [
+                f"# HELP {PREFIX}_{counter}_total {counter.capitalize()} attributed to each span",
+                f"# TYPE {PREFIX}_{counter}_total counter",
+            ]
+            for (name, c), value in sorted(counters.items()):
+                if c == counter:
+                    lines.append(f'{PREFIX}_{counter}_total{{span="{name}"}} {value}')
+
+        for name, (value, help_text) in sorted((gauges or {}).items()):
+            lines += [f"# HELP {PREFIX}_{name} {help_text}", f"# TYPE {PREFIX}_{name} gauge",
+                      f"{PREFIX}_{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+_local = threading.local()
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def current_trace():
+    return getattr(_local, "trace", None)
+
+
+@contextmanager
+def span(name, **attrs):
+    """Time a block; yields the Span so the block can set attributes."""
+    stack = _stack()
+    s = Span(name, depth=len(stack), **attrs)
+    stack.append(s)
+    try:
+        yield s
+    finally:
+        s.seconds = time.perf_counter() - s.started
+        stack.pop()
+        trace = current_trace()
+        if trace is not None:
+            trace._append(s)
+        registry.observe(s)
+
+
+def record(**counters):
+    """Add counters (e.g. requests=1, bytes=n) to every open span of this thread."""
+    for s in _stack():
+        s.add(**counters)
+
+
+def start_trace():
+    """Start collecting this thread's spans (replaces any active trace)."""
+    _local.trace = Trace()
+    _local.stack = []
+    return _local.trace
+
+
+def end_trace():
+    trace = current_trace()
+    _local.trace = None
+    return trace.finish() if trace is not None else None
+
+
+def propagate(fn):
+    """Wrap fn so that, run in a worker thread, its spans join the caller's trace and open spans."""
+    trace, parents = current_trace(), list(_stack())
+
+    def wrapper(*args, **kwargs):
+        previous_trace, previous_stack = current_trace(), getattr(_local, "stack", [])
+        _local.trace, _local.stack = trace, list(parents)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.trace, _local.stack = previous_trace, previous_stack
+
+    return wrapper
+
+
+def write_prometheus(path=METRICS_PATH, gauges=None):
+    """Write the registry as a Prometheus text file (atomically; safe with concurrent writers)."""
+    if not path:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(registry.render(gauges))
+    os.replace(tmp_path, path)
+
+
+def _configure_log():
+    if METRICS_LOG and not logger.handlers:
+        handler = logging.FileHandler(METRICS_LOG, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def log_trace(trace, **context):
+    """One structured (JSON) log line per trace, to DASHBOARD_METRICS_LOG or the logging tree."""
+    _configure_log()
+    logger.info(json.dumps({
+        "event": "trace",
+        "time": time.time(),
+        "seconds": round(trace.seconds or 0.0, 6),
+        **context,
+        "spans": trace.records(),
+    }, default=str))
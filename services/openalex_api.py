@@ -1,33 +1,92 @@
 # services/openalex_api.py
 
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
-from urllib.parse import quote
 
-def fetch_openalex_data(concept_id, year_range):
-    year_from, year_to = year_range
+from services import metrics
+from services.cache import get_default_cache, make_cache_key
+from services.openalex_client import get_client
 
-    # Construct OpenAlex API URL
-    base_url = "https://api.openalex.org/works"
-    filter_query = f"concepts.id:{concept_id},from_publication_date:{year_from}-01-01,to_publication_date:{year_to}-12-31"
-    group_by = "group_by=institutions.country_code"
+# Parallel per-year fragment fetches for one range query
+YEAR_WORKERS = 8
 
-    params = {
-        "filter": filter_query,
-        "group_by": "institutions.country_code",
-        "mailto": "jawadsarfraz96@gmail.com"  # real email!
-    }
+# Parallel per-country citation lookups (the client's rate limiter still applies)
+CITATION_WORKERS = 16
+
+def _get_json(path, params, revalidate=False):
+    """
+    GET an OpenAlex endpoint through the shared client and return the decoded JSON body.
+    Responses are served from the shared on-disk cache when available; with
+    revalidate, a stale cached response is refetched before returning.
+    Each call is an "api.<endpoint>" span with the cache result ("hit", "miss"
+    or "off"); the client adds the requests and bytes it sent.
+    """
+    params = dict(params)  # callers may mutate their dict (e.g. paging)
+    client = get_client()
+
+    with metrics.span("api." + path.strip("/").replace("/", "."), cache="off") as span:
+        fetched = []
 
-    headers = {
-        "User-Agent": "OpenAlex Dashboard (mailto:jawadsarfraz96@gmail.com)"
+        def fetch():
+            fetched.append(True)
+            return client.get_json(path, params)
+
+        cache = get_default_cache()
+        if cache is None:
+            return fetch()
+        body = cache.get_or_fetch(make_cache_key(client.url_for(path), params), fetch, revalidate=revalidate)
+        span.set(cache="miss" if fetched else "hit")  # stale entries count as hits
+        return body
+
+def _cache_state(path, params):
+    """Return "fresh", "stale" or None for a query in the response cache."""
+    cache = get_default_cache()
+    if cache is None:
+        return None
+    return cache.peek(make_cache_key(get_client().url_for(path), params))
+
+def _year_params(filter_prefix, year):
+    return {
+        "filter": f"{filter_prefix}publication_year:{year}",
+        "group_by": "institutions.country_code"
     }
 
-    response = requests.get(base_url, params=params, headers=headers)
+def fetch_country_groups_for_year(filter_prefix, year, revalidate=False):
+    """Fetch the per-country group_by items for one publication year (one cached fragment)."""
+    return _get_json("/works", _year_params(filter_prefix, year), revalidate).get("group_by", [])
+
+def is_year_cached(filter_prefix, year):
+    """True if the per-year fragment is fresh in the response cache."""
+    return _cache_state("/works", _year_params(filter_prefix, year)) == "fresh"
+
+def _fetch_country_groups(filter_prefix, year_range):
+    """
+    Fetch institutions.country_code group_by items for a year range.
+
+    With the response cache enabled the range is split into one query per
+    publication year. Every work has exactly one publication year, so the
+    per-year counts add up to the range counts; years already cached are
+    reused and only the missing ones are fetched (concurrently). Returns a
+    flat list of group_by items across all years.
+    """
+    year_from, year_to = year_range
+
+    if get_default_cache() is None:
+        # No cache to reuse fragments from: one range query is cheapest
+        filter_query = f"{filter_prefix}from_publication_date:{year_from}-01-01,to_publication_date:{year_to}-12-31"
+        params = {"filter": filter_query, "group_by": "institutions.country_code"}
+        return _get_json("/works", params).get("group_by", [])
+
+    years = list(range(year_from, year_to + 1))
+    with ThreadPoolExecutor(max_workers=min(len(years), YEAR_WORKERS) or 1) as pool:
+        fetch_year = metrics.propagate(lambda year: fetch_country_groups_for_year(filter_prefix, year))
+        per_year = list(pool.map(fetch_year, years))
+    return [item for items in per_year for item in items]
 
-    if response.status_code != 200:
-        raise Exception(f"OpenAlex API error: {response.status_code}")
+def fetch_openalex_data(concept_id, year_range):
+    items = _fetch_country_groups(f"concepts.id:{concept_id},", year_range)
 
-    items = response.json().get("group_by", [])
     records = []
     for item in items:
         record = {"country_code": item["key"], "count": item["count"]}
@@ -38,87 +97,176 @@ def fetch_openalex_data(concept_id, year_range):
             record["cited_by_count"] = None
         records.append(record)
 
-    return pd.DataFrame(records)
+    if not records:
+        return pd.DataFrame(records)
+    # Sum per-year fragments into range totals
+    df = pd.DataFrame(records)
+    df = df.groupby("country_code", as_index=False).agg(
+        count=("count", "sum"),
+        cited_by_count=("cited_by_count", lambda s: s.sum() if s.notna().all() else None),
+    )
+    return df.sort_values("count", ascending=False).reset_index(drop=True)
+
+def fetch_counts_by_year(concept_id, years):
+    """
+    Per-year country counts for a concept as a tidy concept_id/year/country_code/count
+    frame (the CountCube input layout). Each year is one cached fragment; years are
+    fetched concurrently.
+    """
+    years = list(years)
+    filter_prefix = f"concepts.id:{concept_id},"
+    with ThreadPoolExecutor(max_workers=min(len(years), YEAR_WORKERS) or 1) as pool:
+        fetch_year = metrics.propagate(lambda year: fetch_country_groups_for_year(filter_prefix, year))
+        per_year = list(pool.map(fetch_year, years))
+
+    records = [
+        {"concept_id": concept_id, "year": year, "country_code": item["key"], "count": item["count"]}
+        for year, items in zip(years, per_year)
+        for item in items
+    ]
+    return pd.DataFrame(records, columns=["concept_id", "year", "country_code", "count"])
 
 def fetch_total_publications_by_country(year_range):
     """
     Fetch total publications across ALL fields for each country in the given year range.
     This is used for normalization to calculate specialization ratios.
     """
-    year_from, year_to = year_range
-    
-    base_url = "https://api.openalex.org/works"
-    filter_query = f"from_publication_date:{year_from}-01-01,to_publication_date:{year_to}-12-31"
-    
-    params = {
-        "filter": filter_query,
-        "group_by": "institutions.country_code",
-        "mailto": "jawadsarfraz96@gmail.com"
-    }
-    
-    headers = {
-        "User-Agent": "OpenAlex Dashboard (mailto:jawadsarfraz96@gmail.com)"
-    }
-    
-    response = requests.get(base_url, params=params, headers=headers)
-    
-    if response.status_code != 200:
-        raise Exception(f"OpenAlex API error: {response.status_code}")
-    
-    items = response.json().get("group_by", [])
+    items = _fetch_country_groups("", year_range)
+
     records = []
     for item in items:
         record = {"country_code": item["key"], "total_publications": item["count"]}
         records.append(record)
-    
-    return pd.DataFrame(records)
 
-def fetch_openalex_concepts(per_page=50, max_pages=5):
-    """
-    Fetch a list of available research fields (concepts) from OpenAlex.
-    Returns a list of dicts: [{"id": ..., "display_name": ...}, ...]
-    """
-    base_url = "https://api.openalex.org/concepts"
-    params = {
-        "per-page": per_page,
-        "mailto": "jawadsarfraz96@gmail.com"
-    }
-    headers = {
-        "User-Agent": "OpenAlex Dashboard (mailto:jawadsarfraz96@gmail.com)"
+    if not records:
+        return pd.DataFrame(records)
+    df = pd.DataFrame(records).groupby("country_code", as_index=False)["total_publications"].sum()
+    return df.sort_values("total_publications", ascending=False).reset_index(drop=True)
+
+def _citation_params(concept_id, country_code, year_filter):
+    return {
+        "filter": f"concepts.id:{concept_id},institutions.country_code:{country_code},{year_filter}",
+        "per-page": 1  # We only need the meta info
     }
-    concepts = []
-    for page in range(1, max_pages + 1):
-        params["page"] = page
-        response = requests.get(base_url, params=params, headers=headers)
-        if response.status_code != 200:
-            break
-        results = response.json().get("results", [])
-        if not results:
-            break
-        for c in results:
-            concepts.append({
-                "id": c["id"],
-                "display_name": c["display_name"]
-            })
-    return concepts
+
+def _range_filter(year_range):
+    year_from, year_to = year_range
+    return f"from_publication_date:{year_from}-01-01,to_publication_date:{year_to}-12-31"
+
+def _citation_lookup_params(concept_id, country_code, lookup):
+    """Params of one citation lookup: ("year", year) or ("range", (year_from, year_to))."""
+    kind, value = lookup
+    year_filter = f"publication_year:{value}" if kind == "year" else _range_filter(value)
+    return _citation_params(concept_id, country_code, year_filter)
+
+def _fetch_citation_lookup(concept_id, country_code, lookup):
+    """cited_by_count of one lookup; None if OpenAlex did not report it. Request errors propagate."""
+    params = _citation_lookup_params(concept_id, country_code, lookup)
+    return _get_json("/works", params).get("meta", {}).get("cited_by_count", None)
+
+def fetch_country_citations_for_year(concept_id, country_code, year):
+    """Total citations for one concept, country and publication year (one cached fragment)."""
+    return _fetch_citation_lookup(concept_id, country_code, ("year", year))
 
 def fetch_country_citations(concept_id, country_code, year_range):
     """
     Fetch total citations for a given concept, country, and year range for a specific country.
+    Request errors propagate.
+    """
+    return _fetch_citation_lookup(concept_id, country_code, ("range", tuple(year_range)))
+
+def _citation_plan(concept_id, country_code, year_range):
+    """
+    Lookups whose citations add up to the range total for one country, choosing
+    the option with the fewest requests not already in the response cache:
+
+    - the range query itself (one request on a miss),
+    - the longest cached range query inside the range plus per-year fragments
+      for the years around it (a range extended by a slider move), or
+    - per-year fragments only.
+
+    On a tie the per-year options win, so extended ranges keep reusing fragments.
     """
     year_from, year_to = year_range
-    base_url = "https://api.openalex.org/works"
-    filter_query = f"concepts.id:{concept_id},institutions.country_code:{country_code},from_publication_date:{year_from}-01-01,to_publication_date:{year_to}-12-31"
-    params = {
-        "filter": filter_query,
-        "per-page": 1,  # We only need the meta info
-        "mailto": "jawadsarfraz96@gmail.com"
-    }
-    headers = {
-        "User-Agent": "OpenAlex Dashboard (mailto:jawadsarfraz96@gmail.com)"
-    }
-    response = requests.get(base_url, params=params, headers=headers)
-    if response.status_code != 200:
-        return None
-    meta = response.json().get("meta", {})
-    return meta.get("cited_by_count", None)
+    whole = ("range", (year_from, year_to))
+
+    def cached(lookup):
+        return _cache_state("/works", _citation_lookup_params(concept_id, country_code, lookup)) is not None
+
+    if get_default_cache() is None or cached(whole):
+        return [whole]
+
+    years = list(range(year_from, year_to + 1))
+    year_cached = {year: cached(("year", year)) for year in years}
+    options = [[("year", year) for year in years]]
+    # An inner range of length L leaves len(years) - L years to add; only ranges
+    # that leave at most one uncached year can beat the single range query
+    shortest = max(2, len(years) - 1 - sum(year_cached.values()))
+    for length in range(len(years) - 1, shortest - 1, -1):
+        inner = next(
+            ((start, start + length - 1) for start in range(year_from, year_to - length + 2)
+             if cached(("range", (start, start + length - 1)))),
+            None,
+        )
+        if inner is not None:
+            around = [("year", year) for year in years if not inner[0] <= year <= inner[1]]
+            options.insert(0, [("range", inner), *around])
+            break
+
+    def misses(plan):
+        return sum(1 for kind, value in plan if kind == "range" and not cached((kind, value))
+                   or kind == "year" and not year_cached[value])
+
+    best = min(options, key=misses)
+    return best if misses(best) <= 1 else [whole]
+
+def fetch_citations_by_country(concept_id, country_codes, year_range, max_workers=CITATION_WORKERS):
+    """
+    Fetch total citations for many countries in one pass.
+
+    OpenAlex reports cited_by_count only in the meta block of a filtered /works
+    query, and OR-ing countries (institutions.country_code:US|CN) yields one
+    combined total, not one per country. So each country is its own per-page=1
+    range query, and all of them share one bounded worker pool (the client's
+    rate limiter still applies): a new selection costs one request per country.
+    When a cached range is extended (e.g. by a slider move), only the new years
+    are fetched, as per-year fragments added to the cached range (see
+    _citation_plan).
+
+    Returns a DataFrame with country_code and cited_by_count (NaN where OpenAlex
+    reported no value). Countries whose requests failed are NaN as well and are
+    listed in frame.attrs["failed_countries"], marking the frame partial.
+    """
+    codes = list(dict.fromkeys(code for code in country_codes if isinstance(code, str)))
+    if not codes:
+        frame = pd.DataFrame({"country_code": [], "cited_by_count": []})
+        frame.attrs["failed_countries"] = []
+        return frame
+
+    year_range = tuple(year_range)
+    units = [(code, lookup) for code in codes for lookup in _citation_plan(concept_id, code, year_range)]
+
+    def fetch_unit(unit):
+        code, lookup = unit
+        try:
+            return code, _fetch_citation_lookup(concept_id, code, lookup), False
+        except Exception:
+            return code, None, True
+
+    totals = dict.fromkeys(codes, 0)
+    failed = set()
+    with ThreadPoolExecutor(max_workers=min(len(units), max_workers)) as pool:
+        for code, citations, error in pool.map(metrics.propagate(fetch_unit), units):
+            if error:
+                failed.add(code)
+            elif citations is None or totals[code] is None:
+                totals[code] = None
+            else:
+                totals[code] += citations
+
+    frame = pd.DataFrame({
+        "country_code": codes,
+        "cited_by_count": pd.Series([None if code in failed else totals[code] for code in codes], dtype=float),
+    })
+    frame.attrs["failed_countries"] = [code for code in codes if code in failed]
+    return frame
@@ -0,0 +1,222 @@
+# services/openalex_client.py
+
+"""
+Shared HTTP client for every OpenAlex call in the project.
+
+One pooled keep-alive session is reused across calls and threads. Requests are
+paced by a token bucket sized to the OpenAlex polite pool, and transient
+failures (429 and 5xx, connection errors) are retried with jittered
+exponential backoff that honors the Retry-After header.
+"""
+
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from services import metrics
+
+# Point at a local stand-in (scripts/openalex_stub_server.py) with OPENALEX_API_URL
+API_BASE_URL = os.environ.get("OPENALEX_API_URL", "https://api.openalex.org")
+MAILTO = "jawadsarfraz96@gmail.com"  # real email, required for the polite pool
+USER_AGENT = f"OpenAlex Dashboard (mailto:{MAILTO})"
+
+# Polite pool allows 10 requests/second per client (raise via OPENALEX_RATE_PER_SECOND for local load tests)
+RATE_PER_SECOND = float(os.environ.get("OPENALEX_RATE_PER_SECOND", "10"))
+BURST = max(1, int(RATE_PER_SECOND))
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+POOL_SIZE = 32
+TIMEOUT = 30
+
+
+class OpenAlexAPIError(Exception):
+    """Raised when OpenAlex answers with a non-200 status after all retries."""
+
+    def __init__(self, status_code, url=None):
+        super().__init__(f"OpenAlex API error: {status_code}")
+        self.status_code = status_code
+        self.url = url
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, up to `capacity`.
+    Background callers never take a token while an interactive caller is
+    waiting, so interactive requests always jump ahead of warm-up traffic.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.interactive_waiting = 0
+
+    def acquire(self, background=False):
+        """Block until one token is available, then take it."""
+        if not background:
+            with self.lock:
+                self.interactive_waiting += 1
+        try:
+            while True:
+                with self.lock:
+                    now = time.monotonic()
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    yield_to_interactive = background and self.interactive_waiting > 0
+                    if self.tokens >= 1 and not yield_to_interactive:
+                        self.tokens -= 1
+                        return
+                    wait = max((1 - self.tokens) / self.rate, 0.01)
+                time.sleep(wait)
+        finally:
+            if not background:
+                with self.lock:
+                    self.interactive_waiting -= 1
+
+
+_priority = threading.local()
+
+
+@contextmanager
+def background_priority():
+    """Mark OpenAlex requests made in this thread as low-priority background traffic."""
+    previous = getattr(_priority, "background", False)
+    _priority.background = True
+    try:
+        yield
+    finally:
+        _priority.background = previous
+
+
+def is_background():
+    return getattr(_priority, "background", False)
+
+
+def _retry_after_seconds(response):
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class OpenAlexClient:
+    """
+    Pooled, rate-limited, retrying OpenAlex client.
+    Counters for requests, retries, errors and bytes are kept in `stats` and
+    added to the open timing spans of the calling thread (services/metrics.py).
+    """
+
+    def __init__(self, base_url=API_BASE_URL, rate=RATE_PER_SECOND, burst=BURST,
+                 max_retries=MAX_RETRIES, pool_size=POOL_SIZE, timeout=TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.limiter = TokenBucket(rate, burst)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"User-Agent": USER_AGENT})
+
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "errors": 0, "bytes": 0}
+
+    def _count(self, **increments):
+        with self._stats_lock:
+            for name, value in increments.items():
+                self.stats[name] += value
+        # Attribute the same counters to the caller's open timing spans
+        metrics.record(**increments)
+
+    def url_for(self, path):
+        """Resolve an endpoint path ("/works") or full URL against the base URL."""
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _backoff(self, attempt, response=None):
+        retry_after = _retry_after_seconds(response) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, BACKOFF_MAX)
+        # Full jitter: uniform in [0, base * 2^attempt]
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+    def get(self, path, params=None):
+        """
+        GET an endpoint and return the final `requests.Response`.
+        Retries transient failures; raises OpenAlexAPIError on a final non-200.
+        """
+        url = self.url_for(path)
+        params = dict(params or {})
+        params.setdefault("mailto", MAILTO)
+
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(background=is_background())
+            self._count(requests=1)
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    self._count(errors=1)
+                    raise
+                self._count(retries=1)
+                time.sleep(self._backoff(attempt))
+                continue
+
+            self._count(bytes=len(response.content))
+            if response.status_code == 200:
+                return response
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                self._count(retries=1)
+                time.sleep(self._backoff(attempt, response))
+                continue
+            self._count(errors=1)
+            raise OpenAlexAPIError(response.status_code, url)
+
+    def get_json(self, path, params=None):
+        """GET an endpoint and return the decoded JSON body."""
+        return self.get(path, params).json()
+
+    def snapshot_stats(self):
+        with self._stats_lock:
+            return dict(self.stats)
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide shared client."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = OpenAlexClient()
+        return _default_client
+
+
+def set_client(client):
+    """Replace the process-wide client (e.g. one serving fixtures); returns the previous one."""
+    global _default_client
+    with _default_client_lock:
+        previous, _default_client = _default_client, client
+        return previous
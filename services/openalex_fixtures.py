@@ -0,0 +1,280 @@
+# services/openalex_fixtures.py
+
+"""
+Offline OpenAlex responses for benchmarks, load tests and development.
+
+OpenAlexFixtures answers the queries that services/openalex_api.py and
+services/concepts.py make, using in-memory data instead of the network:
+
+- /works?group_by=institutions.country_code (dashboard) or
+  authorships.institutions.country_code (batch fetchers), filtered by
+  concepts.id and either publication_year or from/to_publication_date
+  (per-country counts; both keys are answered from the same cube)
+- /works?per-page=1 with a concept/country/date filter (meta count and
+  cited_by_count)
+- /concepts with page or cursor paging and from_updated_date
+
+Counts come from a CountCube. "Recorded" fixtures are built from the local
+store, which holds counts previously fetched from OpenAlex. Synthetic fixtures
+can be any size (e.g. 200 countries × 500 concepts × 30 years). Totals across
+all fields (the unfiltered query) are stored as the pseudo-concept "*". Where
+none were recorded, they are derived from the field counts. FixtureAdapter
+mounts the responses on a requests session, so the real client code (pooling,
+retries, rate limiting, response cache) runs unchanged.
+"""
+
+import io
+import json
+import os
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import BaseAdapter
+
+from services.countries import load_country_table
+from services.cube import CountCube
+from services.store import read_counts
+
+ALL_WORKS = "*"
+COUNTRY_URL = "https://openalex.org/countries/"
+# The dashboard groups by institutions, the batch fetchers by authorships.institutions
+COUNTRY_GROUP_BYS = ("institutions.country_code", "authorships.institutions.country_code")
+CONCEPT_URL = "https://openalex.org/"
+
+# Field counts are this share of a country's total output when totals are derived
+DERIVED_FIELD_SHARE = 0.05
+
+
+class FixtureError(Exception):
+    """A query the fixtures cannot answer (mapped to an HTTP error status)."""
+
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _parse_filter(value):
+    """'a:1,b:2' -> {'a': '1', 'b': '2'}"""
+    filters = {}
+    for part in (value or "").split(","):
+        if part:
+            key, _, val = part.partition(":")
+            filters[key] = val
+    return filters
+
+
+class OpenAlexFixtures:
+    """Answers OpenAlex API queries from a count cube and a concept table."""
+
+    def __init__(self, cube, concepts=None, citation_rates=None):
+        self.cube = cube
+        self.concepts = concepts if concepts is not None else pd.DataFrame(
+            {"id": [], "display_name": [], "level": [], "works_count": [], "updated_date": []}
+        )
+        if citation_rates is None:
+            citation_rates = np.full(len(cube.countries), 10.0)
+        self.citation_rates = np.asarray(citation_rates, dtype=float)
+        self._country_index = {code: i for i, code in enumerate(cube.countries)}
+        names = load_country_table()["name"]
+        self._country_names = [names.get(code, code) for code in cube.countries]
+
+    # --- Construction ---
+
+    @classmethod
+    def from_store(cls, concept_ids=None, names=None, seed=0):
+        """
+        Recorded counts from the local store; totals and citation rates are derived.
+        names ({concept_id: display_name}) fills the /concepts listing.
+        """
+        cube = CountCube.from_frame(read_counts(concept_ids))
+        fixtures = cls._with_derived_totals(cube, np.random.default_rng(seed))
+        names = names or {}
+        fixtures.concepts = pd.DataFrame({
+            "id": list(cube.concepts),
+            "display_name": [names.get(c, c) for c in cube.concepts],
+            "level": 0,
+            "works_count": cube.counts.sum(axis=(1, 2)),
+            "updated_date": "2024-01-01T00:00:00",
+        })
+        return fixtures
+
+    @classmethod
+    def synthetic(cls, countries=200, concepts=500, years=30, first_year=1995, seed=0):
+        """
+        Random but plausible counts: a heavy-tailed size per country and concept
+        times a per-concept growth rate over the years.
+        """
+        rng = np.random.default_rng(seed)
+        codes = list(load_country_table().index[:countries])
+        codes += [f"X{i}" for i in range(countries - len(codes))]  # beyond the ISO table
+        concept_ids = [f"C{900000000 + i}" for i in range(concepts)]
+        year_axis = np.arange(first_year, first_year + years)
+
+        size = rng.lognormal(mean=3.0, sigma=1.8, size=(concepts, countries))
+        growth = rng.normal(1.08, 0.06, size=(concepts, 1, 1))
+        trend = growth ** np.arange(years)[None, None, :]
+        counts = rng.poisson(size[:, :, None] * trend).astype(np.int64)
+
+        cube = CountCube(concept_ids, codes, year_axis, counts)
+        concept_table = pd.DataFrame({
+            "id": concept_ids,
+            "display_name": [f"Synthetic concept {i}" for i in range(concepts)],
+            "level": rng.integers(0, 4, size=concepts),
+            "works_count": counts.sum(axis=(1, 2)),
+            "updated_date": "2024-01-01T00:00:00",
+        })
+        fixtures = cls._with_derived_totals(cube, rng)
+        fixtures.concepts = concept_table
+        return fixtures
+
+    @classmethod
+    def _with_derived_totals(cls, cube, rng):
+        totals = np.rint(cube.counts.sum(axis=0) / DERIVED_FIELD_SHARE).astype(np.int64)
+        counts = np.concatenate([cube.counts, totals[None]], axis=0)
+        cube = CountCube([*cube.concepts, ALL_WORKS], cube.countries, cube.years, counts)
+        return cls(cube, citation_rates=rng.uniform(2.0, 30.0, size=len(cube.countries)))
+
+    def save(self, directory):
+        self.cube.save(directory)
+        np.save(os.path.join(directory, "citation_rates.npy"), self.citation_rates)
+        self.concepts.to_parquet(os.path.join(directory, "concepts.parquet"), index=False)
+
+    @classmethod
+    def load(cls, directory):
+        cube = CountCube.load(directory, mmap=False)
+        concepts_path = os.path.join(directory, "concepts.parquet")
+        concepts = pd.read_parquet(concepts_path) if os.path.exists(concepts_path) else None
+        return cls(cube, concepts, np.load(os.path.join(directory, "citation_rates.npy")))
+
+    # --- Queries ---
+
+    def _year_range(self, filters):
+        if "publication_year" in filters:
+            year = int(filters["publication_year"])
+            return year, year
+        first, last = int(self.cube.years[0]), int(self.cube.years[-1])
+        year_from = int(filters["from_publication_date"][:4]) if "from_publication_date" in filters else first
+        year_to = int(filters["to_publication_date"][:4]) if "to_publication_date" in filters else last
+        return year_from, year_to
+
+    def _totals(self, filters):
+        concept_id = filters.get("concepts.id", ALL_WORKS).rsplit("/", 1)[-1]
+        if not self.cube.has(concept_id):
+            # Unknown concepts exist in OpenAlex too; they just have no works
+            return np.zeros(len(self.cube.countries), dtype=np.int64)
+        return self.cube.range_totals(concept_id, self._year_range(filters))
+
+    def works(self, params):
+        filters = _parse_filter(params.get("filter"))
+        unsupported = set(filters) - {
+            "concepts.id", "publication_year", "from_publication_date",
+            "to_publication_date", "institutions.country_code",
+        }
+        if unsupported:
+            raise FixtureError(400, f"Unsupported filter(s): {', '.join(sorted(unsupported))}")
+
+        totals = self._totals(filters)
+        group_by = params.get("group_by")
+        if group_by:
+            if group_by not in COUNTRY_GROUP_BYS:
+                raise FixtureError(400, f"Unsupported group_by: {group_by}")
+            order = np.argsort(-totals, kind="stable")
+            order = order[totals[order] > 0]
+            return {
+                "meta": {"count": int(totals.sum()), "groups_count": len(order), "db_response_time_ms": 0},
+                "group_by": [
+                    {"key": COUNTRY_URL + self.cube.countries[i],
+                     "key_display_name": self._country_names[i],
+                     "count": int(totals[i])}
+                    for i in order
+                ],
+            }
+
+        country = filters.get("institutions.country_code")
+        if country is not None:
+            index = self._country_index.get(country.upper())
+            count = int(totals[index]) if index is not None else 0
+            rate = self.citation_rates[index] if index is not None else 0.0
+        else:
+            count, rate = int(totals.sum()), float(np.average(self.citation_rates, weights=totals + 1))
+        return {
+            "meta": {"count": count, "cited_by_count": int(round(count * rate)), "db_response_time_ms": 0},
+            "results": [],
+        }
+
+    def concept_list(self, params):
+        frame = self.concepts
+        filters = _parse_filter(params.get("filter"))
+        if "from_updated_date" in filters:
+            frame = frame[frame["updated_date"].astype(str) >= filters["from_updated_date"]]
+        per_page = min(int(params.get("per-page", 25)), 200)
+
+        cursor = params.get("cursor")
+        if cursor is not None:
+            offset = 0 if cursor == "*" else int(cursor)
+        else:
+            offset = (int(params.get("page", 1)) - 1) * per_page
+        page = frame.iloc[offset:offset + per_page]
+        next_offset = offset + per_page
+
+        meta = {"count": len(frame), "per_page": per_page, "db_response_time_ms": 0}
+        if cursor is not None:
+            meta["next_cursor"] = str(next_offset) if next_offset < len(frame) else None
+        else:
+            meta["page"] = offset // per_page + 1
+        return {"meta": meta, "results": [self._concept_record(row) for row in page.itertuples(index=False)]}
+
+    @staticmethod
+    def _concept_record(row):
+        return {
+            "id": CONCEPT_URL + row.id,
+            "display_name": row.display_name,
+            "display_name_alternatives": list(getattr(row, "aliases", None) or []),
+            "level": int(row.level),
+            "works_count": int(row.works_count),
+            "ancestors": [{"display_name": name} for name in (getattr(row, "ancestors", None) or [])],
+            "updated_date": str(row.updated_date),
+        }
+
+    def respond(self, path, params):
+        """(status code, JSON body) for an API path such as "/works" and its query params."""
+        endpoint = "/" + path.strip("/").split("/")[-1]
+        try:
+            if endpoint == "/works":
+                return 200, self.works(params)
+            if endpoint == "/concepts":
+                return 200, self.concept_list(params)
+            raise FixtureError(404, f"Unknown endpoint: {path}")
+        except FixtureError as e:
+            return e.status_code, {"error": str(e)}
+        except (KeyError, ValueError) as e:
+            return 400, {"error": f"Bad request: {e}"}
+
+
+class FixtureAdapter(BaseAdapter):
+    """requests transport adapter that serves OpenAlexFixtures with optional latency."""
+
+    def __init__(self, fixtures, latency=0.0):
+        super().__init__()
+        self.fixtures = fixtures
+        self.latency = latency
+
+    def send(self, request, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        url = urlsplit(request.url)
+        status, body = self.fixtures.respond(url.path, dict(parse_qsl(url.query)))
+
+        response = requests.Response()
+        response.status_code = status
+        response.headers["Content-Type"] = "application/json"
+        response.raw = io.BytesIO(json.dumps(body).encode())
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
@@ -0,0 +1,188 @@
+# services/openalex_stub.py
+
+"""
+Local HTTP stand-in for api.openalex.org.
+
+Serves the /works group_by, /works meta and /concepts endpoints from
+OpenAlexFixtures (recorded or synthetic), with configurable latency and fault
+injection:
+
+- latency: a fixed delay plus uniform jitter per request, with an optional
+  slow tail (a share of requests takes a much longer fixed delay)
+- errors: a share of requests fails with a chosen status (503 by default;
+  429 responses carry Retry-After)
+- rate limit: requests above N per second get 429, like the polite pool
+
+Point the project at it with OPENALEX_API_URL=http://127.0.0.1:<port>.
+GET /_stats returns server-side request counts by status and latency
+percentiles, and /_stats/reset clears them.
+"""
+
+import json
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+
+@dataclass
+class StubConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    slow_rate: float = 0.0
+    slow_ms: float = 1000.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    rate_limit: float = 0.0  # requests per second; 0 = unlimited
+    retry_after: int = 1
+    seed: int = None
+
+
+class _StubState:
+    """Thread-safe counters, RNG and the rate-limit window shared by all handler threads."""
+
+    def __init__(self, config):
+        self.config = config
+        self.lock = threading.Lock()
+        self.rng = random.Random(config.seed)
+        self.window_start = time.monotonic()
+        self.window_count = 0
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started = time.monotonic()
+            self.statuses = {}
+            self.latencies = []
+
+    def draw(self):
+        """(delay in seconds, injected status or None) for one request."""
+        config = self.config
+        with self.lock:
+            delay = config.latency_ms + self.rng.uniform(0, config.jitter_ms)
+            if config.slow_rate and self.rng.random() < config.slow_rate:
+                delay = config.slow_ms
+            status = None
+            if config.rate_limit:
+                now = time.monotonic()
+                if now - self.window_start >= 1.0:
+                    self.window_start, self.window_count = now, 0
+                self.window_count += 1
+                if self.window_count > config.rate_limit:
+                    status = 429
+            if status is None and config.error_rate and self.rng.random() < config.error_rate:
+                status = config.error_status
+        return delay / 1000, status
+
+    def record(self, status, seconds):
+        with self.lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            self.latencies.append(seconds)
+
+    def snapshot(self):
+        with self.lock:
+            latencies = np.asarray(self.latencies)
+            elapsed = time.monotonic() - self.started
+            statuses = dict(self.statuses)
+        percentiles = (
+            dict(zip(["p50_ms", "p95_ms", "p99_ms"], np.percentile(latencies, [50, 95, 99]) * 1000))
+            if len(latencies) else {}
+        )
+        return {
+            "requests": int(len(latencies)),
+            "statuses": {str(k): v for k, v in sorted(statuses.items())},
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+            **{k: round(float(v), 2) for k, v in percentiles.items()},
+            "max_ms": round(float(latencies.max()) * 1000, 2) if len(latencies) else None,
+            "config": asdict(self.config),
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        state, fixtures = self.server.state, self.server.fixtures
+        url = urlsplit(self.path)
+        if url.path == "/_stats":
+            return self._send_json(200, state.snapshot())
+        if url.path == "/_stats/reset":
+            state.reset()
+            return self._send_json(200, {"reset": True})
+
+        start = time.perf_counter()
+        delay, injected = state.draw()
+        if delay:
+            time.sleep(delay)
+        if injected is not None:
+            headers = {"Retry-After": str(state.config.retry_after)} if injected == 429 else None
+            status, body = injected, {"error": "Injected failure"}
+        else:
+            status, body, headers = *fixtures.respond(url.path, dict(parse_qsl(url.query))), None
+        self._send_json(status, body, headers)
+        state.record(status, time.perf_counter() - start)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class OpenAlexStubServer:
+    """Threaded stub server; use start()/stop() or as a context manager."""
+
+    def __init__(self, fixtures, host="127.0.0.1", port=0, config=None):
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.fixtures = fixtures
+        self.httpd.state = _StubState(config or StubConfig())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def config(self):
+        return self.httpd.state.config
+
+    def stats(self):
+        return self.httpd.state.snapshot()
+
+    def reset_stats(self):
+        self.httpd.state.reset()
+
+    def start(self):
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,239 @@
+# services/pipeline.py
+
+"""
+Incremental DAG runner for the batch workflow.
+
+A stage is a script invocation plus its declared dependencies, inputs and
+outputs. Inputs and outputs are project-relative files, directories or glob
+patterns. Each stage runs as a subprocess from the project root, so scripts
+that assume the repository as their working directory behave the same from
+anywhere.
+
+A stage's digest covers its command, its parameters and the content of every
+input file. The stage is skipped when that digest and the content of its
+outputs both match the manifest from the last successful run. Outputs of an
+upstream stage are usually inputs of the next one, so a change propagates only
+down the branch it touches. Stages whose dependencies are done run in
+parallel, except that stages naming the same resource (e.g. the OpenAlex rate
+budget) never run at the same time.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+MANIFEST_PATH = os.path.join(PROJECT_ROOT, "data", "checkpoints", "pipeline_manifest.json")
+LOG_DIR = os.path.join(PROJECT_ROOT, "data", "checkpoints", "pipeline_logs")
+
+
+@dataclass
+class Stage:
+    name: str
+    command: list
+    deps: list = field(default_factory=list)
+    inputs: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+    params: dict = field(default_factory=dict)
+    resources: list = field(default_factory=list)  # held exclusively while the stage runs
+
+
+# --- Content hashing ---
+
+def expand_paths(patterns, root=PROJECT_ROOT):
+    """Sorted project-relative files matched by paths, directories or globs (hidden files skipped)."""
+    files = set()
+    for pattern in patterns:
+        for match in glob.glob(os.path.join(root, pattern), recursive=True):
+            if os.path.isdir(match):
+                for dirpath, dirnames, filenames in os.walk(match):
+                    dirnames[:] = [d for d in dirnames if not d.startswith((".", "__"))]
+                    files.update(os.path.join(dirpath, f) for f in filenames if not f.startswith("."))
+            else:
+                files.add(match)
+    return sorted(os.path.relpath(f, root) for f in files)
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def content_digest(patterns, root=PROJECT_ROOT):
+    """Hash of the names and contents of every matched file; None when nothing matches."""
+    files = expand_paths(patterns, root)
+    if not files:
+        return None
+    h = hashlib.sha256()
+    for rel in files:
+        h.update(rel.encode())
+        h.update(_file_digest(os.path.join(root, rel)).encode())
+    return h.hexdigest()
+
+
+def stage_digest(stage, root=PROJECT_ROOT):
+    h = hashlib.sha256()
+    h.update(json.dumps([stage.command, stage.params], sort_keys=True).encode())
+    h.update((content_digest(stage.inputs, root) or "").encode())
+    return h.hexdigest()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+# --- Graph ---
+
+def select_stages(stages, targets=None):
+    """Stages needed for the targets (all when None) in declaration order; validates the graph."""
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        missing = [dep for dep in stage.deps if dep not in by_name]
+        if missing:
+            raise ValueError(f"Stage {stage.name!r} depends on unknown stage(s): {', '.join(missing)}")
+
+    needed, visiting = set(), set()
+
+    def visit(name):
+        if name in needed:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle through stage {name!r}")
+        if name not in by_name:
+            raise ValueError(f"Unknown stage {name!r}")
+        visiting.add(name)
+        for dep in by_name[name].deps:
+            visit(dep)
+        visiting.discard(name)
+        needed.add(name)
+
+    for name in targets or by_name:
+        visit(name)
+    return [stage for stage in stages if stage.name in needed]
+
+
+# --- Execution ---
+
+class Pipeline:
+    """Runs a stage graph with content-hash skipping and a bounded worker pool."""
+
+    def __init__(self, stages, root=PROJECT_ROOT, manifest_path=MANIFEST_PATH, log_dir=LOG_DIR):
+        self.stages = stages
+        self.root = root
+        self.manifest_path = manifest_path
+        self.log_dir = log_dir
+
+    def is_up_to_date(self, stage, digest, manifest):
+        entry = manifest.get(stage.name)
+        if not entry or entry.get("digest") != digest:
+            return False
+        # Outputs deleted or edited by hand since the last run
+        return entry.get("outputs") == content_digest(stage.outputs, self.root)
+
+    def _execute(self, stage):
+        """Run the stage's script; returns (exit code, seconds, log path)."""
+        os.makedirs(self.log_dir, exist_ok=True)
+        log_path = os.path.join(self.log_dir, f"{stage.name}.log")
+        start = time.perf_counter()
+        with open(log_path, "w", encoding="utf-8") as log:
+            completed = subprocess.run(
+                [sys.executable, *stage.command], cwd=self.root,
+                stdout=log, stderr=subprocess.STDOUT,
+            )
+        return completed.returncode, time.perf_counter() - start, log_path
+
+    def _run_stage(self, stage, manifest, force, dry_run):
+        digest = stage_digest(stage, self.root)
+        if not force and self.is_up_to_date(stage, digest, manifest):
+            return {"status": "skipped", "seconds": 0.0}
+        if dry_run:
+            return {"status": "stale", "seconds": 0.0}
+        returncode, seconds, log_path = self._execute(stage)
+        if returncode != 0:
+            return {"status": "failed", "seconds": seconds,
+                    "error": f"exit code {returncode}, see {os.path.relpath(log_path, self.root)}"}
+        return {"status": "ran", "seconds": seconds, "digest": digest,
+                "outputs": content_digest(stage.outputs, self.root)}
+
+    def run(self, targets=None, force=(), workers=None, dry_run=False):
+        """
+        Run the targets (all stages when None) and their dependencies.
+        force lists stage names to rerun regardless of hashes; their
+        downstream stages rerun when their inputs changed. A ready stage waits
+        while another running stage holds one of its resources.
+        Returns {name: {"status", "seconds", "error"}} in declaration order.
+        """
+        stages = select_stages(self.stages, targets)
+        forced = set(force)
+        manifest = load_manifest(self.manifest_path)
+        by_name = {stage.name: stage for stage in stages}
+        results, pending = {}, dict(by_name)
+        running, held = {}, set()
+
+        with ThreadPoolExecutor(max_workers=workers or len(stages) or 1) as pool:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    dep_status = [results.get(dep, {}).get("status") for dep in stage.deps]
+                    if any(status in ("failed", "blocked") for status in dep_status):
+                        results[name] = {"status": "blocked", "seconds": 0.0}
+                        del pending[name]
+                    elif dry_run and "stale" in dep_status:
+                        # Would rerun once its inputs are rebuilt
+                        results[name] = {"status": "stale", "seconds": 0.0}
+                        del pending[name]
+                    elif all(status is not None for status in dep_status) and not held & set(stage.resources):
+                        running[pool.submit(self._run_stage, stage, manifest, name in forced, dry_run)] = name
+                        held.update(stage.resources)
+                        del pending[name]
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    held.difference_update(by_name[name].resources)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {"status": "failed", "seconds": 0.0, "error": str(e)}
+                    if result["status"] == "ran":
+                        manifest[name] = {"digest": result.pop("digest"), "outputs": result.pop("outputs")}
+                        save_manifest(manifest, self.manifest_path)
+                    results[name] = result
+
+        return {stage.name: results[stage.name] for stage in stages}
+
+
+def print_report(results, wall_seconds):
+    print(f"{'stage':<16} {'status':<8} {'seconds':>8}")
+    for name, r in results.items():
+        line = f"{name:<16} {r['status']:<8} {r['seconds']:>8.2f}"
+        if r.get("error"):
+            line += f"  ({r['error']})"
+        print(line)
+
+    stage_seconds = sum(r["seconds"] for r in results.values())
+    counts = {}
+    for r in results.values():
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    print("\n" + ", ".join(f"{n} {status}" for status, n in counts.items()))
+    print(f"Stage time {stage_seconds:.2f}s, {wall_seconds:.2f}s wall")
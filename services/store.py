@@ -0,0 +1,173 @@
+# services/store.py
+
+"""
+Columnar local store for per-country publication counts.
+
+Counts live in Parquet files partitioned by concept and year:
+
+    data/store/counts/concept_id=<ID>/year=<YYYY>/part-0.parquet
+
+Every write also replaces the store's version marker (_version, skipped by
+dataset discovery), so long-running readers can tell cheaply when to reload.
+
+Country codes are normalized once on write (the OpenAlex URL
+"https://openalex.org/countries/XX" becomes "XX") and stored dictionary-encoded,
+so readers get a pandas categorical column and never split strings again.
+`read_counts` pushes concept/year/country predicates and column projection down
+to the Parquet scan, so only the needed partitions and columns are read.
+"""
+
+import os
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from services.countries import normalize_codes
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+STORE_DIR = os.path.join(PROJECT_ROOT, "data", "store", "counts")
+
+# Concept IDs of the legacy CSVs in data/raw
+AI_CONCEPT_ID = "C154945302"
+DL_CONCEPT_ID = "C108583219"
+RAW_CSVS = {
+    AI_CONCEPT_ID: os.path.join(PROJECT_ROOT, "data", "raw", "ai_publication_counts.csv"),
+    DL_CONCEPT_ID: os.path.join(PROJECT_ROOT, "data", "raw", "deep_learning_publication_counts.csv"),
+}
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("concept_id", pa.string()), ("year", pa.int16())]), flavor="hive"
+)
+DATASET_SCHEMA = pa.schema([
+    ("country_code", pa.dictionary(pa.int32(), pa.string())),
+    ("count", pa.int64()),
+    ("concept_id", pa.string()),
+    ("year", pa.int16()),
+])
+
+
+VERSION_FILE = "_version"
+
+
+def store_version(store_dir=STORE_DIR):
+    """Opaque token that changes whenever a partition is written ("" for an empty store)."""
+    try:
+        with open(os.path.join(store_dir, VERSION_FILE), "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
+def _bump_version(store_dir):
+    path = os.path.join(store_dir, VERSION_FILE)
+    tmp_path = os.path.join(store_dir, f"_{VERSION_FILE}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(f"{time.time_ns()}-{os.getpid()}")
+    os.replace(tmp_path, path)
+
+
+def partition_dir(concept_id, year, store_dir=STORE_DIR):
+    return os.path.join(store_dir, f"concept_id={concept_id}", f"year={int(year)}")
+
+
+def write_partition(concept_id, year, df, store_dir=STORE_DIR):
+    """
+    Atomically replace one (concept, year) partition.
+    `df` needs country_code and count columns; codes may be URLs or alpha-2.
+    """
+    directory = partition_dir(concept_id, year, store_dir)
+    os.makedirs(directory, exist_ok=True)
+    frame = pd.DataFrame({
+        "country_code": normalize_codes(df["country_code"]).astype(str),
+        "count": pd.Series(df["count"]).astype("int64"),
+    })
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    table = table.cast(pa.schema([("country_code", pa.string()), ("count", pa.int64())]))
+    table = table.set_column(0, "country_code", table.column("country_code").dictionary_encode())
+    path = os.path.join(directory, "part-0.parquet")
+    # Dot prefix: dataset discovery skips the temp file, even one left by a crash
+    tmp_path = os.path.join(directory, ".part-0.parquet.tmp")
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+    _bump_version(store_dir)
+    return path
+
+
+def write_counts(df, store_dir=STORE_DIR):
+    """Write a tidy concept_id/year/country_code/count frame, one partition per (concept, year)."""
+    for (concept_id, year), group in df.groupby(["concept_id", "year"]):
+        write_partition(concept_id, year, group, store_dir)
+
+
+def _dataset(store_dir=STORE_DIR):
+    return ds.dataset(store_dir, format="parquet", partitioning=PARTITIONING, schema=DATASET_SCHEMA)
+
+
+def read_counts(concept_ids=None, year_range=None, countries=None, columns=None, store_dir=STORE_DIR):
+    """
+    Read counts as a DataFrame with columns concept_id, year, country_code, count.
+
+    - concept_ids: a concept ID or list of IDs (None = all)
+    - year_range: inclusive (year_from, year_to) tuple (None = all years)
+    - countries: iterable of alpha-2 codes (None = all)
+    - columns: subset of columns to return (projection)
+
+    country_code is returned as a pandas categorical.
+    """
+    if not os.path.isdir(store_dir):
+        return pd.DataFrame(columns=columns or ["concept_id", "year", "country_code", "count"])
+
+    predicate = None
+
+    def both(a, b):
+        return b if a is None else a & b
+
+    if concept_ids is not None:
+        if isinstance(concept_ids, str):
+            concept_ids = [concept_ids]
+        predicate = both(predicate, ds.field("concept_id").isin(list(concept_ids)))
+    if year_range is not None:
+        year_from, year_to = year_range
+        predicate = both(predicate, (ds.field("year") >= year_from) & (ds.field("year") <= year_to))
+    if countries is not None:
+        predicate = both(predicate, ds.field("country_code").isin(list(countries)))
+
+    columns = columns or ["concept_id", "year", "country_code", "count"]
+    table = _dataset(store_dir).to_table(columns=columns, filter=predicate)
+    df = table.to_pandas()
+    if "year" in df.columns:
+        df["year"] = df["year"].astype("int64")
+    if "concept_id" in df.columns:
+        df["concept_id"] = df["concept_id"].astype("category")
+    sort_cols = [c for c in ("concept_id", "year") if c in df.columns]
+    if "count" in df.columns:
+        df = df.sort_values(sort_cols + ["count"], ascending=[True] * len(sort_cols) + [False])
+    elif sort_cols:
+        df = df.sort_values(sort_cols)
+    return df.reset_index(drop=True)
+
+
+def list_partitions(store_dir=STORE_DIR):
+    """Return the set of (concept_id, year) partitions present in the store."""
+    partitions = set()
+    if not os.path.isdir(store_dir):
+        return partitions
+    for concept_dir in os.listdir(store_dir):
+        if not concept_dir.startswith("concept_id="):
+            continue
+        concept_id = concept_dir.split("=", 1)[1]
+        for year_dir in os.listdir(os.path.join(store_dir, concept_dir)):
+            if year_dir.startswith("year="):
+                partitions.add((concept_id, int(year_dir.split("=", 1)[1])))
+    return partitions
+
+
+def import_raw_csv(concept_id, path=None, store_dir=STORE_DIR):
+    """Load one of the legacy data/raw/*_publication_counts.csv files into the store."""
+    df = pd.read_csv(path or RAW_CSVS[concept_id])
+    df.insert(0, "concept_id", concept_id)
+    write_counts(df, store_dir)
+    return len(df)
@@ -0,0 +1,113 @@
+# services/warmup.py
+
+"""
+Background cache warm-up for the dashboard's predefined concepts.
+
+The dashboard only ever asks for per-year country counts of a few known
+concepts plus per-year total publications, so every fragment it can need is
+known up front. The warmer prefetches the ones that are not fresh in the
+response cache, on a few low-priority threads: interactive requests always
+take rate-limiter tokens first (see openalex_client.background_priority).
+Stale fragments are refetched on the warm-up threads themselves rather than by
+the response cache's background refresh, which would not run at low priority.
+Without a response cache there is nothing to warm and the warmer does nothing.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.cache import get_default_cache
+from services.openalex_api import fetch_country_groups_for_year, is_year_cached
+from services.openalex_client import background_priority
+
+WARMUP_WORKERS = 2
+DEFAULT_YEARS = range(2010, 2021)
+
+
+class CacheWarmer:
+    """Prefetch per-year fragments for a set of concepts and report progress/coverage."""
+
+    def __init__(self, concept_ids, years=DEFAULT_YEARS, workers=WARMUP_WORKERS):
+        self.concept_ids = list(concept_ids)
+        self.years = list(years)
+        self.workers = workers
+        self.lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.running = False
+        self.started_at = None
+        self.finished_at = None
+        self._thread = None
+
+    @property
+    def enabled(self):
+        """False when the response cache is disabled: fetched fragments would be discarded."""
+        return get_default_cache() is not None
+
+    def plan(self):
+        """All (filter_prefix, year) fragments: totals first, then each concept."""
+        prefixes = [""] + [f"concepts.id:{concept_id}," for concept_id in self.concept_ids]
+        return [(prefix, year) for prefix in prefixes for year in self.years]
+
+    def coverage(self):
+        """Fraction of planned fragments that are fresh in the cache."""
+        units = self.plan()
+        cached = sum(1 for prefix, year in units if is_year_cached(prefix, year))
+        return cached / len(units) if units else 1.0
+
+    def progress(self):
+        with self.lock:
+            return {
+                "total": len(self.plan()),
+                "completed": self.completed,
+                "skipped": self.skipped,
+                "failed": self.failed,
+                "running": self.running,
+                "elapsed": (self.finished_at or time.time()) - self.started_at if self.started_at else 0.0,
+            }
+
+    def _warm_unit(self, unit):
+        prefix, year = unit
+        if is_year_cached(prefix, year):
+            with self.lock:
+                self.skipped += 1
+            return
+        try:
+            with background_priority():
+                fetch_country_groups_for_year(prefix, year, revalidate=True)
+            with self.lock:
+                self.completed += 1
+        except Exception:
+            with self.lock:
+                self.failed += 1
+
+    def run(self, on_progress=None):
+        """Warm every missing or stale fragment; blocks until done."""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.running = True
+            self.started_at = time.time()
+            self.finished_at = None
+            self.completed = self.failed = self.skipped = 0
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for _ in pool.map(self._warm_unit, self.plan()):
+                    if on_progress is not None:
+                        on_progress(self.progress())
+        finally:
+            with self.lock:
+                self.running = False
+                self.finished_at = time.time()
+
+    def start(self):
+        """Run the warm-up in a daemon thread (no-op if already running or the cache is disabled)."""
+        if not self.enabled:
+            return None
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+        self._thread = threading.Thread(target=self.run, name="openalex-cache-warmup", daemon=True)
+        self._thread.start()
+        return self._thread
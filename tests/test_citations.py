@@ -0,0 +1,65 @@
+import math
+
+import pytest
+
+from services import cache, openalex_api
+
+
+@pytest.fixture
+def response_cache(tmp_path):
+    previous = cache.get_default_cache()
+    cache.set_default_cache(cache.ResponseCache(str(tmp_path / "cache.sqlite")))
+    try:
+        yield
+    finally:
+        cache.set_default_cache(previous)
+
+
+@pytest.fixture
+def works(monkeypatch):
+    """Fake /works: 10 citations per country and year; records every uncached request."""
+    requests = []
+
+    def fetch_json(path, params):
+        requests.append(params["filter"])
+        filters = dict(part.split(":", 1) for part in params["filter"].split(","))
+        country = filters["institutions.country_code"]
+        if country == "XX":
+            raise RuntimeError("HTTP 503")
+        if country == "YY":
+            return {"meta": {"count": 0}}
+        if "publication_year" in filters:
+            years = 1
+        else:
+            years = int(filters["to_publication_date"][:4]) - int(filters["from_publication_date"][:4]) + 1
+        return {"meta": {"cited_by_count": 10 * years}}
+
+    monkeypatch.setattr(openalex_api.get_client(), "get_json", fetch_json)
+    return requests
+
+
+def test_new_range_is_one_request_per_country(response_cache, works):
+    frame = openalex_api.fetch_citations_by_country("C1", ["US", "CN"], (2010, 2020))
+    assert list(frame["cited_by_count"]) == [110, 110]
+    assert len(works) == 2
+
+
+def test_extended_range_only_fetches_added_years(response_cache, works):
+    openalex_api.fetch_citations_by_country("C1", ["US", "CN"], (2010, 2019))
+    works.clear()
+
+    frame = openalex_api.fetch_citations_by_country("C1", ["US", "CN"], (2010, 2020))
+    assert list(frame["cited_by_count"]) == [110, 110]
+    assert sorted(works) == [f"concepts.id:C1,institutions.country_code:{c},publication_year:2020" for c in ("CN", "US")]
+
+    works.clear()
+    openalex_api.fetch_citations_by_country("C1", ["US", "CN"], (2010, 2020))
+    assert works == []
+
+
+def test_missing_value_is_nan_and_errors_mark_the_frame_partial(response_cache, works):
+    frame = openalex_api.fetch_citations_by_country("C1", ["US", "YY", "XX"], (2015, 2016))
+    values = dict(zip(frame["country_code"], frame["cited_by_count"]))
+    assert values["US"] == 20
+    assert math.isnan(values["YY"]) and math.isnan(values["XX"])
+    assert frame.attrs["failed_countries"] == ["XX"]
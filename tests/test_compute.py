@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from dashboard import compute
+from services import memo, store
+
+
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "STORE_DIR", str(tmp_path))
+    return str(tmp_path)
+
+
+def _write(store_dir, us_count):
+    frame = pd.DataFrame({"country_code": ["US", "CN"], "count": [us_count, 5]})
+    store.write_partition("C1", 2020, frame, store_dir)
+
+
+def _us_count(frame, column="count"):
+    return dict(zip(frame["country_code"], frame[column]))["US"]
+
+
+def test_rewritten_partition_is_served(store_dir):
+    _write(store_dir, 10)
+    cube = compute.load_count_cube()
+    version = compute._snapshot_version(True)
+    assert compute.load_count_cube() is cube
+    assert _us_count(cube.range_frame("C1", (2020, 2020))) == 10
+
+    _write(store_dir, 42)
+    assert compute._snapshot_version(True) != version  # snapshot memo keys change too
+    assert _us_count(compute.load_count_cube().range_frame("C1", (2020, 2020))) == 42
+    assert _us_count(compute.load_growth_engine().growth_frame("C1", 2020, 2020), "end_count") == 42
+
+
+def test_memo_entries_expire(monkeypatch):
+    cache = memo.BudgetedLRUCache(1 << 20, max_age=60)
+    now = [1000.0]
+    monkeypatch.setattr(memo, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    assert cache.get_or_compute("k", lambda: "old") == "old"
+    now[0] += 30
+    assert cache.get_or_compute("k", lambda: "new") == "old"
+    now[0] += 31
+    assert cache.get_or_compute("k", lambda: "new") == "new"
+    assert cache.stats()["expirations"] == 1
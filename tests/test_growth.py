@@ -0,0 +1,31 @@
+import math
+
+import pandas as pd
+
+from services.growth import GrowthEngine
+
+
+def _engine():
+    return GrowthEngine.from_frame(pd.DataFrame({
+        "concept_id": ["C1"] * 6,
+        "year": [2010, 2012, 2010, 2012, 2011, 2012],
+        "country_code": ["US", "US", "CN", "CN", "DE", "DE"],
+        "count": [100, 121, 50, 25, 7, 14],
+    }))
+
+
+def test_growth_and_cagr_for_a_year_pair():
+    df = _engine().growth_frame("C1", 2010, 2012).set_index("country_code")
+    assert df.loc["US", "growth_percent"] == 21.0
+    assert df.loc["US", "cagr_percent"] == 10.0
+    assert df.loc["CN", "growth_percent"] == -50.0
+    # No base-year publications: growth is undefined, not computed against 1
+    assert df.loc["DE", "base_count"] == 0
+    assert math.isnan(df.loc["DE", "growth_percent"])
+    assert list(df.index) == ["US", "CN", "DE"]
+
+
+def test_end_before_base_is_undefined():
+    df = _engine().growth_frame("C1", 2012, 2010)
+    assert df["growth_percent"].isna().all()
+    assert df["cagr_percent"].isna().all()
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from services import openalex_client
+from services.fetch_engine import fetch_counts
+from services.fetch_journal import FetchIncomplete, fetch_counts_journaled
+from services.openalex_client import OpenAlexClient
+from services.openalex_fixtures import OpenAlexFixtures
+from services.openalex_stub import OpenAlexStubServer, StubConfig
+
+YEARS = [2000, 2001, 2002]
+
+
+@pytest.fixture
+def fixtures():
+    return OpenAlexFixtures.synthetic(countries=20, concepts=3, years=10, first_year=1995)
+
+
+@pytest.fixture
+def stub(fixtures):
+    with OpenAlexStubServer(fixtures) as server:
+        previous = openalex_client.set_client(OpenAlexClient(base_url=server.url, rate=1000))
+        try:
+            yield server
+        finally:
+            openalex_client.set_client(previous)
+
+
+def _expected(fixtures, concept_id, year):
+    totals = fixtures.cube.range_totals(concept_id, (year, year))
+    return {code: int(n) for code, n in zip(fixtures.cube.countries, totals) if n > 0}
+
+
+def test_batch_fetch_against_stub(fixtures, stub):
+    concept_ids = list(fixtures.cube.concepts[:2])
+    df = fetch_counts(concept_ids, YEARS, progress=False)
+
+    assert stub.stats()["statuses"] == {"200": len(concept_ids) * len(YEARS)}
+    for concept_id in concept_ids:
+        for year in YEARS:
+            unit = df[(df["concept_id"] == concept_id) & (df["year"] == year)]
+            codes = unit["country_code"].str.rsplit("/", n=1).str[-1]
+            assert dict(zip(codes, unit["count"])) == _expected(fixtures, concept_id, year)
+
+
+def test_journaled_fetch_against_stub(fixtures, stub, tmp_path):
+    concept_ids = list(fixtures.cube.concepts[:2])
+    df = fetch_counts_journaled(concept_ids, YEARS, journal_dir=str(tmp_path / "journal"),
+                                store_dir=str(tmp_path / "store"), progress=False)
+
+    expected = sum(sum(_expected(fixtures, c, y).values()) for c in concept_ids for y in YEARS)
+    assert df["count"].sum() == expected
+    assert stub.stats()["requests"] == len(concept_ids) * len(YEARS)
+
+
+def test_journaled_fetch_reports_units_that_keep_failing(fixtures, tmp_path):
+    concept_ids = list(fixtures.cube.concepts[:1])
+    config = StubConfig(error_rate=1.0, error_status=400)
+    with OpenAlexStubServer(fixtures, config=config) as server:
+        previous = openalex_client.set_client(OpenAlexClient(base_url=server.url, rate=1000))
+        try:
+            with pytest.raises(FetchIncomplete) as excinfo:
+                fetch_counts_journaled(concept_ids, YEARS, journal_dir=str(tmp_path / "journal"),
+                                       store_dir=str(tmp_path / "store"), max_rounds=2, progress=False)
+        finally:
+            openalex_client.set_client(previous)
+
+    assert excinfo.value.failed == [(concept_ids[0], year) for year in YEARS]
+    assert excinfo.value.counts.empty
@@ -0,0 +1,64 @@
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from services import store
+
+
+def _counts():
+    return pd.DataFrame({
+        "concept_id": ["C1"] * 4,
+        "year": [2019, 2019, 2020, 2020],
+        "country_code": ["https://openalex.org/countries/US", "CN", "US", "DE"],
+        "count": [10, 5, 12, 3],
+    })
+
+
+def test_write_and_read_counts(tmp_path):
+    store.write_counts(_counts(), store_dir=str(tmp_path))
+    df = store.read_counts("C1", (2019, 2020), store_dir=str(tmp_path))
+    assert df["count"].sum() == 30
+    assert set(df["country_code"].astype(str)) == {"US", "CN", "DE"}
+    assert store.list_partitions(str(tmp_path)) == {("C1", 2019), ("C1", 2020)}
+
+
+def test_crash_before_rename_does_not_change_counts(tmp_path, monkeypatch):
+    store_dir = str(tmp_path)
+    store.write_counts(_counts(), store_dir=store_dir)
+
+    # Crash between writing the temp file and renaming it into place
+    def crash(src, dst):
+        raise OSError("simulated crash")
+
+    monkeypatch.setattr(store.os, "replace", crash)
+    rewrite = pd.DataFrame({"country_code": ["US", "CN"], "count": [10, 5]})
+    try:
+        store.write_partition("C1", 2019, rewrite, store_dir)
+    except OSError:
+        pass
+    monkeypatch.undo()
+
+    directory = store.partition_dir("C1", 2019, store_dir)
+    assert len(os.listdir(directory)) == 2  # the stray temp file is still there
+    df = store.read_counts("C1", store_dir=store_dir)
+    assert df["count"].sum() == 30
+    assert len(df) == 4
+
+
+def test_truncated_temp_file_is_not_read(tmp_path):
+    store_dir = str(tmp_path)
+    store.write_counts(_counts(), store_dir=store_dir)
+    directory = store.partition_dir("C1", 2020, store_dir)
+    leftovers = [name for name in os.listdir(directory) if name != "part-0.parquet"]
+    assert leftovers == []
+    with open(os.path.join(directory, ".part-0.parquet.tmp"), "wb") as f:
+        f.write(b"PAR1 truncated")
+
+    assert store.read_counts("C1", store_dir=store_dir)["count"].sum() == 30
+
+
+def test_write_partition_leaves_no_temp_file(tmp_path):
+    path = store.write_partition("C1", 2021, pd.DataFrame({"country_code": ["US"], "count": [1]}), str(tmp_path))
+    assert os.listdir(os.path.dirname(path)) == ["part-0.parquet"]
+    assert pq.read_table(path).num_rows == 1
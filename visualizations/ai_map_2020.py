@@ -1,45 +1,49 @@
 import folium
-import pandas as pd
-import requests
+import sys
 import os
 
-# Load AI data
-df = pd.read_csv("data/raw/ai_publication_counts.csv")
-latest_year = df["year"].max()
-df_latest = df[df["year"] == latest_year].copy()
-
-# Extract ISO Alpha-2 from OpenAlex URL
-df_latest["alpha_2"] = df_latest["country_code"].apply(lambda x: x.split("/")[-1])
-
-# Map Alpha-2 to Alpha-3 (needed by Folium map)
-def alpha2_to_alpha3():
-    url = "https://raw.githubusercontent.com/lukes/ISO-3166-Countries-with-Regional-Codes/master/all/all.json"
-    response = requests.get(url)
-    return {entry["alpha-2"]: entry["alpha-3"] for entry in response.json()}
-
-alpha_map = alpha2_to_alpha3()
-df_latest["iso_a3"] = df_latest["alpha_2"].map(alpha_map)
-df_latest = df_latest.dropna(subset=["iso_a3"])
-
-# GeoJSON data
-geo_url = "https://raw.githubusercontent.com/python-visualization/folium/master/examples/data/world-countries.json"
-
-# Create map
-m = folium.Map(location=[20, 0], zoom_start=2)
-folium.Choropleth(
-    geo_data=geo_url,
-    name="choropleth",
-    data=df_latest,
-    columns=["iso_a3", "count"],
-    key_on="feature.id",
-    fill_color="YlGnBu",
-    fill_opacity=0.7,
-    line_opacity=0.2,
-    legend_name=f"AI Publications in {latest_year}",
-).add_to(m)
-
-# Save output
-os.makedirs("visualizations/outputs", exist_ok=True)
-output_path = "visualizations/outputs/ai_map_2020.html"
-m.save(output_path)
-print(f"AI world map saved to {output_path}")
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.store import read_counts, AI_CONCEPT_ID
+from services.countries import to_alpha3
+from services.geometry import load_world_geometry
+
+OUTPUT_PATH = "visualizations/outputs/ai_map_2020.html"
+
+def load_data():
+    # Load AI data
+    df = read_counts(AI_CONCEPT_ID, columns=["year", "country_code", "count"])
+
+    # Map Alpha-2 to Alpha-3 (needed by Folium map) with the bundled ISO table
+    df["iso_a3"] = to_alpha3(df["country_code"])
+    return df.dropna(subset=["iso_a3"])
+
+def render_latest_year_map(df, output_path, geo_data=None):
+    latest_year = df["year"].max()
+    df_latest = df[df["year"] == latest_year]
+
+    # Simplified local geometry sized for a world overview
+    if geo_data is None:
+        geo_data = load_world_geometry("overview")
+
+    # Create map
+    m = folium.Map(location=[20, 0], zoom_start=2)
+    folium.Choropleth(
+        geo_data=geo_data,
+        name="choropleth",
+        data=df_latest,
+        columns=["iso_a3", "count"],
+        key_on="feature.id",
+        fill_color="YlGnBu",
+        fill_opacity=0.7,
+        line_opacity=0.2,
+        legend_name=f"AI Publications in {latest_year}",
+    ).add_to(m)
+
+    # Save output
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    m.save(output_path)
+
+if __name__ == "__main__":
+    render_latest_year_map(load_data(), OUTPUT_PATH)
+    print(f"AI world map saved to {OUTPUT_PATH}")
@@ -1,44 +1,52 @@
 import pandas as pd
 import matplotlib.pyplot as plt
+import sys
 import os
 
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.store import read_counts, AI_CONCEPT_ID, DL_CONCEPT_ID
+
 # Country ISO codes
 COUNTRIES = ["US", "CN", "DE"]
 
 # Paths
-ai_path = "data/raw/ai_publication_counts.csv"
-dl_path = "data/raw/deep_learning_publication_counts.csv"
 output_path = "visualizations/outputs/line_trend_us_cn_de.png"
 
 # Load & prepare data
-def load_and_filter(path, label):
-    df = pd.read_csv(path)
-    df["country_short"] = df["country_code"].apply(lambda x: x.split("/")[-1])
-    df_filtered = df[df["country_short"].isin(COUNTRIES)]
-    df_filtered["field"] = label
-    return df_filtered[["year", "country_short", "count", "field"]]
-
-ai_df = load_and_filter(ai_path, "AI")
-dl_df = load_and_filter(dl_path, "Deep Learning")
-
-# Combine
-df_all = pd.concat([ai_df, dl_df])
-
-# Plot
-plt.figure(figsize=(12, 6))
-for country in COUNTRIES:
-    for field in ["AI", "Deep Learning"]:
-        subset = df_all[(df_all["country_short"] == country) & (df_all["field"] == field)]
-        plt.plot(subset["year"], subset["count"], label=f"{country} - {field}")
-
-plt.title("AI vs Deep Learning Research Trends (2010–2020)")
-plt.xlabel("Year")
-plt.ylabel("Publication Count")
-plt.legend()
-plt.grid(True)
-
-# Save
-os.makedirs("visualizations/outputs", exist_ok=True)
-plt.savefig(output_path)
-plt.close()
-print(f"Saved line trend chart to {output_path}")
+def load_and_filter(concept_id, label):
+    # Country filter is pushed down to the store scan
+    df = read_counts(concept_id, countries=COUNTRIES, columns=["year", "country_code", "count"])
+    df["country_short"] = df["country_code"].astype(str)
+    df["field"] = label
+    return df[["year", "country_short", "count", "field"]]
+
+def load_data():
+    ai_df = load_and_filter(AI_CONCEPT_ID, "AI")
+    dl_df = load_and_filter(DL_CONCEPT_ID, "Deep Learning")
+
+    # Combine
+    return pd.concat([ai_df, dl_df])
+
+def plot_line_trend(df_all, output_path=output_path):
+    # Plot
+    plt.figure(figsize=(12, 6))
+    for country in COUNTRIES:
+        for field in ["AI", "Deep Learning"]:
+            subset = df_all[(df_all["country_short"] == country) & (df_all["field"] == field)]
+            plt.plot(subset["year"], subset["count"], label=f"{country} - {field}")
+
+    plt.title("AI vs Deep Learning Research Trends (2010–2020)")
+    plt.xlabel("Year")
+    plt.ylabel("Publication Count")
+    plt.legend()
+    plt.grid(True)
+
+    # Save
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    plt.savefig(output_path)
+    plt.close()
+
+if __name__ == "__main__":
+    plot_line_trend(load_data())
+    print(f"Saved line trend chart to {output_path}")
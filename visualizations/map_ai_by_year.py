@@ -1,38 +1,32 @@
-import pandas as pd
 import folium
-import requests
+import sys
 import os
 
-# Load AI publication data
-df = pd.read_csv("data/raw/ai_publication_counts.csv")
-years = sorted(df["year"].unique())
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.store import read_counts, AI_CONCEPT_ID
+from services.countries import to_alpha3
+from services.geometry import load_world_geometry
 
-# Extract Alpha-2 country codes
-df["alpha_2"] = df["country_code"].apply(lambda x: x.split("/")[-1])
-
-# Convert Alpha-2 to Alpha-3
-def alpha2_to_alpha3():
-    url = "https://raw.githubusercontent.com/lukes/ISO-3166-Countries-with-Regional-Codes/master/all/all.json"
-    res = requests.get(url)
-    return {r["alpha-2"]: r["alpha-3"] for r in res.json()}
-
-iso_map = alpha2_to_alpha3()
-df["iso_a3"] = df["alpha_2"].map(iso_map)
-df = df.dropna(subset=["iso_a3"])
+# Output folder
+OUTPUT_DIR = "visualizations/outputs/maps_ai_by_year"
 
-# GeoJSON source
-geo_url = "https://raw.githubusercontent.com/python-visualization/folium/master/examples/data/world-countries.json"
+def load_data():
+    # Load AI publication data
+    df = read_counts(AI_CONCEPT_ID, columns=["year", "country_code", "count"])
 
-# Output folder
-os.makedirs("visualizations/outputs", exist_ok=True)
+    # Convert Alpha-2 to Alpha-3 with the bundled ISO table
+    df["iso_a3"] = to_alpha3(df["country_code"])
+    return df.dropna(subset=["iso_a3"])
 
-# Loop through each year and generate maps
-for year in years:
-    df_year = df[df["year"] == year]
+def render_year_map(df_year, year, output_path, geo_data=None):
+    # Simplified local geometry sized for a world overview
+    if geo_data is None:
+        geo_data = load_world_geometry("overview")
 
     m = folium.Map(location=[20, 0], zoom_start=2)
     folium.Choropleth(
-        geo_data=geo_url,
+        geo_data=geo_data,
         name="choropleth",
         data=df_year,
         columns=["iso_a3", "count"],
@@ -44,6 +38,14 @@ for year in years:
     ).add_to(m)
 
     # Save map
-    output_path = f"visualizations/outputs/ai_map_{year}.html"
     m.save(output_path)
-    print(f"✅ Saved map for {year}: {output_path}")
+
+if __name__ == "__main__":
+    df = load_data()
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    # Loop through each year and generate maps
+    for year in sorted(df["year"].unique()):
+        output_path = os.path.join(OUTPUT_DIR, f"ai_map_{year}.html")
+        render_year_map(df[df["year"] == year], year, output_path)
+        print(f"✅ Saved map for {year}: {output_path}")
@@ -1,34 +1,30 @@
-import pandas as pd
 import folium
-import requests
+import sys
 import os
 
-df = pd.read_csv("data/raw/deep_learning_publication_counts.csv")
-years = sorted(df["year"].unique())
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.store import read_counts, DL_CONCEPT_ID
+from services.countries import to_alpha3
+from services.geometry import load_world_geometry
 
-# Extract Alpha-2
-df["alpha_2"] = df["country_code"].apply(lambda x: x.split("/")[-1])
+OUTPUT_DIR = "visualizations/outputs/maps_dl_by_year"
 
-# Convert to Alpha-3
-def alpha2_to_alpha3():
-    url = "https://raw.githubusercontent.com/lukes/ISO-3166-Countries-with-Regional-Codes/master/all/all.json"
-    res = requests.get(url)
-    return {r["alpha-2"]: r["alpha-3"] for r in res.json()}
+def load_data():
+    df = read_counts(DL_CONCEPT_ID, columns=["year", "country_code", "count"])
 
-iso_map = alpha2_to_alpha3()
-df["iso_a3"] = df["alpha_2"].map(iso_map)
-df = df.dropna(subset=["iso_a3"])
+    # Convert to Alpha-3 with the bundled ISO table
+    df["iso_a3"] = to_alpha3(df["country_code"])
+    return df.dropna(subset=["iso_a3"])
 
-# GeoJSON
-geo_url = "https://raw.githubusercontent.com/python-visualization/folium/master/examples/data/world-countries.json"
-os.makedirs("visualizations/outputs/maps_dl_by_year", exist_ok=True)
-
-for year in years:
-    df_year = df[df["year"] == year]
+def render_year_map(df_year, year, output_path, geo_data=None):
+    # Simplified local geometry sized for a world overview
+    if geo_data is None:
+        geo_data = load_world_geometry("overview")
 
     m = folium.Map(location=[20, 0], zoom_start=2)
     folium.Choropleth(
-        geo_data=geo_url,
+        geo_data=geo_data,
         name="choropleth",
         data=df_year,
         columns=["iso_a3", "count"],
@@ -39,5 +35,12 @@ for year in years:
         legend_name=f"DL Publications in {year}",
     ).add_to(m)
 
-    m.save(f"visualizations/outputs/maps_dl_by_year/dl_map_{year}.html")
-    print(f"Saved map for {year}")
+    m.save(output_path)
+
+if __name__ == "__main__":
+    df = load_data()
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    for year in sorted(df["year"].unique()):
+        render_year_map(df[df["year"] == year], year, os.path.join(OUTPUT_DIR, f"dl_map_{year}.html"))
+        print(f"Saved map for {year}")
@@ -1,45 +1,164 @@
-import pandas as pd
-import folium
+import json
+import sys
 import os
-import requests
-
-def alpha2_to_alpha3_map():
-    url = "https://raw.githubusercontent.com/lukes/ISO-3166-Countries-with-Regional-Codes/master/all/all.json"
-    resp = requests.get(url)
-    return {item["alpha-2"]: item["alpha-3"] for item in resp.json()}
-
-def generate_range_maps(df, label, output_dir):
-    df["alpha_2"] = df["country_code"].apply(lambda x: x.split("/")[-1])
-    iso_map = alpha2_to_alpha3_map()
-    df["iso_a3"] = df["alpha_2"].map(iso_map)
-    df = df.dropna(subset=["iso_a3"])
-
-    os.makedirs(output_dir, exist_ok=True)
-    geo_url = "https://raw.githubusercontent.com/python-visualization/folium/master/examples/data/world-countries.json"
-
-    for start in range(2010, 2020):
-        for end in range(start + 1, 2021):
-            df_range = df[(df["year"] >= start) & (df["year"] <= end)]
-            agg_df = df_range.groupby("iso_a3")["count"].sum().reset_index()
-
-            m = folium.Map(location=[20, 0], zoom_start=2)
-            folium.Choropleth(
-                geo_data=geo_url,
-                data=agg_df,
-                columns=["iso_a3", "count"],
-                key_on="feature.id",
-                fill_color="YlGnBu",
-                fill_opacity=0.7,
-                line_opacity=0.2,
-                legend_name=f"{label} Publications ({start}–{end})"
-            ).add_to(m)
-
-            m.save(f"{output_dir}/{label.lower().replace(' ', '_')}_map_{start}_{end}.html")
-            print(f"✅ Saved: {label} {start}–{end}")
-
-# Load datasets
-df_ai = pd.read_csv("data/raw/ai_publication_counts.csv")
-df_dl = pd.read_csv("data/raw/deep_learning_publication_counts.csv")
-
-generate_range_maps(df_ai, "AI", "visualizations/outputs/maps_ai_by_year_range")
-generate_range_maps(df_dl, "Deep Learning", "visualizations/outputs/maps_dl_by_year_range")
\ No newline at end of file
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.store import AI_CONCEPT_ID, DL_CONCEPT_ID
+from services.cube import CountCube
+from services.countries import to_alpha3
+from services.geometry import load_world_geometry
+
+OUTPUT_PATH = "visualizations/outputs/range_map_viewer.html"
+
+CONCEPTS = {
+    "AI": AI_CONCEPT_ID,
+    "Deep Learning": DL_CONCEPT_ID,
+}
+
+# Single self-contained page: the world geometry is embedded once, each concept
+# carries a compact per-year count matrix, and the browser computes any
+# (start, end) range total from cumulative sums.
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Publications by Year Range</title>
+<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.css"/>
+<script src="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js"></script>
+<style>
+  html, body {{ margin: 0; height: 100%; font-family: sans-serif; }}
+  #controls {{ padding: 8px 12px; background: #f7f7f7; border-bottom: 1px solid #ddd; }}
+  #controls label {{ margin-right: 12px; }}
+  #map {{ position: absolute; top: 44px; bottom: 0; left: 0; right: 0; }}
+  .legend {{ background: white; padding: 6px 8px; line-height: 18px; border-radius: 4px; }}
+  .legend i {{ width: 18px; height: 18px; float: left; margin-right: 6px; opacity: 0.7; }}
+</style>
+</head>
+<body>
+<div id="controls">
+  <label>Field <select id="concept"></select></label>
+  <label>From <select id="start"></select></label>
+  <label>To <select id="end"></select></label>
+  <span id="summary"></span>
+</div>
+<div id="map"></div>
+<script>
+const GEOJSON = {geojson};
+const DATA = {data};
+
+// YlGnBu, as used by the Folium choropleths
+const COLORS = ["#ffffcc", "#c7e9b4", "#7fcdbb", "#41b6c4", "#2c7fb8", "#253494"];
+
+// Prefix sums per concept: prefix[country][k] = sum of counts for years[0..k-1]
+const PREFIX = {{}};
+for (const [label, concept] of Object.entries(DATA.concepts)) {{
+  PREFIX[label] = concept.counts.map(row => {{
+    const p = [0];
+    for (const v of row) p.push(p[p.length - 1] + v);
+    return p;
+  }});
+}}
+
+function rangeTotals(label, start, end) {{
+  const i0 = start - DATA.years[0], i1 = end - DATA.years[0] + 1;
+  const totals = {{}};
+  PREFIX[label].forEach((p, c) => {{
+    const value = p[i1] - p[i0];
+    if (value > 0) totals[DATA.concepts[label].countries[c]] = value;
+  }});
+  return totals;
+}}
+
+function binsFor(max) {{
+  const step = max / COLORS.length;
+  return COLORS.map((_, k) => Math.round(step * k));
+}}
+
+function colorFor(value, bins) {{
+  if (value === undefined) return "#ffffff";
+  let k = 0;
+  while (k + 1 < bins.length && value >= bins[k + 1]) k++;
+  return COLORS[k];
+}}
+
+const map = L.map("map").setView([20, 0], 2);
+L.tileLayer("https://{{s}}.tile.openstreetmap.org/{{z}}/{{x}}/{{y}}.png", {{
+  attribution: "&copy; OpenStreetMap contributors"
+}}).addTo(map);
+
+let totals = {{}}, bins = [];
+const layer = L.geoJSON(GEOJSON, {{
+  style: f => ({{ fillColor: colorFor(totals[f.id], bins), fillOpacity: 0.7, weight: 1, opacity: 0.2, color: "black" }}),
+  onEachFeature: (f, l) => l.bindTooltip(() => `${{f.properties.name}}: ${{(totals[f.id] || 0).toLocaleString()}}`)
+}}).addTo(map);
+
+const legend = L.control({{ position: "bottomright" }});
+legend.onAdd = () => L.DomUtil.create("div", "legend");
+legend.addTo(map);
+
+const conceptSelect = document.getElementById("concept");
+const startSelect = document.getElementById("start");
+const endSelect = document.getElementById("end");
+Object.keys(DATA.concepts).forEach(label => conceptSelect.add(new Option(label, label)));
+DATA.years.forEach(y => {{ startSelect.add(new Option(y, y)); endSelect.add(new Option(y, y)); }});
+startSelect.value = DATA.years[0];
+endSelect.value = DATA.years[DATA.years.length - 1];
+
+function update() {{
+  let start = +startSelect.value, end = +endSelect.value;
+  if (start > end) {{ [start, end] = [end, start]; startSelect.value = start; endSelect.value = end; }}
+  const label = conceptSelect.value;
+  totals = rangeTotals(label, start, end);
+  const values = Object.values(totals);
+  const max = values.length ? Math.max(...values) : 0;
+  bins = binsFor(max);
+  layer.setStyle(layer.options.style);
+  legend.getContainer().innerHTML = `<b>${{label}} Publications (${{start}}–${{end}})</b><br>` +
+    bins.map((b, k) => `<i style="background:${{COLORS[k]}}"></i>${{b.toLocaleString()}}+`).join("<br>");
+  const total = values.reduce((a, b) => a + b, 0);
+  document.getElementById("summary").textContent =
+    `${{values.length}} countries · ${{total.toLocaleString()}} publications`;
+}}
+
+[conceptSelect, startSelect, endSelect].forEach(el => el.addEventListener("change", update));
+update();
+</script>
+</body>
+</html>
+"""
+
+def build_viewer_data(cube, concepts):
+    """Compact per-concept count matrices (country × year), keyed by ISO alpha-3."""
+    iso_a3 = to_alpha3(cube.countries)
+    has_iso = iso_a3.notna().to_numpy()
+    iso_a3 = iso_a3.to_numpy()
+    data = {"years": cube.years.tolist(), "concepts": {}}
+    for label, concept_id in concepts.items():
+        counts = cube.counts[cube.concepts.index(concept_id)]
+        # Only ship countries with at least one publication in the span
+        keep = has_iso & (counts.sum(axis=1) > 0)
+        data["concepts"][label] = {
+            "countries": iso_a3[keep].tolist(),
+            "counts": counts[keep].tolist(),
+        }
+    return data
+
+def generate_range_viewer(cube, concepts, output_path, geo_data=None):
+    if geo_data is None:
+        geo_data = load_world_geometry("overview")
+
+    html = PAGE_TEMPLATE.format(
+        geojson=json.dumps(geo_data, separators=(",", ":")),
+        data=json.dumps(build_viewer_data(cube, concepts), separators=(",", ":")),
+    )
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(html)
+    print(f"✅ Saved range map viewer ({len(html) / 1024:.0f} KB): {output_path}")
+
+if __name__ == "__main__":
+    # Build the concept × country × year cube once for both concepts
+    cube = CountCube.from_store(list(CONCEPTS.values()))
+    generate_range_viewer(cube, CONCEPTS, OUTPUT_PATH)
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Render all visualization outputs in parallel.
+
+The inputs are loaded once in the parent process: store counts, growth CSVs,
+the count cube and the simplified world GeoJSON. They are split into
+independent render jobs (one per map or chart), and the jobs fan out over a
+process pool that uses the headless Agg backend.
+
+Each job's inputs are content-hashed: its data slice, its parameters and the
+source of the script that renders it. A job is skipped when its output exists
+and its hash matches the manifest from the previous run.
+
+Example:
+    python visualizations/render_all.py --workers 4
+    python visualizations/render_all.py --force
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+# Headless rendering in this process and in every worker
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.cube import CountCube
+from services.geometry import load_world_geometry
+from visualizations import (
+    ai_map_2020,
+    line_trend_countries,
+    map_ai_by_year,
+    map_deep_learning_by_year,
+    map_deep_learning_publications,
+    map_publications_by_year_range,
+    top_growth_countries,
+    top_growth_countries_ai,
+)
+
+OUTPUT_DIR = "visualizations/outputs"
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, ".render_manifest.json")
+
+
+@dataclass
+class RenderJob:
+    name: str
+    output: str
+    func: object
+    kwargs: dict = field(default_factory=dict)
+    uses_geo: bool = False
+
+
+# --- Content hashing ---
+
+def _update_digest(h, value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        h.update(repr(list(value.columns) if isinstance(value, pd.DataFrame) else value.name).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(repr((value.dtype.str, value.shape)).encode())
+        if value.dtype == object:
+            # Object arrays hold pointers; hash their values instead
+            h.update(pd.util.hash_array(value.ravel()).tobytes())
+        else:
+            h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            h.update(repr(key).encode())
+            _update_digest(h, value[key])
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _update_digest(h, item)
+    elif hasattr(value, "__dict__"):
+        _update_digest(h, vars(value))
+    else:
+        h.update(repr(value).encode())
+
+
+def _source_digest(func):
+    module = sys.modules[func.__module__]
+    with open(module.__file__, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def job_digest(job, geo_digest):
+    """Hash of everything that determines a job's output."""
+    h = hashlib.sha256()
+    h.update(f"{job.name}|{job.output}|{job.func.__qualname__}".encode())
+    h.update(_source_digest(job.func).encode())
+    _update_digest(h, job.kwargs)
+    if job.uses_geo:
+        h.update(geo_digest.encode())
+    return h.hexdigest()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+# --- Inputs and jobs ---
+
+def load_inputs():
+    """Load every input once; jobs receive slices of these."""
+    return {
+        "geo_data": load_world_geometry("overview"),
+        "ai": map_ai_by_year.load_data(),
+        "dl": map_deep_learning_by_year.load_data(),
+        "line_trend": line_trend_countries.load_data(),
+        "dl_growth": pd.read_csv(top_growth_countries.INPUT_CSV, index_col=0),
+        "ai_growth": pd.read_csv(top_growth_countries_ai.INPUT_CSV, index_col=0),
+        "cube": CountCube.from_store(list(map_publications_by_year_range.CONCEPTS.values())),
+    }
+
+
+def build_jobs(inputs):
+    jobs = []
+    for year, df_year in inputs["ai"].groupby("year"):
+        jobs.append(RenderJob(
+            f"ai_map_{year}", os.path.join(map_ai_by_year.OUTPUT_DIR, f"ai_map_{year}.html"),
+            map_ai_by_year.render_year_map, {"df_year": df_year, "year": year}, uses_geo=True,
+        ))
+    for year, df_year in inputs["dl"].groupby("year"):
+        jobs.append(RenderJob(
+            f"dl_map_{year}", os.path.join(map_deep_learning_by_year.OUTPUT_DIR, f"dl_map_{year}.html"),
+            map_deep_learning_by_year.render_year_map, {"df_year": df_year, "year": year}, uses_geo=True,
+        ))
+    jobs += [
+        RenderJob("ai_map_latest", ai_map_2020.OUTPUT_PATH, ai_map_2020.render_latest_year_map,
+                  {"df": inputs["ai"]}, uses_geo=True),
+        RenderJob("aggregated_dl_map", map_deep_learning_publications.OUTPUT_PATH,
+                  map_deep_learning_publications.render_aggregated_map, {"df": inputs["dl"]}, uses_geo=True),
+        RenderJob("range_map_viewer", map_publications_by_year_range.OUTPUT_PATH,
+                  map_publications_by_year_range.generate_range_viewer,
+                  {"cube": inputs["cube"], "concepts": map_publications_by_year_range.CONCEPTS}, uses_geo=True),
+        RenderJob("line_trend", line_trend_countries.output_path, line_trend_countries.plot_line_trend,
+                  {"df_all": inputs["line_trend"]}),
+        RenderJob("top5_growth_dl", top_growth_countries.OUTPUT_IMG, top_growth_countries.plot_top_5_growth,
+                  {"df": inputs["dl_growth"]}),
+        RenderJob("top5_growth_ai", top_growth_countries_ai.OUTPUT_IMG, top_growth_countries_ai.plot_top_5_growth,
+                  {"df": inputs["ai_growth"]}),
+    ]
+    return jobs
+
+
+# --- Worker side ---
+
+_worker_geo_data = None
+
+
+def _init_worker(geo_data):
+    global _worker_geo_data
+    import matplotlib
+    matplotlib.use("Agg")
+    _worker_geo_data = geo_data
+
+
+def _run_job(func, kwargs, output, uses_geo):
+    if uses_geo:
+        kwargs = dict(kwargs, geo_data=_worker_geo_data)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(output_path=output, **kwargs)
+    return time.perf_counter() - start
+
+
+# --- Orchestration ---
+
+def render_all(workers=None, force=False):
+    """
+    Render every job whose inputs changed since the last run.
+    Returns a list of per-job results: {"name", "output", "status", "seconds", "error"}.
+    """
+    start = time.perf_counter()
+    inputs = load_inputs()
+    load_seconds = time.perf_counter() - start
+
+    geo_digest = hashlib.sha256()
+    _update_digest(geo_digest, inputs["geo_data"])
+    geo_digest = geo_digest.hexdigest()
+
+    manifest = {} if force else load_manifest()
+    results, pending = [], []
+    for job in build_jobs(inputs):
+        digest = job_digest(job, geo_digest)
+        if manifest.get(job.output) == digest and os.path.exists(job.output):
+            results.append({"name": job.name, "output": job.output, "status": "skipped", "seconds": 0.0})
+        else:
+            pending.append((job, digest))
+
+    for job, _ in pending:
+        os.makedirs(os.path.dirname(job.output), exist_ok=True)
+
+    if pending:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(inputs["geo_data"],)
+        ) as executor:
+            futures = {
+                executor.submit(_run_job, job.func, job.kwargs, job.output, job.uses_geo): (job, digest)
+                for job, digest in pending
+            }
+            for future in as_completed(futures):
+                job, digest = futures[future]
+                try:
+                    seconds = future.result()
+                except Exception as e:
+                    results.append({"name": job.name, "output": job.output, "status": "failed",
+                                    "seconds": 0.0, "error": str(e)})
+                    continue
+                manifest[job.output] = digest
+                results.append({"name": job.name, "output": job.output, "status": "rendered", "seconds": seconds})
+
+    save_manifest(manifest)
+    print_report(results, load_seconds, time.perf_counter() - start)
+    return results
+
+
+def print_report(results, load_seconds, wall_seconds):
+    print(f"{'job':<22} {'status':<9} {'seconds':>8}  output")
+    for r in sorted(results, key=lambda r: -r["seconds"]):
+        line = f"{r['name']:<22} {r['status']:<9} {r['seconds']:>8.2f}  {r['output']}"
+        if r.get("error"):
+            line += f"  ({r['error']})"
+        print(line)
+
+    rendered = [r for r in results if r["status"] == "rendered"]
+    job_seconds = sum(r["seconds"] for r in rendered)
+    print(f"\nLoaded inputs in {load_seconds:.2f}s")
+    print(f"{len(rendered)} rendered, "
+          f"{sum(r['status'] == 'skipped' for r in results)} skipped, "
+          f"{sum(r['status'] == 'failed' for r in results)} failed")
+    print(f"Render time {job_seconds:.2f}s across jobs, {wall_seconds:.2f}s wall "
+          f"({job_seconds / wall_seconds if wall_seconds else 0:.1f}x parallelism)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render all visualization outputs in parallel")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--force", action="store_true", help="ignore the manifest and re-render everything")
+    args = parser.parse_args()
+
+    results = render_all(args.workers, args.force)
+    if any(r["status"] == "failed" for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
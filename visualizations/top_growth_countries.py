@@ -5,8 +5,9 @@ import os
 INPUT_CSV = "data/raw/deep_learning_growth_2010_2020.csv"
 OUTPUT_IMG = "visualizations/outputs/top5_growth_dl.png"
 
-def plot_top_5_growth():
-    df = pd.read_csv(INPUT_CSV, index_col=0)
+def plot_top_5_growth(df=None, output_path=OUTPUT_IMG):
+    if df is None:
+        df = pd.read_csv(INPUT_CSV, index_col=0)
 
     # Pick top 5
     top5 = df.head(5)
@@ -19,10 +20,10 @@ def plot_top_5_growth():
     plt.ylabel("Growth (%)")
     plt.grid(True)
 
-    os.makedirs("visualizations/outputs", exist_ok=True)
-    plt.savefig(OUTPUT_IMG)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    plt.savefig(output_path)
     plt.close()
-    print(f"Saved plot to {OUTPUT_IMG}")
+    print(f"Saved plot to {output_path}")
 
 if __name__ == "__main__":
     plot_top_5_growth()